@@ -0,0 +1 @@
+"""Benchmarks for the DAS Trader bot hot paths."""
@@ -0,0 +1,141 @@
+"""End-to-end load test of DasTraderBot against the local simulated DAS acceptor.
+
+Starts ``src.simulator.das_acceptor`` in a subprocess, runs the real bot against it over
+localhost for ``--duration`` seconds after logon, then reports feed throughput and the
+acceptor-measured tick-to-order latency percentiles.
+
+Usage: python -m benchmarks.bench_end_to_end --symbols 1000 --rate 20000 --duration 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import signal
+import subprocess
+import sys
+import time
+
+from src.config import (
+    DasTraderSettings,
+    ExecutionSettings,
+    RiskSettings,
+    ScannerSettings,
+    Settings,
+    StateSettings,
+)
+from src.logging_config import configure_logging
+from src.main import DasTraderBot
+
+
+async def run_bot(bot: DasTraderBot, duration: float) -> float:
+    task = asyncio.create_task(bot.run())
+    ready = asyncio.create_task(bot.ready.wait())
+    await asyncio.wait((task, ready), return_when=asyncio.FIRST_COMPLETED)
+    if task.done():
+        ready.cancel()
+        await task
+
+    start = time.perf_counter()
+    await asyncio.sleep(duration)
+    bot.running = False
+    await asyncio.wait_for(task, timeout=10)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=20000.0, help="Ticks per second")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--ack-latency-ms", type=float, default=0.0)
+    parser.add_argument("--fill-latency-ms", type=float, default=1.0)
+    parser.add_argument("--jump-probability", type=float, default=0.001)
+    parser.add_argument("--scan-mode", choices=("interval", "event"), default="event")
+    parser.add_argument("--acceptor-config", default="config/das_simulator.cfg")
+    parser.add_argument("--client-config", default="config/das_simulator_client.cfg")
+    args = parser.parse_args()
+    configure_logging("WARNING")
+
+    acceptor = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "src.simulator.das_acceptor",
+            "--config",
+            args.acceptor_config,
+            "--symbols",
+            str(args.symbols),
+            "--rate",
+            str(args.rate),
+            "--ack-latency-ms",
+            str(args.ack_latency_ms),
+            "--fill-latency-ms",
+            str(args.fill_latency_ms),
+            "--jump-probability",
+            str(args.jump_probability),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+
+    settings = Settings(
+        das_trader=DasTraderSettings(
+            sender_comp_id="SIMCLIENT",
+            username="sim",
+            password="",
+            fix_config_file=args.client_config,
+        ),
+        scanner=ScannerSettings(scan_mode=args.scan_mode, min_volume=0, max_price=10_000.0),
+        execution=ExecutionSettings(max_order_size=1_000_000),
+        risk=RiskSettings(max_open_positions=1_000_000, max_position_size_usd=1e12),
+        # Each run starts flat rather than from the previous run's positions.
+        state=StateSettings(enabled=False),
+    )
+    bot = DasTraderBot(settings)
+
+    try:
+        elapsed = asyncio.run(run_bot(bot, args.duration))
+    finally:
+        acceptor.send_signal(signal.SIGTERM)
+        output, _ = acceptor.communicate(timeout=10)
+
+    lines = output.strip().splitlines()
+    acceptor_stats = json.loads(lines[-1]) if lines else {}
+    bridge_stats = bot.market_data_bridge.get_stats() if bot.market_data_bridge else {}
+    orders = bot.execution_bot.orders.values()
+    filled = sum(order.status == "FILLED" for order in orders)
+
+    print(
+        f"symbols={args.symbols} rate={args.rate:,.0f}/s scan_mode={args.scan_mode} "
+        f"duration={elapsed:.1f}s"
+    )
+    print(
+        f"ticks sent         {acceptor_stats.get('ticks_sent', 0):>12,} "
+        f"({acceptor_stats.get('ticks_sent', 0) / elapsed:,.0f}/s)"
+    )
+    print(
+        f"ticks received     {bridge_stats.get('enqueued', 0):>12,} "
+        f"({bridge_stats.get('enqueued', 0) / elapsed:,.0f}/s)"
+    )
+    print(
+        f"ticks conflated    {bridge_stats.get('conflated', 0):>12,} "
+        f"(max bridge depth {bridge_stats.get('max_depth', 0)})"
+    )
+    print(
+        f"orders             {len(orders):>12,} sent, "
+        f"{acceptor_stats.get('orders_received', 0):,} received, {filled:,} filled"
+    )
+    if "tick_to_order_p50_us" in acceptor_stats:
+        print(
+            "tick-to-order us   "
+            f"p50 {acceptor_stats['tick_to_order_p50_us']:.0f}  "
+            f"p90 {acceptor_stats['tick_to_order_p90_us']:.0f}  "
+            f"p99 {acceptor_stats['tick_to_order_p99_us']:.0f}  "
+            f"max {acceptor_stats['tick_to_order_max_us']:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
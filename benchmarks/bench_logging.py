@@ -0,0 +1,98 @@
+"""Per-tick cost of MarketDataHandler.apply_update under each logging configuration.
+
+Each mode runs in its own interpreter (structlog caches loggers on first use) with log output
+sent to /dev/null, so only the cost paid on the tick path is measured:
+
+    info          debug logging off (the market_data_updated call is filtered out)
+    debug-sync    debug on, rendered and written on the tick thread
+    debug-async   debug on, rendered and written by the background sink
+    debug-sampled debug on, async, market_data_updated sampled 1 in 100
+
+Usage: python -m benchmarks.bench_logging --symbols 1000 --rounds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+MODES: dict[str, dict] = {
+    "info": {"level": "INFO"},
+    "debug-sync": {"level": "DEBUG"},
+    "debug-async": {"level": "DEBUG", "async_sink": True},
+    "debug-sampled": {
+        "level": "DEBUG",
+        "async_sink": True,
+        "sample_every": {"market_data_updated": 100},
+    },
+}
+
+
+def run_mode(mode: str, symbols: int, rounds: int) -> float:
+    from src.das_trader.market_data import MarketDataHandler
+    from src.logging_config import configure_logging, shutdown_logging
+
+    configure_logging(stream=open(os.devnull, "w"), **MODES[mode])
+    handler = MarketDataHandler()
+    rng = np.random.default_rng(7)
+    updates = [
+        (f"SYM{i:05d}", {"bid_price": price - 0.01, "ask_price": price + 0.01, "last_price": price})
+        for i, price in enumerate(rng.uniform(5.0, 500.0, symbols).tolist())
+    ]
+    apply_update = handler.apply_update
+    for symbol, fields in updates:
+        apply_update(symbol, fields, time.time())
+
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        for symbol, fields in updates:
+            apply_update(symbol, fields, 0.0)
+        best = min(best, time.perf_counter_ns() - start)
+    shutdown_logging()
+    return best / symbols
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--mode", choices=list(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps({"ns_per_tick": run_mode(args.mode, args.symbols, args.rounds)}))
+        return
+
+    print(f"symbols={args.symbols} rounds={args.rounds}")
+    for mode in MODES:
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.bench_logging",
+                "--mode",
+                mode,
+                "--symbols",
+                str(args.symbols),
+                "--rounds",
+                str(args.rounds),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        ns_per_tick = json.loads(output.strip().splitlines()[-1])["ns_per_tick"]
+        print(f"{mode:<14} {ns_per_tick:>10,.0f} ns/tick")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Messages-per-second for market data decoding: legacy per-field walk vs single-pass decoder.
+
+Usage: python -m benchmarks.bench_market_data --symbols 5000 --rounds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import quickfix as fix
+import quickfix42 as fix42
+
+from src.das_trader.market_data import MarketDataHandler
+from src.logging_config import configure_logging
+
+
+def build_snapshot(symbol: str, price: float) -> fix.Message:
+    message = fix42.MarketDataSnapshotFullRefresh()
+    message.setField(fix.Symbol(symbol))
+    for entry_type, px, size in (
+        (fix.MDEntryType_BID, price - 0.01, 300),
+        (fix.MDEntryType_OFFER, price + 0.01, 200),
+        (fix.MDEntryType_TRADE, price, 100),
+        (fix.MDEntryType_TRADE_VOLUME, 0.0, 250000),
+    ):
+        group = fix42.MarketDataSnapshotFullRefresh.NoMDEntries()
+        group.setField(fix.MDEntryType(entry_type))
+        group.setField(fix.MDEntryPx(px))
+        group.setField(fix.MDEntrySize(size))
+        message.addGroup(group)
+    return message
+
+
+def build_incremental(symbols: list[str], price: float) -> fix.Message:
+    message = fix42.MarketDataIncrementalRefresh()
+    for symbol in symbols:
+        group = fix42.MarketDataIncrementalRefresh.NoMDEntries()
+        group.setField(fix.MDUpdateAction(fix.MDUpdateAction_CHANGE))
+        group.setField(fix.MDEntryType(fix.MDEntryType_TRADE))
+        group.setField(fix.Symbol(symbol))
+        group.setField(fix.MDEntryPx(price))
+        group.setField(fix.MDEntrySize(100))
+        message.addGroup(group)
+    return message
+
+
+def legacy_decode(message: fix.Message) -> tuple[str, float, float, float, int]:
+    """The previous path: one full group walk per entry type with fresh field objects."""
+
+    def get_price(entry_type: str) -> float:
+        try:
+            no_md_entries = fix.NoMDEntries()
+            message.getField(no_md_entries)
+            for i in range(no_md_entries.getValue()):
+                group = fix42.MarketDataSnapshotFullRefresh.NoMDEntries()
+                message.getGroup(i + 1, group)
+                entry_type_field = fix.MDEntryType()
+                group.getField(entry_type_field)
+                if entry_type_field.getValue() == entry_type:
+                    price_field = fix.MDEntryPx()
+                    group.getField(price_field)
+                    return float(price_field.getValue())
+        except Exception:
+            pass
+        return 0.0
+
+    symbol_field = fix.Symbol()
+    message.getField(symbol_field)
+    bid = get_price(fix.MDEntryType_BID)
+    ask = get_price(fix.MDEntryType_OFFER)
+    last = get_price(fix.MDEntryType_TRADE)
+    volume_field = fix.MDEntrySize()
+    volume = int(volume_field.getValue()) if message.isSetField(volume_field) else 0
+    return symbol_field.getValue(), bid, ask, last, volume
+
+
+def _rate(count: int, fn, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    configure_logging("INFO")
+
+    symbols = [f"SYM{i:05d}" for i in range(args.symbols)]
+    snapshots = [build_snapshot(symbol, 10.0 + i % 500) for i, symbol in enumerate(symbols)]
+    incrementals = [
+        build_incremental(symbols[i : i + 10], 11.0) for i in range(0, len(symbols), 10)
+    ]
+
+    handler = MarketDataHandler()
+    decoder = handler.decoder
+
+    legacy = _rate(len(snapshots), lambda: [legacy_decode(m) for m in snapshots], args.rounds)
+    decode_only = _rate(
+        len(snapshots), lambda: [decoder.decode_snapshot(m) for m in snapshots], args.rounds
+    )
+    handler_rate = _rate(
+        len(snapshots), lambda: [handler.on_market_data_update(m) for m in snapshots], args.rounds
+    )
+    incremental_rate = _rate(
+        len(incrementals),
+        lambda: [handler.on_market_data_incremental(m) for m in incrementals],
+        args.rounds,
+    )
+
+    print(f"symbols={args.symbols}")
+    print(f"legacy snapshot decode        {legacy:>12,.0f} msg/s")
+    print(
+        f"single-pass snapshot decode   {decode_only:>12,.0f} msg/s ({decode_only / legacy:.2f}x)"
+    )
+    print(f"handler snapshot update       {handler_rate:>12,.0f} msg/s")
+    print(f"handler incremental (10/msg)  {incremental_rate:>12,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
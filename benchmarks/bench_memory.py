@@ -0,0 +1,146 @@
+"""Per-tick allocation, GC and resident memory of the quote and position representations.
+
+"before" reproduces the previous representations in the same tree: a fresh MarketData built
+for every published tick, and positions as plain (``__dict__``) dataclasses. "after" is the
+current code: one MarketData per symbol refreshed in place, and slotted positions.
+
+Usage: python -m benchmarks.bench_memory --symbols 10000 --ticks 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import resource
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.config import RiskSettings
+from src.das_trader.market_data import MarketData, MarketDataHandler
+from src.logging_config import configure_logging
+from src.risk.risk_manager import Position, RiskManager
+
+PlainPosition = dataclasses.make_dataclass(
+    "PlainPosition", [(field.name, field.type, field) for field in dataclasses.fields(Position)]
+)
+
+
+class GcCounter:
+    def __init__(self):
+        self.collections = [0, 0, 0]
+
+    def __call__(self, phase: str, info: dict):
+        if phase == "start":
+            self.collections[info["generation"]] += 1
+
+
+def rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS.
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def build_handler(symbols: int, reuse: bool) -> tuple[MarketDataHandler, list[tuple[str, dict]]]:
+    handler = MarketDataHandler(capacity=symbols)
+    if not reuse:
+        handler._refresh_view = handler._view
+
+    seen = 0.0
+
+    def consumer(market_data: MarketData):
+        nonlocal seen
+        seen = market_data.last_price
+
+    handler.register_callback(consumer)
+    prices = np.random.default_rng(7).uniform(5.0, 500.0, symbols).tolist()
+    updates = [(f"SYM{i:05d}", {"last_price": price}) for i, price in enumerate(prices)]
+    for symbol, fields in updates:
+        handler.apply_update(symbol, fields, time.time())
+    return handler, updates
+
+
+def tick_run(symbols: int, ticks: int, reuse: bool) -> dict[str, float]:
+    handler, updates = build_handler(symbols, reuse)
+    apply_update = handler.apply_update
+    rounds = max(1, ticks // symbols)
+
+    counter = GcCounter()
+    gc.collect()
+    gc.callbacks.append(counter)
+    start = time.perf_counter_ns()
+    for _ in range(rounds):
+        for symbol, fields in updates:
+            apply_update(symbol, fields, 0.0)
+    elapsed = time.perf_counter_ns() - start
+    gc.callbacks.remove(counter)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for symbol, fields in updates:
+        apply_update(symbol, fields, 0.0)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = rounds * symbols
+    return {
+        "ns_per_tick": elapsed / total,
+        "gen0_per_1m_ticks": counter.collections[0] * 1e6 / total,
+        "retained_bytes_per_tick": (current - before) / symbols,
+        "transient_peak_kb": (peak - before) / 1024,
+    }
+
+
+def position_bytes(symbols: int, cls: type) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    positions = {
+        f"SYM{i:05d}": cls(f"SYM{i:05d}", "BUY", 100, 10.0, 10.0, 0.0, 9.8, 10.5, 9.9)
+        for i in range(symbols)
+    }
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del positions
+    return used / symbols
+
+
+def add_position_run(symbols: int) -> float:
+    risk_manager = RiskManager(RiskSettings(max_open_positions=symbols + 1))
+    names = [f"SYM{i:05d}" for i in range(symbols)]
+    for name in names:
+        risk_manager.add_position(name, "BUY", 100, 10.0)
+    start = time.perf_counter_ns()
+    for name in names:
+        risk_manager.add_position(name, "BUY", 100, 10.5)
+    return (time.perf_counter_ns() - start) / symbols
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    args = parser.parse_args()
+    configure_logging("WARNING")
+
+    print(f"symbols={args.symbols} ticks={args.ticks:,}")
+    for label, reuse in (("before", False), ("after", True)):
+        stats = tick_run(args.symbols, args.ticks, reuse)
+        print(
+            f"publish {label:<6} {stats['ns_per_tick']:>8,.0f} ns/tick  "
+            f"gen0 GCs/1M ticks {stats['gen0_per_1m_ticks']:>8,.1f}  "
+            f"retained {stats['retained_bytes_per_tick']:>6,.1f} B/tick  "
+            f"transient peak {stats['transient_peak_kb']:>8,.1f} KiB"
+        )
+
+    plain = position_bytes(args.symbols, PlainPosition)
+    slotted = position_bytes(args.symbols, Position)
+    print(f"position before {plain:>8,.0f} B each   after {slotted:>8,.0f} B each")
+    print(f"add_position to existing position {add_position_run(args.symbols):>8,.0f} ns")
+    print(f"max RSS {rss_mb():,.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
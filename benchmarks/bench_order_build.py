@@ -0,0 +1,85 @@
+"""Per-order NewOrderSingle build time: from-scratch construction vs cached templates.
+
+Also checks that a burst of ClOrdIDs allocated from several threads has no duplicates.
+
+Usage: python -m benchmarks.bench_order_build --orders 20000 --threads 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+
+import quickfix as fix
+
+from src.das_trader.fix_client import DasTraderFixClient, FixApplication
+
+
+def legacy_build(application: FixApplication, symbol: str, price: float) -> fix.Message:
+    """The previous path: every header and body field allocated per order."""
+    message = fix.Message()
+    header = message.getHeader()
+    header.setField(fix.MsgType(fix.MsgType_NewOrderSingle))
+    header.setField(fix.SenderCompID(application.session_id.getSenderCompID().getValue()))
+    header.setField(fix.TargetCompID(application.session_id.getTargetCompID().getValue()))
+    message.setField(fix.ClOrdID(f"ORDER_{int(time.time() * 1000)}"))
+    message.setField(fix.Symbol(symbol))
+    message.setField(fix.Side(fix.Side_BUY))
+    message.setField(fix.OrdType(fix.OrdType_LIMIT))
+    message.setField(fix.OrderQty(100))
+    message.setField(fix.TimeInForce(fix.TimeInForce_DAY))
+    message.setField(fix.Price(price))
+    return message
+
+
+def _per_order_us(count: int, fn) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        fn(i)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--config", default="config/das_trader.cfg")
+    args = parser.parse_args()
+
+    application = FixApplication()
+    application.session_id = fix.SessionID("FIX.4.2", "BENCH", "DAS")
+    client = DasTraderFixClient(args.config, application)
+
+    legacy_us = _per_order_us(args.orders, lambda i: legacy_build(application, "AAPL", 150.25))
+    template_us = _per_order_us(
+        args.orders,
+        lambda i: client.build_order_message(
+            client.cl_ord_ids.next_id(), "AAPL", "BUY", "LIMIT", 100, 150.25, "DAY"
+        ),
+    )
+
+    ids: list[list[str]] = [[] for _ in range(args.threads)]
+
+    def allocate(bucket: list[str]) -> None:
+        for _ in range(args.orders):
+            bucket.append(client.cl_ord_ids.next_id())
+
+    workers = [threading.Thread(target=allocate, args=(bucket,)) for bucket in ids]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    all_ids = [cl_ord_id for bucket in ids for cl_ord_id in bucket]
+
+    print(f"orders={args.orders}")
+    print(f"legacy build       {legacy_us:8.2f} us/order")
+    print(f"template build     {template_us:8.2f} us/order ({legacy_us / template_us:.2f}x)")
+    print(
+        f"cl_ord_id burst    {len(all_ids)} ids from {args.threads} threads, "
+        f"{len(all_ids) - len(set(all_ids))} duplicates"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Callback cost and write throughput of the tick recorder, plus a memory-mapped read back.
+
+Usage: python -m benchmarks.bench_recorder --ticks 1000000 --symbols 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+
+from src.das_trader.market_data import MarketData
+from src.das_trader.recorder import TickReader, TickRecorder
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--segment-mb", type=int, default=16)
+    args = parser.parse_args()
+
+    ticks = [
+        MarketData(
+            symbol=f"SYM{i % args.symbols:05d}",
+            bid_price=99.99,
+            ask_price=100.01,
+            last_price=100.0,
+            volume=250000 + i,
+            timestamp=1_700_000_000 + i / 100_000,
+        )
+        for i in range(args.ticks)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = TickRecorder(directory, segment_bytes=args.segment_mb * 1024 * 1024)
+        recorder.start()
+        on_market_data = recorder.on_market_data
+
+        start = time.perf_counter()
+        for market_data in ticks:
+            on_market_data(market_data)
+        callback_sec = time.perf_counter() - start
+        recorder.close()
+        total_sec = time.perf_counter() - start
+
+        reader = TickReader(directory)
+        start = time.perf_counter()
+        read = sum(len(segment) for segment in reader.segments())
+        volume = sum(int(segment["volume"].sum()) for segment in reader.segments())
+        read_sec = time.perf_counter() - start
+
+    print(f"ticks={args.ticks} symbols={args.symbols} segments={len(reader.paths)}")
+    print(
+        f"callback           {callback_sec / args.ticks * 1e6:8.3f} us/tick "
+        f"({args.ticks / callback_sec:,.0f} ticks/s)"
+    )
+    print(f"record + drain     {args.ticks / total_sec:,.0f} ticks/s")
+    print(f"mmap read back     {read} records, volume checksum {volume}, {read_sec * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
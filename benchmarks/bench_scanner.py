@@ -0,0 +1,72 @@
+"""Full-universe scan time for ScannerBot and ShortSellingBot over the columnar quote store.
+
+Usage: python -m benchmarks.bench_scanner --symbols 10000 --rounds 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from src.bots.short_selling_bot import ShortSellingBot
+from src.config import ScannerSettings, ShortSellingSettings
+from src.das_trader.market_data import MarketDataHandler
+from src.logging_config import configure_logging
+from src.scanner.scanner_bot import ScannerBot
+
+
+def populate(handler: MarketDataHandler, symbols: int, rng: np.random.Generator) -> None:
+    prices = rng.uniform(5.0, 500.0, symbols)
+    for i in range(symbols):
+        handler.quotes.update(
+            f"SYM{i:05d}",
+            {
+                "bid_price": prices[i] - 0.01,
+                "ask_price": prices[i] + 0.01,
+                "last_price": prices[i],
+                "volume": 500000,
+            },
+            time.time(),
+        )
+
+
+def tick(handler: MarketDataHandler, rng: np.random.Generator) -> None:
+    n = handler.quotes.size
+    handler.quotes.last_price[:n] *= rng.normal(1.0, 0.01, n)
+    handler.quotes.volume[:n] += rng.integers(0, 1000, n)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    configure_logging("INFO")
+
+    rng = np.random.default_rng(7)
+    handler = MarketDataHandler()
+    populate(handler, args.symbols, rng)
+    scanner = ScannerBot(ScannerSettings(), handler)
+    short_bot = ShortSellingBot(ShortSellingSettings(), MagicMock(), handler)
+
+    scan_times = []
+    short_times = []
+    for _ in range(args.rounds):
+        tick(handler, rng)
+        start = time.perf_counter()
+        scanner.scan()
+        scan_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        short_bot.scan_short_opportunities()
+        short_times.append(time.perf_counter() - start)
+
+    print(f"symbols={args.symbols}")
+    print(f"ScannerBot.scan                      median {np.median(scan_times) * 1e3:8.3f} ms")
+    print(f"ShortSellingBot.scan_short_opps      median {np.median(short_times) * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
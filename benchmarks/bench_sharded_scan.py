@@ -0,0 +1,80 @@
+"""Full-universe scan time of ShardedScanner against the in-process ScannerBot.scan.
+
+Usage: python -m benchmarks.bench_sharded_scan --symbols 20000 --workers 1 2 4 8 --rounds 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+
+import numpy as np
+
+from benchmarks.bench_scanner import populate, tick
+from src.config import ScannerSettings
+from src.das_trader.market_data import MarketDataHandler
+from src.logging_config import configure_logging
+from src.scanner.scanner_bot import ScannerBot
+from src.scanner.sharded import ShardedScanner
+
+
+def in_process_times(symbols: int, rounds: int) -> list[float]:
+    rng = np.random.default_rng(7)
+    handler = MarketDataHandler()
+    populate(handler, symbols, rng)
+    scanner = ScannerBot(ScannerSettings(), handler)
+    scanner.scan()
+
+    times = []
+    for _ in range(rounds):
+        tick(handler, rng)
+        start = time.perf_counter()
+        scanner.scan()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+async def sharded_times(symbols: int, workers: int, rounds: int) -> list[float]:
+    rng = np.random.default_rng(7)
+    handler = MarketDataHandler()
+    populate(handler, symbols, rng)
+    sharded = ShardedScanner(ScannerBot(ScannerSettings(), handler), workers)
+    sharded.start()
+    try:
+        await sharded.scan()
+        times = []
+        for _ in range(rounds):
+            tick(handler, rng)
+            start = time.perf_counter()
+            await sharded.scan()
+            times.append(time.perf_counter() - start)
+        return times
+    finally:
+        sharded.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=20000)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, max(1, os.cpu_count() or 1)]
+    )
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    configure_logging("WARNING")
+
+    baseline = float(np.median(in_process_times(args.symbols, args.rounds)))
+    print(f"symbols={args.symbols} cpus={os.cpu_count()}")
+    print(f"in-process           median {baseline * 1e3:8.3f} ms")
+    for workers in sorted(set(args.workers)):
+        median = float(np.median(asyncio.run(sharded_times(args.symbols, workers, args.rounds))))
+        print(
+            f"{workers:>3} worker(s)         median {median * 1e3:8.3f} ms  "
+            f"speedup {baseline / median:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Time from process start to an order-capable DasTraderBot against the local simulated acceptor.
+
+Starts ``src.simulator.das_acceptor`` once, then launches the bot ``--rounds`` times in fresh
+interpreters. Each child imports ``src.main``, builds the bot, runs it until it is logged on
+and ready to send orders, and reports its import and construct-to-ready times; the parent
+times the whole span from spawning the process to that report.
+
+Usage: python -m benchmarks.bench_startup --rounds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ACCEPTOR_ADDRESS = ("127.0.0.1", 9878)
+LAZY_MODULES = (
+    "src.bots.short_selling_bot",
+    "src.das_trader.recorder",
+    "src.scanner.sharded",
+    "src.services.state_store",
+)
+
+
+def run_child(client_config: str) -> None:
+    start = time.perf_counter()
+    from src.config import DasTraderSettings, Settings, StateSettings
+    from src.logging_config import configure_logging
+    from src.main import DasTraderBot
+
+    import_sec = time.perf_counter() - start
+    configure_logging("WARNING")
+    settings = Settings(
+        das_trader=DasTraderSettings(
+            sender_comp_id="SIMCLIENT", username="sim", password="", fix_config_file=client_config
+        ),
+        state=StateSettings(enabled=False),
+    )
+
+    async def until_ready() -> float:
+        bot = DasTraderBot(settings)
+        task = asyncio.create_task(bot.run())
+        await asyncio.wait_for(bot.ready.wait(), timeout=30)
+        ready_sec = time.perf_counter() - bot.created_at
+        bot.running = False
+        await asyncio.wait_for(task, timeout=10)
+        return ready_sec
+
+    ready_sec = asyncio.run(until_ready())
+    print(
+        json.dumps(
+            {
+                "import_sec": import_sec,
+                "ready_sec": ready_sec,
+                "lazy_loaded": [name for name in LAZY_MODULES if name in sys.modules],
+            }
+        ),
+        flush=True,
+    )
+
+
+def wait_for_acceptor(timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(ACCEPTOR_ADDRESS, timeout=0.5).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--acceptor-config", default="config/das_simulator.cfg")
+    parser.add_argument("--client-config", default="config/das_simulator_client.cfg")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.client_config)
+        return
+
+    acceptor = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "src.simulator.das_acceptor",
+            "--config",
+            args.acceptor_config,
+            "--symbols",
+            "100",
+            "--rate",
+            "1000",
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_acceptor()
+        totals, imports, readies = [], [], []
+        lazy_loaded: set[str] = set()
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            child = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.bench_startup",
+                    "--child",
+                    "--client-config",
+                    args.client_config,
+                ],
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            report = json.loads(child.stdout.readline())
+            totals.append(time.perf_counter() - start)
+            child.wait(timeout=15)
+            imports.append(report["import_sec"])
+            readies.append(report["ready_sec"])
+            lazy_loaded.update(report["lazy_loaded"])
+    finally:
+        acceptor.send_signal(signal.SIGTERM)
+        acceptor.wait(timeout=10)
+
+    print(f"rounds={args.rounds} (medians)")
+    print(f"process start to ready {np.median(totals) * 1e3:8.1f} ms")
+    print(f"  import src.main      {np.median(imports) * 1e3:8.1f} ms")
+    print(f"  construct to ready   {np.median(readies) * 1e3:8.1f} ms")
+    print(f"optional modules loaded: {', '.join(sorted(lazy_loaded)) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Snapshot write and warm-restart load times of StateStore.
+
+Builds a book of ``--positions`` positions, ``--orders`` orders (a tenth of them open) and
+scanner baselines for ``--symbols`` symbols, then times the first (full) snapshot, incremental
+snapshots after ``--changes`` symbols tick, and loading the file into fresh components.
+
+Usage: python -m benchmarks.bench_state_store --symbols 10000 --positions 1000 --orders 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from src.bots.short_selling_bot import ShortSellingBot
+from src.config import ExecutionSettings, RiskSettings, ScannerSettings, ShortSellingSettings
+from src.das_trader.market_data import MarketDataHandler
+from src.execution.execution_bot import ExecutionBot, Order
+from src.logging_config import configure_logging
+from src.risk.risk_manager import RiskManager
+from src.scanner.scanner_bot import ScannerBot
+from src.services.state_store import StateStore
+
+
+def build(path: Path, positions: int) -> StateStore:
+    handler = MarketDataHandler()
+    risk_manager = RiskManager(RiskSettings(max_open_positions=positions + 1))
+    execution_bot = ExecutionBot(ExecutionSettings(), MagicMock())
+    short_selling_bot = ShortSellingBot(ShortSellingSettings(), execution_bot, handler)
+    scanner_bot = ScannerBot(ScannerSettings(min_volume=0), handler)
+    return StateStore(path, risk_manager, execution_bot, short_selling_bot, scanner_bot)
+
+
+def populate(
+    store: StateStore, symbols: int, positions: int, orders: int, rng: np.random.Generator
+):
+    handler = store.scanner_bot.market_data_handler
+    names = [f"SYM{i:05d}" for i in range(symbols)]
+    prices = rng.uniform(5.0, 500.0, symbols)
+    for name, price in zip(names, prices.tolist()):
+        handler.apply_update(name, {"last_price": price, "volume": 500_000}, time.time())
+    store.scanner_bot.scan()
+
+    for name, price in zip(names[:positions], prices.tolist()):
+        store.risk_manager.add_position(name, "BUY", 100, price)
+    for i in range(orders):
+        name = names[i % symbols]
+        store.execution_bot._track_order(
+            Order(
+                order_id=f"ORDER_bench_{i}",
+                symbol=name,
+                side="BUY",
+                order_type="LIMIT",
+                quantity=100,
+                price=float(prices[i % symbols]),
+                time_in_force="DAY",
+                status="NEW" if i % 10 == 0 else "FILLED",
+                filled_quantity=0 if i % 10 == 0 else 100,
+            )
+        )
+    return names, prices
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=10000)
+    parser.add_argument("--positions", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=50000)
+    parser.add_argument("--changes", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    configure_logging("WARNING")
+    rng = np.random.default_rng(7)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "state.db"
+        store = build(path, args.positions)
+        names, prices = populate(store, args.symbols, args.positions, args.orders, rng)
+
+        start = time.perf_counter()
+        delta = store.capture()
+        capture_sec = time.perf_counter() - start
+        store.write(delta)
+        print(f"symbols={args.symbols} positions={args.positions} orders={args.orders:,}")
+        print(
+            f"full snapshot        {delta.rows:>8,} rows  capture {capture_sec * 1e3:8.2f} ms  "
+            f"write {store.last_snapshot_sec * 1e3:8.2f} ms"
+        )
+
+        handler = store.scanner_bot.market_data_handler
+        capture_times, write_times, rows = [], [], []
+        for _ in range(args.rounds):
+            for k in rng.choice(args.symbols, args.changes, replace=False).tolist():
+                price = float(prices[k] * rng.uniform(0.99, 1.01))
+                handler.apply_update(names[k], {"last_price": price}, time.time())
+                store.risk_manager.on_price(names[k], price)
+            store.scanner_bot.scan()
+            start = time.perf_counter()
+            delta = store.capture()
+            capture_times.append(time.perf_counter() - start)
+            store.write(delta)
+            write_times.append(store.last_snapshot_sec)
+            rows.append(delta.rows)
+        print(
+            f"incremental snapshot {np.median(rows):>8,.0f} rows  "
+            f"capture {np.median(capture_times) * 1e3:8.2f} ms  "
+            f"write {np.median(write_times) * 1e3:8.2f} ms  (median of {args.rounds})"
+        )
+        store.close()
+
+        restored = build(path, args.positions)
+        start = time.perf_counter()
+        restored.load()
+        load_sec = time.perf_counter() - start
+        print(
+            f"load                 {load_sec * 1e3:8.2f} ms  "
+            f"({len(restored.risk_manager.positions):,} positions, "
+            f"{len(restored.execution_bot.orders):,} orders, "
+            f"{len(restored.execution_bot.open_orders):,} open)"
+        )
+        restored.close()
+        print(f"file size            {path.stat().st_size / 1024:8,.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""Per-tick and per-order hot-path benchmarks at several universe sizes, with JSON baselines.
+
+Each case is timed as the best of ``--rounds`` runs and reported in nanoseconds per operation.
+Save a run with ``--output`` and compare a later run against it with ``--baseline``; the exit
+status is 1 when any case is slower than the baseline by more than ``--threshold``.
+
+Usage:
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --baseline baseline.json --threshold 1.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Callable
+from unittest.mock import MagicMock
+
+import numpy as np
+import quickfix as fix
+
+from benchmarks.bench_market_data import build_snapshot
+from benchmarks.bench_scanner import populate, tick
+from src.bots.short_selling_bot import ShortSellingBot
+from src.config import ExecutionSettings, RiskSettings, ScannerSettings, ShortSellingSettings
+from src.das_trader.fix_client import DasTraderFixClient, FixApplication
+from src.das_trader.market_data import MarketDataHandler
+from src.das_trader.order_book import ASK, BID, OrderBookStore
+from src.execution.execution_bot import ExecutionBot
+from src.logging_config import configure_logging
+from src.risk.pre_trade import PreTradeCheck
+from src.risk.risk_manager import RiskManager
+from src.scanner.scanner_bot import ScannerBot
+
+DEFAULT_SIZES = (100, 1000, 10000)
+
+# A case builds its state for a universe of ``size`` and returns (run, ops): ``run`` performs
+# ``ops`` operations of the hot path under test.
+Case = Callable[[int, np.random.Generator, argparse.Namespace], tuple[Callable[[], None], int]]
+
+
+def _symbols(size: int) -> list[str]:
+    return [f"SYM{i:05d}" for i in range(size)]
+
+
+def market_data_update(size: int, rng: np.random.Generator, args: argparse.Namespace):
+    handler = MarketDataHandler()
+    prices = rng.uniform(5.0, 500.0, size)
+    snapshots = [
+        build_snapshot(symbol, float(price)) for symbol, price in zip(_symbols(size), prices)
+    ]
+    on_update = handler.on_market_data_update
+
+    def run():
+        for message in snapshots:
+            on_update(message)
+
+    return run, size
+
+
+def order_book_apply(size: int, rng: np.random.Generator, args: argparse.Namespace):
+    book = OrderBookStore(levels=20, capacity=size)
+    symbols = _symbols(size)
+    mids = rng.uniform(5.0, 500.0, size).round(2).tolist()
+    for symbol, mid in zip(symbols, mids):
+        entries = []
+        for i in range(1, 21):
+            entries.append((symbol, BID, fix.MDUpdateAction_NEW, round(mid - 0.01 * i, 2), 100, 0))
+            entries.append((symbol, ASK, fix.MDUpdateAction_NEW, round(mid + 0.01 * i, 2), 100, 0))
+        book.replace(symbol, entries)
+
+    # One size change five levels into the book per symbol, alternating sides.
+    updates = []
+    for i, (symbol, mid) in enumerate(zip(symbols, mids)):
+        side = i % 2
+        price = round(mid + 0.05, 2) if side == ASK else round(mid - 0.05, 2)
+        updates.append((symbol, side, fix.MDUpdateAction_CHANGE, price, 200 + i % 800, 0))
+    apply = book.apply
+
+    def run():
+        apply(updates)
+
+    return run, size
+
+
+def scanner_scan(size: int, rng: np.random.Generator, args: argparse.Namespace):
+    handler = MarketDataHandler()
+    populate(handler, size, rng)
+    scanner = ScannerBot(ScannerSettings(), handler)
+    scanner.scan()
+
+    def run():
+        tick(handler, rng)
+        scanner.scan()
+
+    return run, 1
+
+
+def short_selling_scan(size: int, rng: np.random.Generator, args: argparse.Namespace):
+    handler = MarketDataHandler()
+    populate(handler, size, rng)
+    short_bot = ShortSellingBot(ShortSellingSettings(), MagicMock(), handler)
+    short_bot.scan_short_opportunities()
+
+    def run():
+        tick(handler, rng)
+        short_bot.scan_short_opportunities()
+
+    return run, 1
+
+
+def _risk_manager(size: int, rng: np.random.Generator) -> tuple[RiskManager, list[str], np.ndarray]:
+    risk_manager = RiskManager(RiskSettings(max_open_positions=size + 1))
+    symbols = _symbols(size)
+    prices = rng.uniform(5.0, 500.0, size)
+    for symbol, price in zip(symbols, prices):
+        risk_manager.add_position(symbol, "BUY", 100, float(price))
+    return risk_manager, symbols, prices
+
+
+def risk_update_position_price(size: int, rng: np.random.Generator, args: argparse.Namespace):
+    risk_manager, symbols, prices = _risk_manager(size, rng)
+    # Marks stay above entry so the daily loss limit never trips mid-run.
+    marks = (prices * rng.uniform(1.0, 1.01, size)).tolist()
+    update = risk_manager.update_position_price
+
+    def run():
+        for symbol, mark in zip(symbols, marks):
+            update(symbol, mark)
+
+    return run, size
+
+
+def risk_validate_order(size: int, rng: np.random.Generator, args: argparse.Namespace):
+    risk_manager, symbols, prices = _risk_manager(size, rng)
+    orders = list(zip(symbols, prices.tolist()))
+    validate = risk_manager.validate_order
+
+    def run():
+        for symbol, price in orders:
+            validate(symbol, "BUY", 100, price)
+
+    return run, size
+
+
+def risk_pre_trade_check(size: int, rng: np.random.Generator, args: argparse.Namespace):
+    risk_manager, symbols, prices = _risk_manager(size, rng)
+    handler = MarketDataHandler()
+    for symbol, price in zip(symbols, prices.tolist()):
+        handler.quotes.update(symbol, {"last_price": price}, time.time())
+    settings = RiskSettings(
+        max_open_positions=size + 1, max_position_size_usd=1e9, max_gross_exposure_usd=1e12
+    )
+    pre_trade = PreTradeCheck(
+        settings, risk_manager, ExecutionBot(ExecutionSettings(), MagicMock()), handler
+    )
+    orders = list(zip(symbols, prices.tolist()))
+    check = pre_trade.check
+
+    def run():
+        for symbol, price in orders:
+            check(symbol, "BUY", 100, price)
+
+    return run, size
+
+
+def order_build(size: int, rng: np.random.Generator, args: argparse.Namespace):
+    application = FixApplication()
+    application.session_id = fix.SessionID("FIX.4.2", "BENCH", "DAS")
+    client = DasTraderFixClient(args.config, application)
+    orders = [
+        (client.cl_ord_ids.next_id(), symbol, float(price))
+        for symbol, price in zip(_symbols(size), rng.uniform(5.0, 500.0, size))
+    ]
+    build = client.build_order_message
+
+    def run():
+        for cl_ord_id, symbol, price in orders:
+            build(cl_ord_id, symbol, "BUY", "LIMIT", 100, price, "DAY")
+
+    return run, size
+
+
+CASES: dict[str, Case] = {
+    "market_data.on_market_data_update": market_data_update,
+    "order_book.apply": order_book_apply,
+    "scanner.scan": scanner_scan,
+    "short_selling.scan_short_opportunities": short_selling_scan,
+    "risk.update_position_price": risk_update_position_price,
+    "risk.validate_order": risk_validate_order,
+    "risk.pre_trade_check": risk_pre_trade_check,
+    "fix_client.build_order_message": order_build,
+}
+
+
+def measure(run: Callable[[], None], ops: int, rounds: int) -> float:
+    run()  # warm-up
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        run()
+        best = min(best, time.perf_counter_ns() - start)
+    return best / ops
+
+
+def run_suite(args: argparse.Namespace) -> dict:
+    results: dict[str, dict[str, float | int]] = {}
+    for name, case in CASES.items():
+        if args.only and not any(pattern in name for pattern in args.only):
+            continue
+        for size in args.sizes:
+            run, ops = case(size, np.random.default_rng(args.seed), args)
+            key = f"{name}[{size}]"
+            results[key] = {"size": size, "ops": ops, "ns_per_op": measure(run, ops, args.rounds)}
+            print(f"{key:<52} {results[key]['ns_per_op']:>14,.0f} ns/op", flush=True)
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "timestamp": time.time(),
+            "rounds": args.rounds,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print current vs baseline per case and return the keys slower than ``threshold``."""
+    regressions = []
+    print(f"\n{'case':<52} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for key, current in report["results"].items():
+        previous = baseline["results"].get(key)
+        if previous is None:
+            print(f"{key:<52} {'-':>12} {current['ns_per_op']:>12,.0f}")
+            continue
+        ratio = current["ns_per_op"] / previous["ns_per_op"]
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(
+            f"{key:<52} {previous['ns_per_op']:>12,.0f} {current['ns_per_op']:>12,.0f} "
+            f"{ratio:>6.2f}x{flag}"
+        )
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--only", nargs="+", help="Run only cases whose name contains one of these")
+    parser.add_argument("--config", default="config/das_trader.cfg")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a JSON file written by --output")
+    parser.add_argument(
+        "--threshold", type=float, default=1.2, help="Slowdown ratio reported as a regression"
+    )
+    args = parser.parse_args()
+    configure_logging("WARNING")
+
+    report = run_suite(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.2f}x")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
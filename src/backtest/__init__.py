@@ -0,0 +1,4 @@
+from src.backtest.engine import BacktestEngine, BacktestResult, read_ticks_csv
+from src.backtest.sim_client import SimulatedFixClient
+
+__all__ = ["BacktestEngine", "BacktestResult", "SimulatedFixClient", "read_ticks_csv"]
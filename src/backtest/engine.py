@@ -0,0 +1,199 @@
+"""Replay recorded ticks through the production bot on a simulated clock.
+
+Usage: python -m src.backtest.engine --ticks day.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import time
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+import numpy as np
+import structlog
+
+from src.backtest.sim_client import SimulatedFixClient
+from src.config import DasTraderSettings, Settings
+from src.das_trader.quote_store import QUOTE_COLUMNS
+from src.logging_config import configure_logging
+from src.main import SHORT_SCAN_INTERVAL_SEC, DasTraderBot
+
+logger = structlog.get_logger(__name__)
+
+Tick = tuple[str, dict[str, float | int], float]
+
+
+@dataclass
+class BacktestResult:
+    ticks: int
+    start_time: float
+    end_time: float
+    wall_time_sec: float
+    orders: int
+    filled_orders: int
+    rejected_orders: int
+    daily_pnl: float
+    unrealized_pnl: float
+    open_positions: int
+
+    @property
+    def ticks_per_sec(self) -> float:
+        return self.ticks / self.wall_time_sec if self.wall_time_sec else 0.0
+
+
+class BacktestEngine:
+    """Drives an unmodified DasTraderBot from recorded ticks instead of a FIX session.
+
+    Ticks go straight into ``MarketDataHandler.apply_update``, which also fires the bot's
+    tick-driven risk exits, and the periodic work (interval or event scans, short scans) runs at
+    the simulated times the asyncio loops would have woken at, so a day replays as fast as the
+    components can process it.
+    Orders go to a SimulatedFixClient whose execution reports are applied through the bot's
+    normal report sink after every step.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.client = SimulatedFixClient()
+        self.bot = DasTraderBot(settings, fix_client=self.client)
+        self.client.attach(self.bot.market_data_handler)
+        # The simulated session is always logged on and has nothing to reconcile.
+        self.bot.ready.set()
+        self.now = 0.0
+
+        scanner = settings.scanner
+        self.event_mode = scanner.scan_mode == "event"
+        self.batch_window_sec = scanner.event_batch_window_ms / 1000
+        self.next_scan: float | None = None
+        self.next_short: float | None = None
+        self.event_scan_due: float | None = None
+        if self.event_mode:
+            self.bot.market_data_handler.register_dirty_callback(self._on_dirty)
+
+    def run(self, ticks: Iterable[Tick]) -> BacktestResult:
+        started = time.perf_counter()
+        apply_update = self.bot.market_data_handler.apply_update
+        count = 0
+        start_time = None
+
+        for symbol, fields, timestamp in ticks:
+            if start_time is None:
+                start_time = timestamp
+                self._schedule(timestamp)
+            self._advance(timestamp)
+            self.now = timestamp
+            apply_update(symbol, fields, timestamp)
+            self._deliver_reports()
+            count += 1
+
+        # Flush a trailing event-mode batch window.
+        if self.event_scan_due is not None:
+            self._advance(self.event_scan_due)
+
+        return self._result(
+            count, self.now if start_time is None else start_time, time.perf_counter() - started
+        )
+
+    def _schedule(self, start: float):
+        self.now = start
+        if not self.event_mode:
+            self.next_scan = start
+        if self.settings.short_selling.enabled:
+            self.next_short = start
+
+    def _on_dirty(self):
+        if self.event_scan_due is None:
+            self.event_scan_due = self.now + self.batch_window_sec
+
+    def _advance(self, until: float):
+        """Run every periodic task due at or before ``until``, in simulated-time order."""
+        bot = self.bot
+        while True:
+            pending = [
+                t for t in (self.event_scan_due, self.next_scan, self.next_short) if t is not None
+            ]
+            due = min(pending, default=None)
+            if due is None or due > until:
+                return
+            self.now = due
+
+            if due == self.event_scan_due:
+                self.event_scan_due = None
+                bot.run_scan(dirty_only=True)
+            elif due == self.next_scan:
+                self.next_scan = due + self.settings.scanner.scan_interval_sec
+                bot.run_scan()
+            else:
+                self.next_short = due + SHORT_SCAN_INTERVAL_SEC
+                bot.run_short_selling_pass()
+            self._deliver_reports()
+
+    def _deliver_reports(self):
+        report_sink = self.bot.execution_bot.report_sink
+        reports = self.client.take_reports()
+        while reports:
+            for report in reports:
+                report_sink(report)
+            reports = self.client.take_reports()
+
+    def _result(self, ticks: int, start_time: float, wall_time_sec: float) -> BacktestResult:
+        orders = self.bot.execution_bot.orders.values()
+        positions = self.bot.risk_manager.get_positions()
+        return BacktestResult(
+            ticks=ticks,
+            start_time=start_time,
+            end_time=self.now,
+            wall_time_sec=wall_time_sec,
+            orders=len(orders),
+            filled_orders=sum(order.status == "FILLED" for order in orders),
+            rejected_orders=sum(order.status == "REJECTED" for order in orders),
+            daily_pnl=self.bot.risk_manager.get_daily_pnl(),
+            unrealized_pnl=self.bot.risk_manager.unrealized_pnl,
+            open_positions=len(positions),
+        )
+
+
+def read_ticks_csv(path: str) -> Iterator[Tick]:
+    """Yield ticks from a CSV with ``timestamp`` and ``symbol`` columns plus any quote columns.
+
+    Rows must already be in timestamp order.
+    """
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        columns = [
+            (name, int if QUOTE_COLUMNS[name] is np.int64 else float)
+            for name in reader.fieldnames or ()
+            if name in QUOTE_COLUMNS and name != "timestamp"
+        ]
+        for row in reader:
+            fields = {name: cast(float(row[name])) for name, cast in columns if row[name] != ""}
+            yield row["symbol"], fields, float(row["timestamp"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", required=True, help="CSV of recorded ticks in timestamp order")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+    configure_logging(args.log_level)
+
+    settings = Settings(
+        das_trader=DasTraderSettings(sender_comp_id="BACKTEST", username="backtest", password="")
+    )
+    result = BacktestEngine(settings).run(read_ticks_csv(args.ticks))
+
+    print(f"ticks              {result.ticks:,} ({result.ticks_per_sec:,.0f}/s)")
+    print(f"simulated span     {result.end_time - result.start_time:,.0f} s")
+    print(f"wall time          {result.wall_time_sec:,.1f} s")
+    print(
+        f"orders             {result.orders} ({result.filled_orders} filled, "
+        f"{result.rejected_orders} rejected)"
+    )
+    print(f"daily P&L          {result.daily_pnl:,.2f}")
+    print(f"unrealized P&L     {result.unrealized_pnl:,.2f} over {result.open_positions} positions")
+
+
+if __name__ == "__main__":
+    main()
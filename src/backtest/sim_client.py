@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import quickfix as fix
+import structlog
+
+from src.das_trader.execution_report import ExecutionReport
+from src.das_trader.market_data import MarketData, MarketDataHandler
+from src.das_trader.order_ids import ClOrdIdAllocator
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class _RestingOrder:
+    cl_ord_id: str
+    symbol: str
+    side: str
+    order_type: str
+    quantity: int
+    price: float
+
+
+class SimulatedFixClient:
+    """In-memory stand-in for DasTraderFixClient that fills orders against the replayed quotes.
+
+    Market orders fill in full at the touch (ask for buys, bid for sells, last if the side is
+    empty). Limit orders fill at the touch once marketable and stop orders fill at the last
+    price once triggered; both rest until then. Execution reports are queued in ``reports``
+    rather than applied inline, so the ExecutionBot has tracked an order before its ack and
+    fill arrive, as it would live.
+    """
+
+    def __init__(self):
+        self.market_data_handler: MarketDataHandler | None = None
+        self.cl_ord_ids = ClOrdIdAllocator(start_time_ms=0)
+        self.reports: list[ExecutionReport] = []
+        self.resting: dict[str, dict[str, _RestingOrder]] = {}
+        # Terminal OrdStatus by ClOrdID, for rejecting cancels of orders that already left the book.
+        self.closed: dict[str, str] = {}
+        self._exec_ids = 0
+
+    def attach(self, market_data_handler: MarketDataHandler):
+        self.market_data_handler = market_data_handler
+        market_data_handler.register_callback(self.on_market_data)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def is_logged_on(self) -> bool:
+        return True
+
+    def send_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: int,
+        price: float | None = None,
+        time_in_force: str = "DAY",
+    ) -> str:
+        cl_ord_id = self.cl_ord_ids.next_id("ORDER")
+        self._report(cl_ord_id, symbol, fix.ExecType_NEW, fix.OrdStatus_NEW, leaves_qty=quantity)
+
+        market_data = self.market_data_handler.get_market_data(symbol)
+        if order_type == "MARKET":
+            fill_price = _touch(market_data, side) if market_data else 0.0
+            if fill_price > 0:
+                self._fill(cl_ord_id, symbol, quantity, fill_price)
+            else:
+                self._close(
+                    cl_ord_id, symbol, fix.ExecType_REJECTED, fix.OrdStatus_REJECTED, "No quote"
+                )
+            return cl_ord_id
+
+        order = _RestingOrder(cl_ord_id, symbol, side, order_type, quantity, price or 0.0)
+        fill_price = _trigger_price(order, market_data) if market_data else 0.0
+        if fill_price > 0:
+            self._fill(cl_ord_id, symbol, quantity, fill_price)
+        else:
+            self.resting.setdefault(symbol, {})[cl_ord_id] = order
+        return cl_ord_id
+
+    def send_orders(
+        self, orders: list[tuple[str, str, str, int, float | None, str]]
+    ) -> list[str | Exception]:
+        return [self.send_order(*order) for order in orders]
+
+    def cancel_order(self, order_id: str, symbol: str) -> str:
+        cl_ord_id = self.cl_ord_ids.next_id("CANCEL")
+        order = self.resting.get(symbol, {}).pop(order_id, None)
+        if order is None:
+            # Cancel reject: report the order's own final status so the bot leaves PENDING_CANCEL.
+            self._report(
+                cl_ord_id,
+                symbol,
+                "",
+                self.closed.get(order_id, ""),
+                orig_cl_ord_id=order_id,
+                text="Unknown order",
+            )
+            return cl_ord_id
+
+        self.closed[order_id] = fix.OrdStatus_CANCELED
+        self._report(
+            cl_ord_id,
+            symbol,
+            fix.ExecType_CANCELED,
+            fix.OrdStatus_CANCELED,
+            orig_cl_ord_id=order_id,
+            leaves_qty=0,
+        )
+        return cl_ord_id
+
+    def request_order_status(self, order_id: str, symbol: str, side: str):
+        order = self.resting.get(symbol, {}).get(order_id)
+        if order is not None:
+            self._report(
+                order_id,
+                symbol,
+                fix.ExecType_ORDER_STATUS,
+                fix.OrdStatus_NEW,
+                leaves_qty=order.quantity,
+            )
+        elif order_id in self.closed:
+            self._report(order_id, symbol, fix.ExecType_ORDER_STATUS, self.closed[order_id])
+        else:
+            self._report(
+                order_id,
+                symbol,
+                fix.ExecType_ORDER_STATUS,
+                fix.OrdStatus_REJECTED,
+                leaves_qty=0,
+                text="Unknown order",
+            )
+
+    def on_market_data(self, market_data: MarketData):
+        resting = self.resting.get(market_data.symbol)
+        if not resting:
+            return
+        for cl_ord_id, order in list(resting.items()):
+            fill_price = _trigger_price(order, market_data)
+            if fill_price > 0:
+                del resting[cl_ord_id]
+                self._fill(cl_ord_id, order.symbol, order.quantity, fill_price)
+
+    def take_reports(self) -> list[ExecutionReport]:
+        reports, self.reports = self.reports, []
+        return reports
+
+    def _fill(self, cl_ord_id: str, symbol: str, quantity: int, price: float):
+        self.closed[cl_ord_id] = fix.OrdStatus_FILLED
+        self._report(
+            cl_ord_id,
+            symbol,
+            fix.ExecType_TRADE,
+            fix.OrdStatus_FILLED,
+            last_qty=quantity,
+            last_px=price,
+            cum_qty=quantity,
+            avg_px=price,
+            leaves_qty=0,
+        )
+
+    def _close(self, cl_ord_id: str, symbol: str, exec_type: str, ord_status: str, text: str):
+        self.closed[cl_ord_id] = ord_status
+        self._report(cl_ord_id, symbol, exec_type, ord_status, leaves_qty=0, text=text)
+
+    def _report(
+        self,
+        cl_ord_id: str,
+        symbol: str,
+        exec_type: str,
+        ord_status: str,
+        orig_cl_ord_id: str = "",
+        last_qty: int = 0,
+        last_px: float = 0.0,
+        cum_qty: int | None = None,
+        avg_px: float | None = None,
+        leaves_qty: int | None = None,
+        text: str = "",
+    ):
+        self._exec_ids += 1
+        self.reports.append(
+            ExecutionReport(
+                cl_ord_id=cl_ord_id,
+                orig_cl_ord_id=orig_cl_ord_id,
+                order_id=f"SIM_{cl_ord_id}",
+                exec_id=str(self._exec_ids),
+                exec_type=exec_type,
+                ord_status=ord_status,
+                symbol=symbol,
+                last_qty=last_qty,
+                last_px=last_px,
+                cum_qty=cum_qty,
+                avg_px=avg_px,
+                leaves_qty=leaves_qty,
+                text=text,
+            )
+        )
+
+
+def _touch(market_data: MarketData, side: str) -> float:
+    price = market_data.ask_price if side == "BUY" else market_data.bid_price
+    return price if price > 0 else market_data.last_price
+
+
+def _trigger_price(order: _RestingOrder, market_data: MarketData) -> float:
+    """Fill price if ``order`` executes against ``market_data``, otherwise 0.0."""
+    if order.order_type == "LIMIT":
+        touch = _touch(market_data, order.side)
+        if touch <= 0:
+            return 0.0
+        if order.side == "BUY":
+            return touch if touch <= order.price else 0.0
+        return touch if touch >= order.price else 0.0
+
+    last = market_data.last_price
+    if last <= 0:
+        return 0.0
+    if order.side == "BUY":
+        return last if last >= order.price else 0.0
+    return last if last <= order.price else 0.0
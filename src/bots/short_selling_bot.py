@@ -1,18 +1,19 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
 
+import numpy as np
 import structlog
 
 from src.config import ShortSellingSettings
-from src.das_trader.market_data import MarketData, MarketDataHandler
+from src.das_trader.market_data import MarketDataHandler
+from src.das_trader.quote_store import resize_column
 from src.execution.execution_bot import ExecutionBot
 
 logger = structlog.get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ShortOpportunity:
     symbol: str
     entry_price: float
@@ -31,33 +32,42 @@ class ShortSellingBot:
         self.execution_bot = execution_bot
         self.market_data_handler = market_data_handler
         self.short_positions: dict[str, int] = {}
-        self.previous_prices: dict[str, float] = {}
+        # Last scanned price per quote-store row; 0.0 means not seen yet.
+        self.previous_prices = np.zeros(0, dtype=np.float64)
 
     def scan_short_opportunities(self) -> list[ShortOpportunity]:
-        opportunities = []
-        current_data = self.market_data_handler.market_data
+        quotes = self.market_data_handler.quotes
+        n = quotes.size
+        if len(self.previous_prices) < n:
+            self.previous_prices = resize_column(self.previous_prices, quotes.capacity)
 
-        for symbol, data in current_data.items():
-            if symbol in self.short_positions:
-                continue
+        last = quotes.last_price[:n]
+        previous = self.previous_prices[:n]
 
-            previous_price = self.previous_prices.get(symbol)
-            if not previous_price:
-                self.previous_prices[symbol] = data.last_price
-                continue
+        eligible = np.ones(n, dtype=bool)
+        for symbol in self.short_positions:
+            row = quotes.get_row(symbol)
+            if row is not None:
+                eligible[row] = False
 
-            drop_pct = ((data.last_price - previous_price) / previous_price) * 100
+        has_previous = eligible & (previous != 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drop_pct = np.where(has_previous, (last - previous) / previous * 100, 0.0)
+        hits = has_previous & (drop_pct <= self.settings.short_entry_threshold_pct)
 
-            if drop_pct <= self.settings.short_entry_threshold_pct:
-                opportunity = ShortOpportunity(
-                    symbol=symbol,
-                    entry_price=data.last_price,
-                    drop_pct=drop_pct,
-                    reason=f"Price drop: {drop_pct:.2f}%",
+        opportunities = []
+        for row in np.flatnonzero(hits):
+            symbol_drop_pct = float(drop_pct[row])
+            opportunities.append(
+                ShortOpportunity(
+                    symbol=quotes.symbols[row],
+                    entry_price=float(last[row]),
+                    drop_pct=symbol_drop_pct,
+                    reason=f"Price drop: {symbol_drop_pct:.2f}%",
                 )
-                opportunities.append(opportunity)
+            )
 
-            self.previous_prices[symbol] = data.last_price
+        previous[eligible] = last[eligible]
 
         return opportunities
 
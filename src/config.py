@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-from typing import Any
-
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -14,13 +12,33 @@ class DasTraderSettings(BaseModel):
     username: str = Field(description="DAS Trader username")
     password: str = Field(description="DAS Trader password")
     fix_config_file: str = Field(default="config/das_trader.cfg", description="FIX config file path")
+    book_levels: int = Field(
+        default=0, description="Level 2 price levels kept per side per symbol; 0 disables the book"
+    )
 
 
 class ScannerSettings(BaseModel):
     enabled: bool = Field(default=True, description="Enable scanner bot")
     scan_interval_sec: float = Field(default=1.0, description="Scanner refresh interval")
+    scan_mode: str = Field(
+        default="interval",
+        description="Scan mode: interval (full universe) or event (ticked symbols)",
+    )
+    event_batch_window_ms: float = Field(
+        default=0.0, description="Micro-batch window for event mode; 0 scans on wakeup"
+    )
+    scan_workers: int = Field(
+        default=0, description="Worker processes sharing the scan; 0 scans in the event loop"
+    )
     price_breakout_threshold_pct: float = Field(default=2.0, description="Price breakout threshold %")
     volume_spike_threshold: float = Field(default=2.0, description="Volume spike multiplier")
+    rolling_window: int = Field(
+        default=0,
+        description="N-tick window for breakout/volume stats; 0 compares with the previous scan",
+    )
+    rolling_breakout_margin_pct: float = Field(
+        default=0.0, description="Minimum move past the N-bar high/low to count as a breakout"
+    )
     min_price: float = Field(default=1.0, description="Minimum stock price")
     max_price: float = Field(default=1000.0, description="Maximum stock price")
     min_volume: int = Field(default=100000, description="Minimum daily volume")
@@ -49,6 +67,54 @@ class RiskSettings(BaseModel):
     trailing_stop_pct: float = Field(default=1.0, description="Trailing stop percentage")
     take_profit_pct: float = Field(default=5.0, description="Take profit percentage")
     max_open_positions: int = Field(default=10, description="Maximum open positions")
+    max_gross_exposure_usd: float = Field(
+        default=250000.0, description="Maximum gross notional of positions plus open orders"
+    )
+    price_collar_pct: float = Field(
+        default=5.0, description="Reject orders priced further than this % from the bid/ask"
+    )
+    fat_finger_shares: int = Field(default=5000, description="Reject orders above this many shares")
+
+
+class RecorderSettings(BaseModel):
+    enabled: bool = Field(default=False, description="Record every quote update to disk")
+    directory: str = Field(default="data/ticks", description="Tick segment directory")
+    segment_mb: int = Field(default=256, description="Start a new segment file after this many MB")
+    queue_policy: str = Field(
+        default="drop_oldest",
+        description=(
+            "Recorder queue overflow policy: drop_oldest, latest, block, or inline; block is "
+            "refused in live trading, where quotes are published from the event loop"
+        ),
+    )
+    queue_size: int = Field(default=65536, description="Quotes the recorder queue holds")
+
+
+class StateSettings(BaseModel):
+    enabled: bool = Field(
+        default=True, description="Snapshot trading state and restore it on startup"
+    )
+    path: str = Field(default="store/bot_state.db", description="SQLite state snapshot file")
+    snapshot_interval_sec: float = Field(default=1.0, description="Seconds between state snapshots")
+
+
+class SubscriptionSettings(BaseModel):
+    enabled: bool = Field(default=True, description="Request market data for the tradable universe")
+    batch_size: int = Field(default=500, description="Symbols per MarketDataRequest")
+    requests_per_sec: float = Field(
+        default=5.0, description="Maximum MarketDataRequests per second"
+    )
+    refresh_sec: float = Field(default=5.0, description="Seconds between universe recomputations")
+    pending_timeout_sec: float = Field(
+        default=30.0, description="Retry a subscribed symbol alone if it has no quote by then"
+    )
+    recheck_ineligible_sec: float = Field(
+        default=300.0,
+        description="Seconds an out-of-band symbol stays unsubscribed before a recheck",
+    )
+    universe_file: str | None = Field(
+        default=None, description="File of extra symbols to trade, one per line"
+    )
 
 
 class Settings(BaseSettings):
@@ -56,6 +122,13 @@ class Settings(BaseSettings):
 
     environment: str = "development"
     log_level: str = "INFO"
+    log_async: bool = Field(
+        default=True, description="Render and write logs on a background thread"
+    )
+    log_sample_every: dict[str, int] = Field(
+        default_factory=lambda: {"market_data_updated": 100},
+        description="Keep 1 in N of these high-frequency log events",
+    )
 
     # DAS Trader FIX connection
     das_trader: DasTraderSettings = Field(default_factory=DasTraderSettings)
@@ -65,13 +138,20 @@ class Settings(BaseSettings):
     execution: ExecutionSettings = Field(default_factory=ExecutionSettings)
     short_selling: ShortSellingSettings = Field(default_factory=ShortSellingSettings)
     risk: RiskSettings = Field(default_factory=RiskSettings)
+    recorder: RecorderSettings = Field(default_factory=RecorderSettings)
+    state: StateSettings = Field(default_factory=StateSettings)
+    subscriptions: SubscriptionSettings = Field(default_factory=SubscriptionSettings)
 
     # Trading symbols
     symbols: list[str] = Field(default=["AAPL", "MSFT", "GOOGL"], description="Symbols to trade")
 
     # Metrics and logging
+    metrics_enabled: bool = Field(default=True, description="Serve Prometheus metrics over HTTP")
     metrics_host: str = "0.0.0.0"
     metrics_port: int = 9306
+    trace_sample_every: int = Field(
+        default=64, description="Record per-tick hot-path stage latencies for 1 in N messages"
+    )
 
 
 _settings: Settings | None = None
@@ -82,4 +162,3 @@ def get_settings() -> Settings:
     if _settings is None:
         _settings = Settings()
     return _settings
-
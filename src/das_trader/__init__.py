@@ -1,5 +1,14 @@
+from src.das_trader.execution_report import ExecutionReport, decode_execution_report
 from src.das_trader.fix_client import DasTraderFixClient, FixApplication
 from src.das_trader.market_data import MarketData, MarketDataHandler
+from src.das_trader.order_book import OrderBookStore
 
-__all__ = ["DasTraderFixClient", "FixApplication", "MarketData", "MarketDataHandler"]
-
+__all__ = [
+    "DasTraderFixClient",
+    "ExecutionReport",
+    "FixApplication",
+    "MarketData",
+    "MarketDataHandler",
+    "OrderBookStore",
+    "decode_execution_report",
+]
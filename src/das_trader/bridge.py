@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import TYPE_CHECKING
+
+import structlog
+
+from src.das_trader.dispatch import BLOCK
+from src.services.metrics import record_market_data_bridge
+
+if TYPE_CHECKING:
+    from src.das_trader.market_data import MarketDataHandler
+
+logger = structlog.get_logger(__name__)
+
+
+class MarketDataBridge:
+    """Hands decoded quotes from the QuickFIX socket thread to the asyncio event loop.
+
+    Every symbol has one pending slot. A newer update for a symbol that has not been drained yet
+    is merged into that slot (latest value wins) and counted as a conflation drop, so the feed
+    thread only ever takes a short lock and never runs strategy code. The loop is woken with
+    ``call_soon_threadsafe`` when the pending set goes from empty to non-empty, and ``drain``
+    applies the batch to the quote store and callbacks on the loop thread.
+    """
+
+    def __init__(self, handler: MarketDataHandler, loop: asyncio.AbstractEventLoop):
+        # drain() publishes on the loop thread, where a full ``block`` queue would stall it.
+        for consumer in handler.consumers:
+            if consumer.policy == BLOCK:
+                raise ValueError(
+                    f"Consumer {consumer.name!r} uses the block policy, which would stall the "
+                    "event loop the bridge publishes on"
+                )
+        self.handler = handler
+        self.loop = loop
+        self._pending: dict[str, list] = {}
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.conflated = 0
+        self.drained = 0
+        self.max_depth = 0
+        self._conflated_reported = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def put(self, symbol: str, fields: dict[str, float | int], timestamp: float):
+        with self._lock:
+            pending = self._pending
+            schedule = not pending
+            slot = pending.get(symbol)
+            if slot is None:
+                pending[symbol] = [fields, timestamp]
+            else:
+                slot[0].update(fields)
+                slot[1] = timestamp
+                self.conflated += 1
+            self.enqueued += 1
+            if len(pending) > self.max_depth:
+                self.max_depth = len(pending)
+
+        if schedule:
+            try:
+                self.loop.call_soon_threadsafe(self.drain)
+            except RuntimeError:
+                # Event loop already closed during shutdown; nothing left to deliver to.
+                pass
+
+    def drain(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            conflated = self.conflated
+
+        record_market_data_bridge(len(pending), conflated - self._conflated_reported)
+        self._conflated_reported = conflated
+
+        apply_update = self.handler.apply_update
+        for symbol, (fields, timestamp) in pending.items():
+            try:
+                apply_update(symbol, fields, timestamp)
+            except Exception as e:
+                logger.error("market_data_dispatch_error", symbol=symbol, error=str(e))
+        self.drained += len(pending)
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "conflated": self.conflated,
+            "drained": self.drained,
+        }
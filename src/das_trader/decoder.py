@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import quickfix as fix
+
+from src.das_trader.order_book import ENTRY_SIDES, DepthEntry
+
+SOH = "\x01"
+
+TAG_SYMBOL = "55"
+TAG_MD_ENTRY_TYPE = "269"
+TAG_MD_ENTRY_PX = "270"
+TAG_MD_ENTRY_SIZE = "271"
+TAG_MD_UPDATE_ACTION = "279"
+TAG_MD_ENTRY_POSITION_NO = "290"
+
+_ENTRY_FIELDS: dict[str, tuple[str, str]] = {
+    fix.MDEntryType_BID: ("bid_price", "bid_size"),
+    fix.MDEntryType_OFFER: ("ask_price", "ask_size"),
+    fix.MDEntryType_TRADE: ("last_price", "last_size"),
+}
+
+
+def empty_quote_fields() -> dict[str, float | int]:
+    return {
+        "bid_price": 0.0,
+        "ask_price": 0.0,
+        "last_price": 0.0,
+        "volume": 0,
+        "bid_size": 0,
+        "ask_size": 0,
+        "last_size": 0,
+    }
+
+
+class MarketDataDecoder:
+    """Single-pass decoder for MarketDataSnapshotFullRefresh (35=W) and
+    MarketDataIncrementalRefresh (35=X) messages.
+
+    The message is serialized once and its tag=value pairs are walked in order, so every
+    NoMDEntries group is read exactly once without going through per-field SWIG lookups.
+    Passing a ``depth`` list also collects every bid and offer entry, at any level, for an
+    OrderBookStore.
+    """
+
+    def decode_snapshot(
+        self, message: fix.Message, depth: list[DepthEntry] | None = None
+    ) -> tuple[str, dict[str, float | int]]:
+        return self.decode_snapshot_raw(message.toString(), depth)
+
+    def decode_incremental(
+        self, message: fix.Message, depth: list[DepthEntry] | None = None
+    ) -> dict[str, dict[str, float | int]]:
+        return self.decode_incremental_raw(message.toString(), depth)
+
+    def decode_snapshot_raw(
+        self, raw: str, depth: list[DepthEntry] | None = None
+    ) -> tuple[str, dict[str, float | int]]:
+        symbol = ""
+        fields = empty_quote_fields()
+        seen: set[str] = set()
+        entry_type: str | None = None
+        px: str | None = None
+        size: str | None = None
+
+        for pair in raw.split(SOH):
+            tag, _, value = pair.partition("=")
+            if tag == TAG_MD_ENTRY_TYPE:
+                # Depth entries follow the top of book; only the first entry of each type is kept.
+                if entry_type is not None:
+                    if entry_type not in seen:
+                        seen.add(entry_type)
+                        _apply_entry(fields, entry_type, fix.MDUpdateAction_NEW, px, size)
+                    if depth is not None:
+                        _collect_depth(depth, "", entry_type, fix.MDUpdateAction_NEW, px, size, 0)
+                entry_type = value
+                px = size = None
+            elif tag == TAG_MD_ENTRY_PX:
+                px = value
+            elif tag == TAG_MD_ENTRY_SIZE:
+                if entry_type is None:
+                    fields["volume"] = int(float(value))
+                else:
+                    size = value
+            elif tag == TAG_SYMBOL and entry_type is None:
+                symbol = value
+
+        if entry_type is not None:
+            if entry_type not in seen:
+                _apply_entry(fields, entry_type, fix.MDUpdateAction_NEW, px, size)
+            if depth is not None:
+                _collect_depth(depth, "", entry_type, fix.MDUpdateAction_NEW, px, size, 0)
+
+        if not symbol:
+            raise ValueError("Market data snapshot without Symbol(55)")
+        return symbol, fields
+
+    def decode_incremental_raw(
+        self, raw: str, depth: list[DepthEntry] | None = None
+    ) -> dict[str, dict[str, float | int]]:
+        """Return only the fields changed by the message, keyed by symbol."""
+        default_symbol = ""
+        updates: dict[str, dict[str, float | int]] = {}
+        in_group = False
+        action = fix.MDUpdateAction_NEW
+        entry_type: str | None = None
+        symbol: str | None = None
+        px: str | None = None
+        size: str | None = None
+        position = 1
+
+        def flush() -> None:
+            entry_symbol = symbol or default_symbol
+            if entry_type is None or not entry_symbol:
+                return
+            if depth is not None:
+                _collect_depth(depth, entry_symbol, entry_type, action, px, size, position)
+            elif action == fix.MDUpdateAction_DELETE and entry_type in ENTRY_SIDES:
+                # Without a book the level that moves up is unknown; the old top of book stays
+                # until the feed sends its replacement.
+                return
+            if position > 1:
+                return
+            fields = updates.get(entry_symbol)
+            if fields is None:
+                fields = updates[entry_symbol] = {}
+            _apply_entry(fields, entry_type, action, px, size)
+
+        for pair in raw.split(SOH):
+            tag, _, value = pair.partition("=")
+            if tag == TAG_MD_UPDATE_ACTION or (tag == TAG_MD_ENTRY_TYPE and entry_type is not None):
+                if in_group:
+                    flush()
+                in_group = True
+                action = value if tag == TAG_MD_UPDATE_ACTION else fix.MDUpdateAction_NEW
+                entry_type = value if tag == TAG_MD_ENTRY_TYPE else None
+                symbol = px = size = None
+                position = 1
+            elif tag == TAG_MD_ENTRY_TYPE:
+                in_group = True
+                entry_type = value
+            elif tag == TAG_MD_ENTRY_PX:
+                px = value
+            elif tag == TAG_MD_ENTRY_SIZE:
+                size = value
+            elif tag == TAG_MD_ENTRY_POSITION_NO:
+                position = int(value)
+            elif tag == TAG_SYMBOL:
+                if in_group:
+                    symbol = value
+                else:
+                    default_symbol = value
+
+        if in_group:
+            flush()
+        return updates
+
+
+def _apply_entry(
+    fields: dict[str, float | int],
+    entry_type: str,
+    action: str,
+    px: str | None,
+    size: str | None,
+) -> None:
+    if entry_type == fix.MDEntryType_TRADE_VOLUME:
+        if action == fix.MDUpdateAction_DELETE:
+            fields["volume"] = 0
+        elif size is not None:
+            fields["volume"] = int(float(size))
+        return
+
+    names = _ENTRY_FIELDS.get(entry_type)
+    if names is None:
+        return
+
+    price_name, size_name = names
+    if action == fix.MDUpdateAction_DELETE:
+        fields[price_name] = 0.0
+        fields[size_name] = 0
+        return
+
+    if px is not None:
+        fields[price_name] = float(px)
+    if size is not None:
+        fields[size_name] = int(float(size))
+
+
+def _collect_depth(
+    depth: list[DepthEntry],
+    symbol: str,
+    entry_type: str,
+    action: str,
+    px: str | None,
+    size: str | None,
+    position: int,
+) -> None:
+    side = ENTRY_SIDES.get(entry_type)
+    if side is not None:
+        depth.append(
+            (
+                symbol,
+                side,
+                action,
+                None if px is None else float(px),
+                None if size is None else int(float(size)),
+                position,
+            )
+        )
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable
+
+import structlog
+
+from src.services.metrics import bind_market_data_consumer, record_market_data_consumer
+
+if TYPE_CHECKING:
+    from src.das_trader.market_data import MarketData
+
+logger = structlog.get_logger(__name__)
+
+INLINE = "inline"
+LATEST = "latest"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+POLICIES = (INLINE, LATEST, DROP_OLDEST, BLOCK)
+
+
+class QueuedConsumer:
+    """Runs one market data callback on its own thread, behind a queue with an overflow policy.
+
+    ``latest`` keeps one pending quote per symbol and replaces it on every update, so the
+    consumer always sees the newest quote and never falls more than one update per symbol
+    behind. ``drop_oldest`` keeps up to ``maxsize`` quotes in order and discards the oldest when
+    full. ``block`` keeps up to ``maxsize`` quotes and makes ``put`` wait for room, which stalls
+    the publisher and is only meant for consumers that must see every tick and are known to
+    keep up. Replaced and dropped quotes are counted in ``dropped``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        callback: Callable[[MarketData], None],
+        policy: str = DROP_OLDEST,
+        maxsize: int = 65536,
+    ):
+        if policy not in (LATEST, DROP_OLDEST, BLOCK):
+            raise ValueError(f"Unknown consumer policy {policy!r}")
+        if maxsize < 1:
+            raise ValueError(f"Consumer queue size must be positive, got {maxsize}")
+        self.name = name
+        self.callback = callback
+        self.policy = policy
+        self.maxsize = maxsize
+        self._latest: dict[str, MarketData] = {}
+        self._queue: deque[MarketData] = deque()
+        lock = threading.Lock()
+        self._not_empty = threading.Condition(lock)
+        self._not_full = threading.Condition(lock)
+        self._running = False
+        self._thread: threading.Thread | None = None
+        self.delivered = 0
+        self.dropped = 0
+        self._dropped_reported = 0
+        bind_market_data_consumer(self)
+
+    @property
+    def depth(self) -> int:
+        return len(self._latest) if self.policy == LATEST else len(self._queue)
+
+    def start(self):
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._run, name=f"md-consumer-{self.name}", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Deliver what is already queued, then stop the consumer thread."""
+        if self._thread is not None:
+            with self._not_empty:
+                self._running = False
+                self._not_empty.notify()
+                self._not_full.notify_all()
+            self._thread.join()
+            self._thread = None
+
+    def put(self, market_data: MarketData):
+        with self._not_empty:
+            if self.policy == LATEST:
+                latest = self._latest
+                was_empty = not latest
+                if market_data.symbol in latest:
+                    self.dropped += 1
+                latest[market_data.symbol] = market_data
+            else:
+                queue = self._queue
+                if len(queue) >= self.maxsize:
+                    if self.policy == DROP_OLDEST:
+                        queue.popleft()
+                        self.dropped += 1
+                    else:
+                        while len(queue) >= self.maxsize and self._running:
+                            self._not_full.wait()
+                was_empty = not queue
+                queue.append(market_data)
+            if was_empty:
+                self._not_empty.notify()
+
+    def _take(self) -> list[MarketData] | None:
+        with self._not_empty:
+            while not self._latest and not self._queue:
+                if not self._running:
+                    return None
+                self._not_empty.wait()
+            if self.policy == LATEST:
+                batch = list(self._latest.values())
+                self._latest = {}
+            else:
+                batch = list(self._queue)
+                self._queue.clear()
+                self._not_full.notify_all()
+            return batch
+
+    def _run(self):
+        callback = self.callback
+        while True:
+            batch = self._take()
+            if batch is None:
+                return
+            start = time.perf_counter()
+            for market_data in batch:
+                try:
+                    callback(market_data)
+                except Exception as e:
+                    logger.error(
+                        "market_data_consumer_error",
+                        consumer=self.name,
+                        symbol=market_data.symbol,
+                        error=str(e),
+                    )
+            self.delivered += len(batch)
+            dropped = self.dropped
+            record_market_data_consumer(
+                self.name, len(batch), time.perf_counter() - start, dropped - self._dropped_reported
+            )
+            self._dropped_reported = dropped
+
+    def get_stats(self) -> dict[str, int | str]:
+        return {
+            "policy": self.policy,
+            "depth": self.depth,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
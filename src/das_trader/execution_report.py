@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import quickfix as fix
+
+TAG_AVG_PX = 6
+TAG_CL_ORD_ID = 11
+TAG_CUM_QTY = 14
+TAG_EXEC_ID = 17
+TAG_LAST_PX = 31
+TAG_LAST_QTY = 32
+TAG_ORDER_ID = 37
+TAG_ORD_STATUS = 39
+TAG_ORIG_CL_ORD_ID = 41
+TAG_SIDE = 54
+TAG_SYMBOL = 55
+TAG_TEXT = 58
+TAG_EXEC_TYPE = 150
+TAG_LEAVES_QTY = 151
+
+
+@dataclass(slots=True)
+class ExecutionReport:
+    cl_ord_id: str
+    orig_cl_ord_id: str
+    order_id: str
+    exec_id: str
+    exec_type: str
+    ord_status: str
+    symbol: str
+    last_qty: int
+    last_px: float
+    cum_qty: int | None
+    avg_px: float | None
+    leaves_qty: int | None
+    text: str
+
+
+def _get(message: fix.Message, tag: int) -> str:
+    return message.getField(tag) if message.isSetField(tag) else ""
+
+
+def _get_qty(message: fix.Message, tag: int) -> int | None:
+    return int(float(message.getField(tag))) if message.isSetField(tag) else None
+
+
+def decode_execution_report(message: fix.Message) -> ExecutionReport:
+    """Decode an ExecutionReport (35=8) or OrderCancelReject (35=9) into plain values."""
+    last_px = _get(message, TAG_LAST_PX)
+    avg_px = _get(message, TAG_AVG_PX)
+    return ExecutionReport(
+        cl_ord_id=_get(message, TAG_CL_ORD_ID),
+        orig_cl_ord_id=_get(message, TAG_ORIG_CL_ORD_ID),
+        order_id=_get(message, TAG_ORDER_ID),
+        exec_id=_get(message, TAG_EXEC_ID),
+        exec_type=_get(message, TAG_EXEC_TYPE),
+        ord_status=_get(message, TAG_ORD_STATUS),
+        symbol=_get(message, TAG_SYMBOL),
+        last_qty=_get_qty(message, TAG_LAST_QTY) or 0,
+        last_px=float(last_px) if last_px else 0.0,
+        cum_qty=_get_qty(message, TAG_CUM_QTY),
+        avg_px=float(avg_px) if avg_px else None,
+        leaves_qty=_get_qty(message, TAG_LEAVES_QTY),
+        text=_get(message, TAG_TEXT),
+    )
@@ -1,18 +1,84 @@
 from __future__ import annotations
 
-import time
+import asyncio
 
 import quickfix as fix
 import structlog
 
+from src.das_trader.order_ids import ClOrdIdAllocator
+from src.das_trader.subscriptions import SubscriptionManager
+
 logger = structlog.get_logger(__name__)
 
+TAG_CL_ORD_ID = 11
+TAG_ORDER_QTY = 38
+TAG_ORIG_CL_ORD_ID = 41
+TAG_PRICE = 44
+TAG_SIDE = 54
+TAG_SYMBOL = 55
+TAG_STOP_PX = 99
+TAG_NO_RELATED_SYM = 146
+TAG_MD_REQ_ID = 262
+TAG_SUBSCRIPTION_REQUEST_TYPE = 263
+TAG_MARKET_DEPTH = 264
+TAG_MD_UPDATE_TYPE = 265
+TAG_NO_MD_ENTRY_TYPES = 267
+TAG_MD_ENTRY_TYPE = 269
+
+# Bid, offer and trade: the entries MarketDataHandler decodes.
+MD_ENTRY_TYPES = ("0", "1", "2")
+SUBSCRIBE = "1"
+UNSUBSCRIBE = "2"
+INCREMENTAL_REFRESH = "1"
+
+SIDE_MAP = {"BUY": fix.Side_BUY, "SELL": fix.Side_SELL}
+ORD_TYPE_MAP = {
+    "MARKET": fix.OrdType_MARKET,
+    "LIMIT": fix.OrdType_LIMIT,
+    "STOP": fix.OrdType_STOP,
+}
+TIME_IN_FORCE_MAP = {
+    "DAY": fix.TimeInForce_DAY,
+    "IOC": fix.TimeInForce_IMMEDIATE_OR_CANCEL,
+    "FOK": fix.TimeInForce_FILL_OR_KILL,
+    "GTC": fix.TimeInForce_GOOD_TILL_CANCEL,
+}
+
+
+def format_price(price: float) -> str:
+    return f"{price:.6f}".rstrip("0").rstrip(".")
+
 
 class FixApplication(fix.Application):
     def __init__(self):
         super().__init__()
         self.session_id: fix.SessionID | None = None
         self.logged_on = False
+        # Mirror ``logged_on`` on an event loop once bind_loop() is called: exactly one of the
+        # two is set, so the loop can await either transition instead of polling.
+        self.logged_on_event = asyncio.Event()
+        self.logged_out_event = asyncio.Event()
+        self.logged_out_event.set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        """Signal logon/logout on ``loop``'s events; call from that loop."""
+        self._loop = loop
+        self._set_session_events(self.logged_on)
+
+    def _set_session_events(self, logged_on: bool):
+        if logged_on:
+            self.logged_out_event.clear()
+            self.logged_on_event.set()
+        else:
+            self.logged_on_event.clear()
+            self.logged_out_event.set()
+
+    def _signal_session(self, logged_on: bool):
+        # QuickFIX calls onLogon/onLogout on its own thread; asyncio events are not thread-safe.
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._set_session_events, logged_on)
 
     def onCreate(self, session_id: fix.SessionID):
         logger.info("fix_session_created", session_id=str(session_id))
@@ -20,10 +86,12 @@ class FixApplication(fix.Application):
     def onLogon(self, session_id: fix.SessionID):
         self.session_id = session_id
         self.logged_on = True
+        self._signal_session(True)
         logger.info("fix_logon_successful", session_id=str(session_id))
 
     def onLogout(self, session_id: fix.SessionID):
         self.logged_on = False
+        self._signal_session(False)
         logger.info("fix_logout", session_id=str(session_id))
 
     def toAdmin(self, message: fix.Message, session_id: fix.SessionID):
@@ -38,27 +106,63 @@ class FixApplication(fix.Application):
     def fromApp(self, message: fix.Message, session_id: fix.SessionID):
         msg_type = fix.MsgType()
         message.getHeader().getField(msg_type)
-        
-        if msg_type.getValue() == fix.MsgType_MarketDataSnapshotFullRefresh:
+        msg_type_value = msg_type.getValue()
+
+        if msg_type_value == fix.MsgType_MarketDataSnapshotFullRefresh:
             self.on_market_data(message)
-        elif msg_type.getValue() == fix.MsgType_ExecutionReport:
+        elif msg_type_value == fix.MsgType_MarketDataIncrementalRefresh:
+            self.on_market_data_incremental(message)
+        elif msg_type_value == fix.MsgType_ExecutionReport:
             self.on_execution_report(message)
+        elif msg_type_value == fix.MsgType_OrderCancelReject:
+            self.on_order_cancel_reject(message)
+        elif msg_type_value == fix.MsgType_MarketDataRequestReject:
+            self.on_market_data_reject(message)
 
     def on_market_data(self, message: fix.Message):
         pass
 
+    def on_market_data_incremental(self, message: fix.Message):
+        pass
+
     def on_execution_report(self, message: fix.Message):
         pass
 
+    def on_order_cancel_reject(self, message: fix.Message):
+        pass
+
+    def on_market_data_reject(self, message: fix.Message):
+        pass
+
 
 class DasTraderFixClient:
-    def __init__(self, config_file: str, application: FixApplication):
+    def __init__(
+        self,
+        config_file: str,
+        application: FixApplication,
+        md_batch_size: int = 500,
+        md_requests_per_sec: float = 5.0,
+        md_depth: int = 1,
+        md_pending_timeout_sec: float = 30.0,
+    ):
         self.config_file = config_file
         self.application = application
         self.settings = fix.SessionSettings(config_file)
         self.store_factory = fix.FileStoreFactory(self.settings)
         self.log_factory = fix.FileLogFactory(self.settings)
         self.initiator: fix.SocketInitiator | None = None
+        self.cl_ord_ids = ClOrdIdAllocator()
+        # Messages with header and static body fields set, keyed by (msg type, ord type, tif).
+        # Rebuilt whenever the logged-on session changes.
+        self._templates: dict[tuple[str, str, str], fix.Message] = {}
+        self._template_session: fix.SessionID | None = None
+        self.subscriptions = SubscriptionManager(
+            self,
+            batch_size=md_batch_size,
+            requests_per_sec=md_requests_per_sec,
+            depth=md_depth,
+            pending_timeout_sec=md_pending_timeout_sec,
+        )
 
     def start(self):
         try:
@@ -79,6 +183,56 @@ class DasTraderFixClient:
     def is_logged_on(self) -> bool:
         return self.application.logged_on
 
+    def _template(
+        self, msg_type: str, order_type: str = "", time_in_force: str = ""
+    ) -> fix.Message:
+        session_id = self.application.session_id
+        if session_id is not self._template_session:
+            self._templates = {}
+            self._template_session = session_id
+
+        key = (msg_type, order_type, time_in_force)
+        template = self._templates.get(key)
+        if template is None:
+            template = fix.Message()
+            header = template.getHeader()
+            header.setField(fix.MsgType(msg_type))
+            header.setField(fix.SenderCompID(session_id.getSenderCompID().getValue()))
+            header.setField(fix.TargetCompID(session_id.getTargetCompID().getValue()))
+            if msg_type == fix.MsgType_NewOrderSingle:
+                template.setField(fix.OrdType(ORD_TYPE_MAP.get(order_type, fix.OrdType_MARKET)))
+                template.setField(
+                    fix.TimeInForce(
+                        TIME_IN_FORCE_MAP.get(time_in_force, fix.TimeInForce_IMMEDIATE_OR_CANCEL)
+                    )
+                )
+            self._templates[key] = template
+        return template
+
+    def build_order_message(
+        self,
+        cl_ord_id: str,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: int,
+        price: float | None = None,
+        time_in_force: str = "DAY",
+    ) -> fix.Message:
+        message = fix.Message(self._template(fix.MsgType_NewOrderSingle, order_type, time_in_force))
+        message.setField(TAG_CL_ORD_ID, cl_ord_id)
+        message.setField(TAG_SYMBOL, symbol)
+        message.setField(TAG_SIDE, SIDE_MAP.get(side, fix.Side_SELL))
+        message.setField(TAG_ORDER_QTY, str(int(quantity)))
+
+        if price:
+            if order_type == "LIMIT":
+                message.setField(TAG_PRICE, format_price(price))
+            elif order_type == "STOP":
+                message.setField(TAG_STOP_PX, format_price(price))
+
+        return message
+
     def send_order(
         self,
         symbol: str,
@@ -91,51 +245,129 @@ class DasTraderFixClient:
         if not self.is_logged_on():
             raise RuntimeError("Not logged on to DAS Trader")
 
-        message = fix.Message()
-        header = message.getHeader()
-
-        header.setField(fix.MsgType(fix.MsgType_NewOrderSingle))
-        header.setField(fix.SenderCompID(self.application.session_id.getSenderCompID()))
-        header.setField(fix.TargetCompID(self.application.session_id.getTargetCompID()))
-
-        message.setField(fix.ClOrdID(f"ORDER_{int(time.time() * 1000)}"))
-        message.setField(fix.Symbol(symbol))
-        message.setField(fix.Side(fix.Side_BUY if side == "BUY" else fix.Side_SELL))
-        message.setField(fix.OrdType(fix.OrdType_LIMIT if order_type == "LIMIT" else fix.OrdType_MARKET))
-        message.setField(fix.OrderQty(quantity))
-        message.setField(fix.TimeInForce(fix.TimeInForce_DAY if time_in_force == "DAY" else fix.TimeInForce_IOC))
-
-        if price and order_type == "LIMIT":
-            message.setField(fix.Price(price))
+        cl_ord_id = self.cl_ord_ids.next_id("ORDER")
+        message = self.build_order_message(
+            cl_ord_id, symbol, side, order_type, quantity, price, time_in_force
+        )
 
         try:
             fix.Session.sendToTarget(message, self.application.session_id)
-            cl_ord_id = message.getField(fix.ClOrdID()).getValue()
             logger.info("order_sent", symbol=symbol, side=side, quantity=quantity, cl_ord_id=cl_ord_id)
             return cl_ord_id
         except Exception as e:
             logger.error("order_send_failed", error=str(e))
             raise
 
-    def cancel_order(self, order_id: str, symbol: str):
+    def send_orders(
+        self, orders: list[tuple[str, str, str, int, float | None, str]]
+    ) -> list[str | Exception]:
+        """Send a basket of (symbol, side, order_type, quantity, price, time_in_force) orders.
+
+        Every message is built before the first send so the legs go out back to back. Returns
+        the ClOrdID for each leg that was sent, or the exception raised while sending it.
+        """
         if not self.is_logged_on():
             raise RuntimeError("Not logged on to DAS Trader")
 
-        message = fix.Message()
-        header = message.getHeader()
+        session_id = self.application.session_id
+        messages = []
+        for symbol, side, order_type, quantity, price, time_in_force in orders:
+            cl_ord_id = self.cl_ord_ids.next_id("ORDER")
+            message = self.build_order_message(
+                cl_ord_id, symbol, side, order_type, quantity, price, time_in_force
+            )
+            messages.append((cl_ord_id, message))
+
+        outcomes: list[str | Exception] = []
+        for cl_ord_id, message in messages:
+            try:
+                fix.Session.sendToTarget(message, session_id)
+                outcomes.append(cl_ord_id)
+            except Exception as e:
+                outcomes.append(e)
 
-        header.setField(fix.MsgType(fix.MsgType_OrderCancelRequest))
-        header.setField(fix.SenderCompID(self.application.session_id.getSenderCompID()))
-        header.setField(fix.TargetCompID(self.application.session_id.getTargetCompID()))
+        # The one log event per batch: what went out, and why any leg did not.
+        sent = [outcome for outcome in outcomes if isinstance(outcome, str)]
+        logger.info(
+            "order_batch_sent",
+            legs=len(orders),
+            sent=len(sent),
+            cl_ord_ids=sent,
+            errors=[
+                {"leg": i, "symbol": orders[i][0], "error": str(outcome)}
+                for i, outcome in enumerate(outcomes)
+                if isinstance(outcome, Exception)
+            ],
+        )
+        return outcomes
 
-        message.setField(fix.OrigClOrdID(order_id))
-        message.setField(fix.ClOrdID(f"CANCEL_{int(time.time() * 1000)}"))
-        message.setField(fix.Symbol(symbol))
+    def cancel_order(self, order_id: str, symbol: str) -> str:
+        if not self.is_logged_on():
+            raise RuntimeError("Not logged on to DAS Trader")
+
+        cl_ord_id = self.cl_ord_ids.next_id("CANCEL")
+        message = fix.Message(self._template(fix.MsgType_OrderCancelRequest))
+        message.setField(TAG_ORIG_CL_ORD_ID, order_id)
+        message.setField(TAG_CL_ORD_ID, cl_ord_id)
+        message.setField(TAG_SYMBOL, symbol)
 
         try:
             fix.Session.sendToTarget(message, self.application.session_id)
-            logger.info("cancel_order_sent", order_id=order_id, symbol=symbol)
+            logger.info("cancel_order_sent", order_id=order_id, symbol=symbol, cl_ord_id=cl_ord_id)
+            return cl_ord_id
         except Exception as e:
             logger.error("cancel_order_failed", error=str(e))
             raise
 
+    def request_order_status(self, order_id: str, symbol: str, side: str):
+        if not self.is_logged_on():
+            raise RuntimeError("Not logged on to DAS Trader")
+
+        message = fix.Message(self._template(fix.MsgType_OrderStatusRequest))
+        message.setField(TAG_CL_ORD_ID, order_id)
+        message.setField(TAG_SYMBOL, symbol)
+        message.setField(TAG_SIDE, SIDE_MAP.get(side, fix.Side_SELL))
+
+        try:
+            fix.Session.sendToTarget(message, self.application.session_id)
+            logger.info("order_status_requested", order_id=order_id, symbol=symbol)
+        except Exception as e:
+            logger.error("order_status_request_failed", order_id=order_id, error=str(e))
+            raise
+
+    def send_market_data_request(
+        self, md_req_id: str, symbols: list[str], subscribe: bool = True, depth: int = 1
+    ):
+        """Send one MarketDataRequest (35=V) subscribing or unsubscribing ``symbols``.
+
+        Unsubscribes must carry the MDReqID of the original subscribe. Updates are requested
+        incrementally, for the bid, offer and trade entries only.
+        """
+        if not self.is_logged_on():
+            raise RuntimeError("Not logged on to DAS Trader")
+
+        message = fix.Message(self._template(fix.MsgType_MarketDataRequest))
+        message.setField(TAG_MD_REQ_ID, md_req_id)
+        message.setField(TAG_SUBSCRIPTION_REQUEST_TYPE, SUBSCRIBE if subscribe else UNSUBSCRIBE)
+        message.setField(TAG_MARKET_DEPTH, str(depth))
+        message.setField(TAG_MD_UPDATE_TYPE, INCREMENTAL_REFRESH)
+        entry_type = fix.Group(TAG_NO_MD_ENTRY_TYPES, TAG_MD_ENTRY_TYPE)
+        for value in MD_ENTRY_TYPES:
+            entry_type.setField(TAG_MD_ENTRY_TYPE, value)
+            message.addGroup(entry_type)
+        related_sym = fix.Group(TAG_NO_RELATED_SYM, TAG_SYMBOL)
+        for symbol in symbols:
+            related_sym.setField(TAG_SYMBOL, symbol)
+            message.addGroup(related_sym)
+
+        try:
+            fix.Session.sendToTarget(message, self.application.session_id)
+            logger.info(
+                "market_data_request_sent",
+                md_req_id=md_req_id,
+                symbols=len(symbols),
+                subscribe=subscribe,
+            )
+        except Exception as e:
+            logger.error("market_data_request_failed", md_req_id=md_req_id, error=str(e))
+            raise
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any
+from typing import Callable
 
 import quickfix as fix
 import structlog
 
+from src.das_trader.decoder import MarketDataDecoder
+from src.das_trader.dispatch import BLOCK, INLINE, QueuedConsumer
+from src.das_trader.order_book import DepthEntry, OrderBookStore
+from src.das_trader.quote_store import QuoteStore
+from src.services.metrics import record_stage_latency
+
 logger = structlog.get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketData:
     symbol: str
     bid_price: float
@@ -18,76 +25,211 @@ class MarketData:
     last_price: float
     volume: int
     timestamp: float
+    bid_size: int = 0
+    ask_size: int = 0
+    last_size: int = 0
+    # perf_counter_ns() at FIX receipt and at the end of decoding; 0 when not fed from FIX.
+    recv_ns: int = 0
+    decoded_ns: int = 0
 
 
 class MarketDataHandler:
-    def __init__(self):
-        self.market_data: dict[str, MarketData] = {}
+    def __init__(self, capacity: int = 1024, book_levels: int = 0, trace_sample_every: int = 64):
+        self.quotes = QuoteStore(capacity)
+        # Stage latencies are observed for 1 in ``trace_sample_every`` messages; the stamps
+        # themselves ride on every quote.
+        self.trace_sample_every = max(1, trace_sample_every)
+        self._decode_countdown = self.trace_sample_every
+        self._dispatch_countdown = self.trace_sample_every
+        # Level 2 books, kept on the feed thread ahead of the sink; top of book is then read
+        # from the book so deeper levels promote correctly when the best level is removed.
+        self.order_book = OrderBookStore(book_levels, capacity) if book_levels else None
+        # Inline callbacks run on the publishing thread, before any queued consumer is offered
+        # the quote; keep them to cheap, latency-critical work such as risk exits. Priority
+        # callbacks run ahead of the dirty-row callbacks and every other inline callback.
+        self.priority_callbacks: list[callable] = []
         self.callbacks: list[callable] = []
-
-    def register_callback(self, callback: callable):
-        self.callbacks.append(callback)
+        self.consumers: list[QueuedConsumer] = []
+        # One MarketData per quote-store row, refreshed in place on every publish. Inline
+        # callbacks must read it before returning; queued consumers get their own snapshot.
+        self._views: list[MarketData] = []
+        self.decoder = MarketDataDecoder()
+        # Rows updated since the last take_dirty_rows(); dirty callbacks fire on the
+        # empty -> non-empty edge.
+        self.dirty_rows: set[int] = set()
+        self.dirty_callbacks: list[Callable[[], None]] = []
+        self._dirty_lock = threading.Lock()
+        # Where decoded updates go; a MarketDataBridge replaces this to move work off the feed
+        # thread.
+        self.sink: Callable[[str, dict[str, float | int], float], None] = self.apply_update
+
+    def register_callback(
+        self,
+        callback: callable,
+        policy: str = INLINE,
+        maxsize: int = 65536,
+        name: str | None = None,
+        priority: bool = False,
+    ):
+        """Call ``callback`` with every published quote.
+
+        With the default ``inline`` policy it runs on the publishing thread and receives the
+        symbol's reused MarketData, so it must copy anything it keeps; ``priority`` runs it
+        before every non-priority callback, whatever the registration order. Any other policy
+        (``latest``, ``drop_oldest``, ``block``) gives it a QueuedConsumer thread, so a slow
+        consumer falls behind or loses quotes instead of delaying the feed. ``block`` is
+        refused once a MarketDataBridge publishes from the event loop, where waiting for room
+        would stall the loop.
+        """
+        if policy == INLINE:
+            (self.priority_callbacks if priority else self.callbacks).append(callback)
+            return
+        if priority:
+            raise ValueError("Only inline callbacks can take the priority slot")
+        if policy == BLOCK and self.sink != self.apply_update:
+            raise ValueError("The block policy would stall the event loop the bridge publishes on")
+        name = name or getattr(callback, "__qualname__", None) or repr(callback)
+        consumer = QueuedConsumer(name, callback, policy, maxsize)
+        self.consumers.append(consumer)
+        consumer.start()
+
+    def close(self):
+        for consumer in self.consumers:
+            consumer.stop()
+
+    def register_dirty_callback(self, callback: Callable[[], None]):
+        self.dirty_callbacks.append(callback)
+
+    def take_dirty_rows(self) -> set[int]:
+        with self._dirty_lock:
+            dirty, self.dirty_rows = self.dirty_rows, set()
+        return dirty
 
     def on_market_data_update(self, message: fix.Message):
+        recv_ns = time.perf_counter_ns()
         try:
-            symbol_field = fix.Symbol()
-            message.getField(symbol_field)
-            symbol = symbol_field.getValue()
-
-            bid_price = self._get_price(message, fix.MDEntryType_BID)
-            ask_price = self._get_price(message, fix.MDEntryType_OFFER)
-            last_price = self._get_price(message, fix.MDEntryType_TRADE)
-
-            volume_field = fix.MDEntrySize()
-            if message.isSetField(volume_field):
-                message.getField(volume_field)
-                volume = int(volume_field.getValue())
+            order_book = self.order_book
+            if order_book is None:
+                symbol, fields = self.decoder.decode_snapshot(message)
             else:
-                volume = 0
-
-            market_data = MarketData(
-                symbol=symbol,
-                bid_price=bid_price,
-                ask_price=ask_price,
-                last_price=last_price,
-                volume=volume,
-                timestamp=time.time(),
-            )
-
-            self.market_data[symbol] = market_data
-
-            for callback in self.callbacks:
-                callback(market_data)
-
-            logger.debug("market_data_updated", symbol=symbol, bid=bid_price, ask=ask_price, last=last_price)
+                depth: list[DepthEntry] = []
+                symbol, fields = self.decoder.decode_snapshot(message, depth)
+                order_book.replace(symbol, depth)
+                fields.update(order_book.top_fields(symbol))
+            fields["recv_ns"] = recv_ns
+            fields["decoded_ns"] = self._decoded(recv_ns)
+            self.sink(symbol, fields, time.time())
         except Exception as e:
             logger.error("market_data_parse_error", error=str(e))
 
-    def _get_price(self, message: fix.Message, entry_type: str) -> float:
+    def on_market_data_incremental(self, message: fix.Message):
+        recv_ns = time.perf_counter_ns()
         try:
-            no_md_entries = fix.NoMDEntries()
-            message.getField(no_md_entries)
-            num_entries = no_md_entries.getValue()
-
-            for i in range(num_entries):
-                group = fix.MDEntryType()
-                message.getGroup(i + 1, group)
-                
-                entry_type_field = fix.MDEntryType()
-                group.getField(entry_type_field)
-                
-                if entry_type_field.getValue() == entry_type:
-                    price_field = fix.MDEntryPx()
-                    group.getField(price_field)
-                    return float(price_field.getValue())
-        except Exception:
-            pass
-        
-        return 0.0
+            order_book = self.order_book
+            if order_book is None:
+                updates = self.decoder.decode_incremental(message)
+            else:
+                depth: list[DepthEntry] = []
+                updates = self.decoder.decode_incremental(message, depth)
+                if depth:
+                    order_book.apply(depth)
+                    for symbol, fields in updates.items():
+                        if symbol in order_book:
+                            fields.update(order_book.top_fields(symbol))
+            decoded_ns = self._decoded(recv_ns)
+            now = time.time()
+            for symbol, fields in updates.items():
+                fields["recv_ns"] = recv_ns
+                fields["decoded_ns"] = decoded_ns
+                self.sink(symbol, fields, now)
+        except Exception as e:
+            logger.error("market_data_parse_error", error=str(e))
+
+    def _decoded(self, recv_ns: int) -> int:
+        decoded_ns = time.perf_counter_ns()
+        self._decode_countdown -= 1
+        if not self._decode_countdown:
+            self._decode_countdown = self.trace_sample_every
+            record_stage_latency("decode", recv_ns, decoded_ns)
+        return decoded_ns
+
+    def apply_update(self, symbol: str, fields: dict[str, float | int], timestamp: float):
+        self._publish(self.quotes.update(symbol, fields, timestamp))
+
+    def _publish(self, row: int):
+        market_data = self._refresh_view(row)
+        self._dispatch_countdown -= 1
+        if not self._dispatch_countdown:
+            self._dispatch_countdown = self.trace_sample_every
+            record_stage_latency("dispatch", market_data.decoded_ns, time.perf_counter_ns())
+
+        for callback in self.priority_callbacks:
+            callback(market_data)
+
+        with self._dirty_lock:
+            was_clean = not self.dirty_rows
+            self.dirty_rows.add(row)
+        if was_clean:
+            for dirty_callback in self.dirty_callbacks:
+                dirty_callback()
+
+        for callback in self.callbacks:
+            callback(market_data)
+        if self.consumers:
+            snapshot = self._view(row)
+            for consumer in self.consumers:
+                consumer.put(snapshot)
+
+        logger.debug(
+            "market_data_updated",
+            symbol=market_data.symbol,
+            bid=market_data.bid_price,
+            ask=market_data.ask_price,
+            last=market_data.last_price,
+        )
+
+    def _view(self, row: int) -> MarketData:
+        quotes = self.quotes
+        return MarketData(
+            symbol=quotes.symbols[row],
+            bid_price=float(quotes.bid_price[row]),
+            ask_price=float(quotes.ask_price[row]),
+            last_price=float(quotes.last_price[row]),
+            volume=int(quotes.volume[row]),
+            timestamp=float(quotes.timestamp[row]),
+            bid_size=int(quotes.bid_size[row]),
+            ask_size=int(quotes.ask_size[row]),
+            last_size=int(quotes.last_size[row]),
+            recv_ns=int(quotes.recv_ns[row]),
+            decoded_ns=int(quotes.decoded_ns[row]),
+        )
+
+    def _refresh_view(self, row: int) -> MarketData:
+        views = self._views
+        if row >= len(views):
+            views.extend(self._view(r) for r in range(len(views), row + 1))
+            return views[row]
+
+        quotes = self.quotes
+        view = views[row]
+        view.bid_price = float(quotes.bid_price[row])
+        view.ask_price = float(quotes.ask_price[row])
+        view.last_price = float(quotes.last_price[row])
+        view.volume = int(quotes.volume[row])
+        view.timestamp = float(quotes.timestamp[row])
+        view.bid_size = int(quotes.bid_size[row])
+        view.ask_size = int(quotes.ask_size[row])
+        view.last_size = int(quotes.last_size[row])
+        view.recv_ns = int(quotes.recv_ns[row])
+        view.decoded_ns = int(quotes.decoded_ns[row])
+        return view
 
     def get_market_data(self, symbol: str) -> MarketData | None:
-        return self.market_data.get(symbol)
+        """A snapshot of ``symbol``'s latest quote that later updates do not change."""
+        row = self.quotes.get_row(symbol)
+        if row is None:
+            return None
+        return self._view(row)
 
     def get_all_symbols(self) -> list[str]:
-        return list(self.market_data.keys())
-
+        return list(self.quotes.symbols)
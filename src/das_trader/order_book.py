@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+import quickfix as fix
+
+BID = 0
+ASK = 1
+
+ENTRY_SIDES: dict[str, int] = {fix.MDEntryType_BID: BID, fix.MDEntryType_OFFER: ASK}
+
+# (symbol, side, MDUpdateAction, price, size, MDEntryPositionNo) as collected by MarketDataDecoder.
+DepthEntry = tuple[str, int, str, float | None, int | None, int]
+
+
+class OrderBookStore:
+    """Level 2 books for many symbols in preallocated ``(rows, 2, levels)`` arrays.
+
+    Each symbol owns one row; ``price[row, BID]`` is sorted best-first (descending) and
+    ``price[row, ASK]`` ascending, with ``count[row, side]`` populated levels. Levels are keyed
+    by price: NEW and CHANGE set the size at a price (inserting the level if it is missing) and
+    DELETE or a zero size removes it, shifting at most ``levels`` entries. Updates past the last
+    kept level are dropped. At 20 levels a symbol costs 640 bytes, so 3,000 symbols fit in
+    under 2 MB.
+
+    Updates are applied on the feed thread and read from the event loop, so both sides take
+    ``lock``; a reader never sees a level half-shifted.
+    """
+
+    def __init__(self, levels: int = 20, capacity: int = 1024):
+        self.levels = levels
+        self.capacity = capacity
+        self.size = 0
+        self.index: dict[str, int] = {}
+        self.symbols: list[str] = []
+        self.price = np.zeros((capacity, 2, levels), dtype=np.float64)
+        self.quantity = np.zeros((capacity, 2, levels), dtype=np.int64)
+        self.count = np.zeros((capacity, 2), dtype=np.int64)
+        self.lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        return self.price.nbytes + self.quantity.nbytes + self.count.nbytes
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.index
+
+    def get_row(self, symbol: str) -> int | None:
+        return self.index.get(symbol)
+
+    def _row(self, symbol: str) -> int:
+        row = self.index.get(symbol)
+        if row is None:
+            if self.size == self.capacity:
+                self._grow(self.capacity * 2)
+            row = self.size
+            self.index[symbol] = row
+            self.symbols.append(symbol)
+            self.size += 1
+        return row
+
+    def _grow(self, capacity: int):
+        for name in ("price", "quantity", "count"):
+            column = getattr(self, name)
+            grown = np.zeros((capacity, *column.shape[1:]), dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+        self.capacity = capacity
+
+    def replace(self, symbol: str, entries: list[DepthEntry]):
+        """Rebuild ``symbol``'s book from a full refresh (35=W)."""
+        with self.lock:
+            row = self._row(symbol)
+            self.count[row] = 0
+            self.price[row] = 0.0
+            self.quantity[row] = 0
+            for _, side, _, price, size, _ in entries:
+                if price is not None and size:
+                    self._set(row, side, price, size)
+
+    def apply(self, entries: list[DepthEntry]):
+        """Apply the depth entries of an incremental refresh (35=X) in message order."""
+        with self.lock:
+            for symbol, side, action, price, size, position in entries:
+                row = self._row(symbol)
+                if action == fix.MDUpdateAction_DELETE or size == 0:
+                    if price is not None:
+                        self._delete(row, side, price)
+                    elif position <= self.count[row, side]:
+                        self._remove(row, side, position - 1)
+                elif price is not None:
+                    if size is None:
+                        # A price-only CHANGE keeps the size already resting at that level.
+                        i, found = self._find(row, side, price)
+                        size = int(self.quantity[row, side, i]) if found else 0
+                    if size:
+                        self._set(row, side, price, size)
+
+    def _find(self, row: int, side: int, price: float) -> tuple[int, bool]:
+        n = int(self.count[row, side])
+        levels = self.price[row, side]
+        if side == BID:
+            i = n - int(np.searchsorted(levels[:n][::-1], price, side="right"))
+        else:
+            i = int(np.searchsorted(levels[:n], price, side="left"))
+        return i, i < n and levels[i] == price
+
+    def _set(self, row: int, side: int, price: float, size: int):
+        i, found = self._find(row, side, price)
+        quantity = self.quantity[row, side]
+        if found:
+            quantity[i] = size
+            return
+        if i == self.levels:
+            return
+        levels = self.price[row, side]
+        n = int(self.count[row, side])
+        end = min(n, self.levels - 1)
+        levels[i + 1 : end + 1] = levels[i:end]
+        quantity[i + 1 : end + 1] = quantity[i:end]
+        levels[i] = price
+        quantity[i] = size
+        self.count[row, side] = end + 1
+
+    def _delete(self, row: int, side: int, price: float):
+        i, found = self._find(row, side, price)
+        if found:
+            self._remove(row, side, i)
+
+    def _remove(self, row: int, side: int, i: int):
+        n = int(self.count[row, side])
+        levels = self.price[row, side]
+        quantity = self.quantity[row, side]
+        levels[i : n - 1] = levels[i + 1 : n]
+        quantity[i : n - 1] = quantity[i + 1 : n]
+        levels[n - 1] = 0.0
+        quantity[n - 1] = 0
+        self.count[row, side] = n - 1
+
+    def level(self, symbol: str, side: int, n: int = 0) -> tuple[float, int] | None:
+        """Price and size of the ``n``-th level (0 is the best), or None if it is empty."""
+        row = self.index.get(symbol)
+        if row is None:
+            return None
+        with self.lock:
+            if n >= self.count[row, side]:
+                return None
+            return float(self.price[row, side, n]), int(self.quantity[row, side, n])
+
+    def best_bid(self, symbol: str) -> tuple[float, int] | None:
+        return self.level(symbol, BID)
+
+    def best_ask(self, symbol: str) -> tuple[float, int] | None:
+        return self.level(symbol, ASK)
+
+    def top_fields(self, symbol: str) -> dict[str, float | int]:
+        """Top-of-book fields in QuoteStore column names, taken from the book."""
+        row = self.index[symbol]
+        with self.lock:
+            price = self.price[row, :, 0].tolist()
+            quantity = self.quantity[row, :, 0].tolist()
+        return {
+            "bid_price": price[BID],
+            "bid_size": quantity[BID],
+            "ask_price": price[ASK],
+            "ask_size": quantity[ASK],
+        }
+
+    def depth(self, symbol: str, side: int, levels: int) -> int:
+        """Total size resting in the best ``levels`` levels of one side."""
+        row = self.index.get(symbol)
+        if row is None:
+            return 0
+        with self.lock:
+            return int(self.quantity[row, side, :levels].sum())
+
+    def imbalance(self, symbol: str, levels: int = 1) -> float:
+        """(bid size - ask size) / (bid size + ask size) over the best ``levels`` levels."""
+        row = self.index.get(symbol)
+        if row is None:
+            return 0.0
+        with self.lock:
+            bid, ask = self.quantity[row, :, :levels].sum(axis=1).tolist()
+        total = bid + ask
+        return (bid - ask) / total if total else 0.0
+
+    def sweep_price(self, symbol: str, side: str, quantity: int) -> float | None:
+        """Worst price an order of ``side`` ("BUY"/"SELL") reaches to fill ``quantity``.
+
+        A BUY walks the asks and a SELL the bids. Returns None when the visible book is too thin.
+        """
+        row = self.index.get(symbol)
+        if row is None:
+            return None
+        book_side = ASK if side == "BUY" else BID
+        with self.lock:
+            n = int(self.count[row, book_side])
+            cumulative = np.cumsum(self.quantity[row, book_side, :n])
+            i = int(np.searchsorted(cumulative, quantity, side="left"))
+            return float(self.price[row, book_side, i]) if i < n else None
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+
+_BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def _to_base36(value: int) -> str:
+    digits = []
+    while True:
+        value, remainder = divmod(value, 36)
+        digits.append(_BASE36[remainder])
+        if not value:
+            return "".join(reversed(digits))
+
+
+class ClOrdIdAllocator:
+    """Thread-safe, monotonic ClOrdID generator.
+
+    IDs look like ``ORDER_<session>_<seq>``: ``session`` is the allocator's start time in
+    milliseconds (base 36) and ``seq`` a per-process counter. Any number of IDs per millisecond
+    stay unique, and a restarted process gets a new session so it never reuses an earlier ID.
+    """
+
+    def __init__(self, start_time_ms: int | None = None):
+        if start_time_ms is None:
+            start_time_ms = time.time_ns() // 1_000_000
+        self.session = _to_base36(start_time_ms)
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_id(self, prefix: str = "ORDER") -> str:
+        with self._lock:
+            seq = next(self._counter)
+        return f"{prefix}_{self.session}_{seq}"
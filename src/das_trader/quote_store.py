@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import numpy as np
+
+QUOTE_COLUMNS: dict[str, type] = {
+    "bid_price": np.float64,
+    "ask_price": np.float64,
+    "last_price": np.float64,
+    "volume": np.int64,
+    "timestamp": np.float64,
+    "bid_size": np.int64,
+    "ask_size": np.int64,
+    "last_size": np.int64,
+    # perf_counter_ns() when the latest update arrived from FIX and when it finished decoding.
+    "recv_ns": np.int64,
+    "decoded_ns": np.int64,
+}
+
+
+def resize_column(column: np.ndarray, capacity: int, fill: float | int = 0) -> np.ndarray:
+    """Return ``column`` grown to ``capacity`` rows, padding new rows with ``fill``."""
+    if len(column) >= capacity:
+        return column
+    grown = np.full(capacity, fill, dtype=column.dtype)
+    grown[: len(column)] = column
+    return grown
+
+
+class QuoteStore:
+    """Columnar top-of-book store: one row per symbol, one preallocated array per field.
+
+    Rows are assigned on first sight of a symbol and never reused, so a row index stays
+    valid for the lifetime of the store and consumers can keep per-row state in arrays
+    of their own (see ``resize_column``).
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.size = 0
+        self.index: dict[str, int] = {}
+        self.symbols: list[str] = []
+        self.columns: dict[str, np.ndarray] = {
+            name: np.zeros(capacity, dtype=dtype) for name, dtype in QUOTE_COLUMNS.items()
+        }
+        self._bind_columns()
+
+    def _bind_columns(self):
+        self.bid_price = self.columns["bid_price"]
+        self.ask_price = self.columns["ask_price"]
+        self.last_price = self.columns["last_price"]
+        self.volume = self.columns["volume"]
+        self.timestamp = self.columns["timestamp"]
+        self.bid_size = self.columns["bid_size"]
+        self.ask_size = self.columns["ask_size"]
+        self.last_size = self.columns["last_size"]
+        self.recv_ns = self.columns["recv_ns"]
+        self.decoded_ns = self.columns["decoded_ns"]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.index
+
+    def get_row(self, symbol: str) -> int | None:
+        return self.index.get(symbol)
+
+    def row(self, symbol: str) -> int:
+        row = self.index.get(symbol)
+        if row is None:
+            if self.size == self.capacity:
+                self._grow(self.capacity * 2)
+            row = self.size
+            self.index[symbol] = row
+            self.symbols.append(symbol)
+            self.size += 1
+        return row
+
+    def update(self, symbol: str, fields: dict[str, float | int], timestamp: float) -> int:
+        row = self.row(symbol)
+        columns = self.columns
+        for name, value in fields.items():
+            columns[name][row] = value
+        self.timestamp[row] = timestamp
+        return row
+
+    def _grow(self, capacity: int):
+        self.columns = {
+            name: resize_column(column, capacity) for name, column in self.columns.items()
+        }
+        self.capacity = capacity
+        self._bind_columns()
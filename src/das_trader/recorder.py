@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import structlog
+
+from src.das_trader.market_data import MarketData
+
+logger = structlog.get_logger(__name__)
+
+TICK_DTYPE = np.dtype(
+    [
+        ("symbol_id", "<u4"),
+        ("timestamp", "<f8"),
+        ("bid_price", "<f8"),
+        ("ask_price", "<f8"),
+        ("last_price", "<f8"),
+        ("volume", "<i8"),
+    ]
+)
+SYMBOLS_FILE = "symbols.txt"
+SEGMENT_PATTERN = "ticks-{:06d}.bin"
+READ_CHUNK_RECORDS = 65536
+
+
+def _segment_paths(directory: Path) -> list[Path]:
+    return sorted(directory.glob("ticks-*.bin"))
+
+
+class TickRecorder:
+    """Appends every quote update to fixed-width binary segment files.
+
+    Register ``on_market_data`` as a MarketDataHandler callback. The callback only copies the
+    tick into a preallocated record buffer; full buffers (or ones older than
+    ``flush_interval_sec`` of market time) are handed to a writer thread, which appends them to
+    ``ticks-NNNNNN.bin`` and starts a new segment once ``segment_bytes`` is reached. Symbol ids
+    index ``symbols.txt``, which is appended before any record that uses a new id and reloaded
+    on restart so ids stay stable across sessions in the same directory.
+
+    If a write fails the writer thread stops, ``failed`` is set and recording stops: later ticks
+    and anything still queued are counted in ``dropped`` instead of piling up in memory.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        segment_bytes: int = 256 * 1024 * 1024,
+        buffer_records: int = 4096,
+        flush_interval_sec: float = 1.0,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_records = max(1, segment_bytes // TICK_DTYPE.itemsize)
+        self.buffer_records = buffer_records
+        self.flush_interval_sec = flush_interval_sec
+
+        symbols_path = self.directory / SYMBOLS_FILE
+        symbols = symbols_path.read_text().splitlines() if symbols_path.exists() else []
+        self.symbol_ids: dict[str, int] = {symbol: i for i, symbol in enumerate(symbols)}
+
+        segments = _segment_paths(self.directory)
+        self._segment_index = int(segments[-1].stem.split("-")[1]) + 1 if segments else 0
+
+        self._buffer = np.empty(buffer_records, dtype=TICK_DTYPE)
+        self._count = 0
+        self._first_timestamp = 0.0
+        self._queue: queue.Queue[np.ndarray | str | None] = queue.Queue()
+        self._writer: threading.Thread | None = None
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = False
+
+    def start(self):
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._write_loop, name="tick-recorder", daemon=True
+            )
+            self._writer.start()
+            logger.info("tick_recorder_started", directory=str(self.directory))
+
+    def on_market_data(self, market_data: MarketData):
+        if self.failed:
+            self.dropped += 1
+            return
+        symbol_id = self.symbol_ids.get(market_data.symbol)
+        if symbol_id is None:
+            symbol_id = self.symbol_ids[market_data.symbol] = len(self.symbol_ids)
+            self._queue.put(market_data.symbol)
+
+        count = self._count
+        timestamp = market_data.timestamp
+        if count == 0:
+            self._first_timestamp = timestamp
+        self._buffer[count] = (
+            symbol_id,
+            timestamp,
+            market_data.bid_price,
+            market_data.ask_price,
+            market_data.last_price,
+            market_data.volume,
+        )
+        self._count = count = count + 1
+        self.recorded += 1
+
+        if count == self.buffer_records:
+            self.flush()
+        elif timestamp - self._first_timestamp >= self.flush_interval_sec:
+            self.flush()
+
+    def flush(self):
+        if not self._count:
+            return
+        if self.failed:
+            self.dropped += self._count
+            self._count = 0
+            return
+        self._queue.put(self._buffer[: self._count])
+        self._buffer = np.empty(self.buffer_records, dtype=TICK_DTYPE)
+        self._count = 0
+
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            if not self.failed:
+                self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+            logger.info(
+                "tick_recorder_stopped",
+                recorded=self.recorded,
+                written=self.written,
+                dropped=self.dropped,
+            )
+
+    def _write_loop(self):
+        symbols_file = open(self.directory / SYMBOLS_FILE, "a")
+        segment = None
+        segment_records = 0
+        records = ()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                if isinstance(item, str):
+                    symbols_file.write(item + "\n")
+                    symbols_file.flush()
+                    continue
+
+                records = item
+                while len(records):
+                    if segment is None or segment_records == self.segment_records:
+                        if segment is not None:
+                            segment.close()
+                        path = self.directory / SEGMENT_PATTERN.format(self._segment_index)
+                        segment = open(path, "ab")
+                        segment_records = 0
+                        self._segment_index += 1
+                    room = self.segment_records - segment_records
+                    chunk, records = records[:room], records[room:]
+                    segment.write(chunk.tobytes())
+                    segment_records += len(chunk)
+                    self.written += len(chunk)
+                segment.flush()
+        except Exception as e:
+            self.failed = True
+            self.dropped += len(records)
+            # Nothing reads the queue from here on; release what is already in it.
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, np.ndarray):
+                    self.dropped += len(item)
+            logger.error("tick_recorder_write_failed", error=str(e), written=self.written)
+        finally:
+            symbols_file.close()
+            if segment is not None:
+                segment.close()
+
+
+class TickReader:
+    """Memory-maps the segments written by TickRecorder as read-only TICK_DTYPE record arrays."""
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = Path(directory)
+        symbols_path = self.directory / SYMBOLS_FILE
+        self.symbols: list[str] = (
+            symbols_path.read_text().splitlines() if symbols_path.exists() else []
+        )
+        self.paths = _segment_paths(self.directory)
+        self.skipped = 0
+
+    def segments(self) -> Iterator[np.ndarray]:
+        for path in self.paths:
+            # A segment still being written can end in a partial record; map whole records only.
+            count = path.stat().st_size // TICK_DTYPE.itemsize
+            if count:
+                yield np.memmap(path, dtype=TICK_DTYPE, mode="r", shape=(count,))
+
+    def iter_ticks(self) -> Iterator[tuple[str, dict[str, float | int], float]]:
+        """Yield ``(symbol, fields, timestamp)`` ticks, the input format of BacktestEngine.run.
+
+        Records whose symbol id is not in ``symbols.txt`` yet (the file is read once, and can
+        lag a directory still being recorded) are skipped and counted in ``skipped``.
+        """
+        symbols = self.symbols
+        known = len(symbols)
+        self.skipped = 0
+        for records in self.segments():
+            for start in range(0, len(records), READ_CHUNK_RECORDS):
+                chunk = records[start : start + READ_CHUNK_RECORDS].tolist()
+                for symbol_id, timestamp, bid, ask, last, volume in chunk:
+                    if symbol_id >= known:
+                        self.skipped += 1
+                        continue
+                    yield (
+                        symbols[symbol_id],
+                        {"bid_price": bid, "ask_price": ask, "last_price": last, "volume": volume},
+                        timestamp,
+                    )
+        if self.skipped:
+            logger.warning("tick_reader_unknown_symbols", skipped=self.skipped)
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Iterable
+
+import quickfix as fix
+import structlog
+
+from src.services.metrics import bind_market_data_subscriptions
+
+if TYPE_CHECKING:
+    from src.das_trader.fix_client import DasTraderFixClient
+    from src.das_trader.market_data import MarketData
+
+logger = structlog.get_logger(__name__)
+
+TAG_MD_REQ_ID = 262
+TAG_TEXT = 58
+TAG_MD_REQ_REJ_REASON = 281
+
+
+class SubscriptionManager:
+    """Market data subscriptions for a changing symbol universe.
+
+    ``set_universe`` records which symbols should be streaming; ``pump`` sends the difference
+    as MarketDataRequests of up to ``batch_size`` symbols each, at most ``requests_per_sec``
+    requests per second (a token bucket holding up to one second's worth). Unsubscribes go
+    first, so bandwidth is released before more is taken on, then subscribes in universe order.
+
+    An unsubscribe (263=2) ends the whole request identified by its MDReqID, so a request is
+    only ever retired as a unit: when any of its symbols leaves the universe the request is
+    unsubscribed and the symbols that stay are requested again under a new MDReqID.
+
+    A subscribed symbol is pending until its first quote arrives (``on_market_data``) and active
+    after that. A symbol still pending after ``pending_timeout_sec``, or pending in a request
+    that is rejected (35=Y), is retried in a request of its own; if that fails too it moves to
+    ``rejected``, where it stays until it leaves the universe and comes back. ``reset`` forgets
+    every subscription after the session drops, so they are all requested again on the next
+    logon.
+    """
+
+    def __init__(
+        self,
+        client: DasTraderFixClient,
+        batch_size: int = 500,
+        requests_per_sec: float = 5.0,
+        depth: int = 1,
+        pending_timeout_sec: float = 30.0,
+    ):
+        if batch_size < 1:
+            raise ValueError(f"Subscription batch size must be positive, got {batch_size}")
+        if requests_per_sec <= 0:
+            raise ValueError(f"Subscription request rate must be positive, got {requests_per_sec}")
+        self.client = client
+        self.batch_size = batch_size
+        self.requests_per_sec = requests_per_sec
+        self.depth = depth
+        self.pending_timeout_sec = pending_timeout_sec
+        self.universe: set[str] = set()
+        # Insertion-ordered sets: symbols waiting to be subscribed, and MDReqIDs waiting to be
+        # unsubscribed.
+        self.to_subscribe: dict[str, None] = {}
+        self.retiring: dict[str, None] = {}
+        # Live requests: MDReqID -> its symbols, and symbol -> the MDReqID it streams under.
+        self.requests: dict[str, list[str]] = {}
+        self.request_ids: dict[str, str] = {}
+        # Symbol -> monotonic time its subscribe was sent, until the first quote arrives.
+        self.pending: dict[str, float] = {}
+        self.active: set[str] = set()
+        # Pending past the timeout; their requests are retired and they are retried alone.
+        self.expired: set[str] = set()
+        self.isolated: set[str] = set()
+        self.rejected: dict[str, str] = {}
+        self.requests_sent = 0
+        self._tokens = max(1.0, requests_per_sec)
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+        bind_market_data_subscriptions(self)
+
+    @property
+    def counts(self) -> dict[str, int]:
+        return {
+            "active": len(self.active),
+            "pending": len(self.pending) + len(self.expired),
+            "queued": len(self.to_subscribe),
+            "unsubscribing": sum(len(self.requests.get(r, ())) for r in list(self.retiring)),
+            "rejected": len(self.rejected),
+        }
+
+    def active_symbols(self) -> list[str]:
+        with self._lock:
+            return list(self.active)
+
+    def set_universe(self, symbols: Iterable[str]):
+        """Make ``symbols`` (in priority order) the set that should be streaming."""
+        universe = dict.fromkeys(symbols)
+        with self._lock:
+            for symbol in universe:
+                if symbol not in self.request_ids and symbol not in self.rejected:
+                    self.to_subscribe[symbol] = None
+            for symbol in [s for s in self.to_subscribe if s not in universe]:
+                del self.to_subscribe[symbol]
+            for symbol in [s for s in self.rejected if s not in universe]:
+                del self.rejected[symbol]
+            self.isolated.intersection_update(universe)
+            # Requests stay live while every symbol in them is still wanted and streaming.
+            self.retiring = dict.fromkeys(
+                md_req_id
+                for symbol, md_req_id in self.request_ids.items()
+                if symbol not in universe or symbol in self.expired
+            )
+            self.universe = set(universe)
+
+    def pump(self) -> int:
+        """Send queued changes as the rate limit allows; returns the number of requests sent."""
+        sent = 0
+        with self._lock:
+            now = time.monotonic()
+            self._expire_pending(now)
+            self._tokens = min(
+                max(1.0, self.requests_per_sec),
+                self._tokens + (now - self._refilled_at) * self.requests_per_sec,
+            )
+            self._refilled_at = now
+            while self._tokens >= 1 and (self.retiring or self.to_subscribe):
+                try:
+                    if self.retiring:
+                        self._send_unsubscribe()
+                    else:
+                        self._send_subscribe(now)
+                except Exception as e:
+                    logger.warning("market_data_request_deferred", error=str(e))
+                    break
+                self._tokens -= 1
+                sent += 1
+            self.requests_sent += sent
+        return sent
+
+    def _expire_pending(self, now: float):
+        # Pending is in send order, so only its head can have timed out.
+        deadline = now - self.pending_timeout_sec
+        expired = []
+        for symbol, sent_at in self.pending.items():
+            if sent_at > deadline:
+                break
+            expired.append(symbol)
+        for symbol in expired:
+            del self.pending[symbol]
+            self.expired.add(symbol)
+            self.retiring[self.request_ids[symbol]] = None
+        if expired:
+            logger.warning("market_data_subscription_timeout", symbols=len(expired))
+
+    def _send_subscribe(self, now: float):
+        first = next(iter(self.to_subscribe))
+        if first in self.isolated:
+            batch = [first]
+        else:
+            batch = []
+            for symbol in self.to_subscribe:
+                if symbol in self.isolated:
+                    continue
+                batch.append(symbol)
+                if len(batch) == self.batch_size:
+                    break
+        md_req_id = self.client.cl_ord_ids.next_id("MD")
+        self.client.send_market_data_request(md_req_id, batch, subscribe=True, depth=self.depth)
+        self.requests[md_req_id] = batch
+        for symbol in batch:
+            del self.to_subscribe[symbol]
+            self.pending[symbol] = now
+            self.request_ids[symbol] = md_req_id
+
+    def _send_unsubscribe(self):
+        md_req_id = next(iter(self.retiring))
+        symbols = self.requests[md_req_id]
+        self.client.send_market_data_request(md_req_id, symbols, subscribe=False, depth=self.depth)
+        del self.retiring[md_req_id]
+        self._drop_request(md_req_id, "no market data received", rejected=False)
+
+    def _drop_request(self, md_req_id: str, reason: str, rejected: bool):
+        """Requeue the wanted symbols of an ended request ahead of new ones.
+
+        Symbols that timed out, or were still pending in a rejected request, are retried
+        alone; one that fails alone is rejected with ``reason``.
+        """
+        symbols = self.requests.pop(md_req_id)
+        requeue = []
+        for symbol in symbols:
+            del self.request_ids[symbol]
+            was_pending = self.pending.pop(symbol, None) is not None
+            failed = symbol in self.expired or (rejected and was_pending)
+            self.expired.discard(symbol)
+            self.active.discard(symbol)
+            if symbol not in self.universe:
+                continue
+            if not failed:
+                requeue.append(symbol)
+            elif len(symbols) > 1:
+                self.isolated.add(symbol)
+                requeue.append(symbol)
+            else:
+                self.isolated.discard(symbol)
+                self.rejected[symbol] = reason
+        if requeue:
+            self.to_subscribe = dict.fromkeys(requeue) | self.to_subscribe
+
+    def on_market_data(self, market_data: MarketData):
+        """Market data callback: the first quote after a subscribe makes the symbol active."""
+        if market_data.symbol not in self.pending:
+            return
+        with self._lock:
+            sent_at = self.pending.pop(market_data.symbol, None)
+            if sent_at is None:
+                return
+            self.active.add(market_data.symbol)
+            self.isolated.discard(market_data.symbol)
+        logger.debug(
+            "market_data_subscription_active",
+            symbol=market_data.symbol,
+            wait_ms=(time.monotonic() - sent_at) * 1000,
+        )
+
+    def on_market_data_reject(self, message: fix.Message):
+        """MarketDataRequestReject (35=Y) handler; called on the QuickFIX thread."""
+        md_req_id = message.getField(TAG_MD_REQ_ID) if message.isSetField(TAG_MD_REQ_ID) else ""
+        reason = message.getField(TAG_TEXT) if message.isSetField(TAG_TEXT) else ""
+        if not reason and message.isSetField(TAG_MD_REQ_REJ_REASON):
+            reason = f"MDReqRejReason {message.getField(TAG_MD_REQ_REJ_REASON)}"
+        with self._lock:
+            if md_req_id not in self.requests:
+                symbols = 0
+            else:
+                symbols = len(self.requests[md_req_id])
+                self.retiring.pop(md_req_id, None)
+                self._drop_request(md_req_id, reason, rejected=True)
+        logger.warning(
+            "market_data_request_rejected", md_req_id=md_req_id, symbols=symbols, reason=reason
+        )
+
+    def reset(self):
+        """Forget every live subscription, e.g. after a logout; the universe is requested again."""
+        with self._lock:
+            requeued = [s for s in self.request_ids if s in self.universe]
+            self.isolated.update(s for s in self.expired if s in self.universe)
+            self.to_subscribe = dict.fromkeys(requeued) | self.to_subscribe
+            self.retiring.clear()
+            self.requests.clear()
+            self.request_ids.clear()
+            self.pending.clear()
+            self.expired.clear()
+            self.active.clear()
+        logger.info("market_data_subscriptions_reset", requeued=len(requeued))
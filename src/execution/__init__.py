@@ -1,4 +1,9 @@
-from src.execution.execution_bot import ExecutionBot, Order
-
-__all__ = ["ExecutionBot", "Order"]
+from src.execution.execution_bot import (
+    ExecutionBot,
+    Order,
+    OrderRequest,
+    OrderResult,
+    OrderTicket,
+)
 
+__all__ = ["ExecutionBot", "Order", "OrderRequest", "OrderResult", "OrderTicket"]
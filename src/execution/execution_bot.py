@@ -1,17 +1,55 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from dataclasses import dataclass
-from typing import Any
+from typing import Callable, Sequence
 
+import numpy as np
+import quickfix as fix
 import structlog
 
 from src.config import ExecutionSettings
+from src.das_trader.execution_report import ExecutionReport, decode_execution_report
 from src.das_trader.fix_client import DasTraderFixClient
+from src.services.metrics import record_order_filled, record_order_latency, record_stage_latency
 
 logger = structlog.get_logger(__name__)
 
+OPEN_STATUSES = frozenset({"SUBMITTED", "NEW", "PARTIALLY_FILLED", "PENDING_CANCEL"})
 
-@dataclass
+# OrdStatus (39) -> Order.status
+ORD_STATUS_MAP: dict[str, str] = {
+    fix.OrdStatus_PENDING_NEW: "SUBMITTED",
+    fix.OrdStatus_NEW: "NEW",
+    fix.OrdStatus_PARTIALLY_FILLED: "PARTIALLY_FILLED",
+    fix.OrdStatus_FILLED: "FILLED",
+    fix.OrdStatus_PENDING_CANCEL: "PENDING_CANCEL",
+    fix.OrdStatus_CANCELED: "CANCELLED",
+    fix.OrdStatus_DONE_FOR_DAY: "CANCELLED",
+    fix.OrdStatus_EXPIRED: "CANCELLED",
+    fix.OrdStatus_REJECTED: "REJECTED",
+}
+
+ORDER_TRANSITIONS: dict[str, frozenset[str]] = {
+    "PENDING": frozenset(
+        {"SUBMITTED", "NEW", "PARTIALLY_FILLED", "FILLED", "CANCELLED", "REJECTED"}
+    ),
+    "SUBMITTED": frozenset(
+        {"NEW", "PARTIALLY_FILLED", "FILLED", "PENDING_CANCEL", "CANCELLED", "REJECTED"}
+    ),
+    "NEW": frozenset({"PARTIALLY_FILLED", "FILLED", "PENDING_CANCEL", "CANCELLED", "REJECTED"}),
+    "PARTIALLY_FILLED": frozenset({"PARTIALLY_FILLED", "FILLED", "PENDING_CANCEL", "CANCELLED"}),
+    "PENDING_CANCEL": frozenset({"NEW", "PARTIALLY_FILLED", "FILLED", "CANCELLED"}),
+    "FILLED": frozenset(),
+    "CANCELLED": frozenset(),
+    "REJECTED": frozenset(),
+}
+
+FILL_EXEC_TYPES = frozenset({fix.ExecType_PARTIAL_FILL, fix.ExecType_FILL, fix.ExecType_TRADE})
+
+
+@dataclass(slots=True)
 class Order:
     order_id: str
     symbol: str
@@ -23,19 +61,92 @@ class Order:
     status: str = "PENDING"
     filled_quantity: int = 0
     avg_fill_price: float = 0.0
+    exchange_order_id: str = ""
+    reject_reason: str = ""
+    # perf_counter_ns() stamps: the quote that triggered the order arriving from FIX, the scan
+    # signal, the pre-trade check passing, and just before/after the FIX client send.
+    recv_ns: int = 0
+    signal_ns: int = 0
+    risk_ns: int = 0
+    sent_ns: int = 0
+    send_done_ns: int = 0
+
+
+@dataclass(slots=True)
+class OrderRequest:
+    symbol: str
+    side: str
+    quantity: int
+    order_type: str = "MARKET"
+    # Limit/stop price; on a MARKET order, the reference price its open exposure is valued at.
+    price: float | None = None
+    time_in_force: str | None = None
+    # Trace stamps copied onto the Order (see Order.recv_ns).
+    recv_ns: int = 0
+    signal_ns: int = 0
+    risk_ns: int = 0
+
+
+@dataclass
+class OrderResult:
+    request: OrderRequest
+    order_id: str | None = None
+    error: str | None = None
+
+    @property
+    def accepted(self) -> bool:
+        return self.order_id is not None
+
+
+@dataclass
+class OrderTicket:
+    """Awaitables for one submitted order, resolved from its execution reports.
+
+    ``ack`` resolves with the order on the first report that moves it out of SUBMITTED.
+    ``fill`` resolves with the order once it is FILLED, CANCELLED or REJECTED; check
+    ``order.status`` to tell a fill from an order that left the book unfilled.
+    """
+
+    order_id: str
+    ack: asyncio.Future[Order]
+    fill: asyncio.Future[Order]
 
 
 class ExecutionBot:
     def __init__(self, settings: ExecutionSettings, fix_client: DasTraderFixClient):
         self.settings = settings
         self.fix_client = fix_client
+        # Orders by ClOrdID, plus secondary indexes kept in step by _set_status().
         self.orders: dict[str, Order] = {}
+        self.orders_by_symbol: dict[str, dict[str, Order]] = {}
+        self.open_orders: dict[str, Order] = {}
+        # Open orders by symbol, then ClOrdID; symbols without one are absent.
+        self.open_orders_by_symbol: dict[str, dict[str, Order]] = {}
+        # Notional of the unfilled quantity of open orders (at limit/stop or reference price),
+        # kept incrementally for pre-trade checks.
+        self.open_exposure = 0.0
+        self.open_exposure_by_symbol: dict[str, float] = {}
+        self._order_exposure: dict[str, float] = {}
+        self.fill_callbacks: list[Callable[[Order, int, float], None]] = []
+        # Outstanding submit_order() tickets by ClOrdID, dropped once the fill future resolves.
+        self.tickets: dict[str, OrderTicket] = {}
+        # Orders whose reconcile_open_orders() status reply hasn't been applied; ``reconciled``
+        # is set while there are none.
+        self.reconciling: set[str] = set()
+        self.reconciled = asyncio.Event()
+        self.reconciled.set()
+        # Where decoded reports go; DasTraderBot moves this onto the event loop.
+        self.report_sink: Callable[[ExecutionReport], None] = self.apply_execution_report
+
+    def register_fill_callback(self, callback: Callable[[Order, int, float], None]):
+        self.fill_callbacks.append(callback)
 
     def place_market_order(self, symbol: str, side: str, quantity: int) -> str:
         if quantity > self.settings.max_order_size:
             raise ValueError(f"Order size {quantity} exceeds maximum {self.settings.max_order_size}")
 
         try:
+            sent_ns = time.perf_counter_ns()
             order_id = self.fix_client.send_order(
                 symbol=symbol,
                 side=side,
@@ -53,9 +164,10 @@ class ExecutionBot:
                 price=None,
                 time_in_force=self.settings.default_time_in_force,
                 status="SUBMITTED",
+                sent_ns=sent_ns,
             )
 
-            self.orders[order_id] = order
+            self._track_order(order)
             logger.info("market_order_placed", symbol=symbol, side=side, quantity=quantity, order_id=order_id)
             return order_id
         except Exception as e:
@@ -70,6 +182,7 @@ class ExecutionBot:
 
         try:
             tif = time_in_force or self.settings.default_time_in_force
+            sent_ns = time.perf_counter_ns()
             order_id = self.fix_client.send_order(
                 symbol=symbol,
                 side=side,
@@ -88,9 +201,10 @@ class ExecutionBot:
                 price=price,
                 time_in_force=tif,
                 status="SUBMITTED",
+                sent_ns=sent_ns,
             )
 
-            self.orders[order_id] = order
+            self._track_order(order)
             logger.info(
                 "limit_order_placed", symbol=symbol, side=side, quantity=quantity, price=price, order_id=order_id
             )
@@ -104,6 +218,7 @@ class ExecutionBot:
             raise ValueError(f"Order size {quantity} exceeds maximum {self.settings.max_order_size}")
 
         try:
+            sent_ns = time.perf_counter_ns()
             order_id = self.fix_client.send_order(
                 symbol=symbol,
                 side=side,
@@ -122,9 +237,10 @@ class ExecutionBot:
                 price=stop_price,
                 time_in_force=self.settings.default_time_in_force,
                 status="SUBMITTED",
+                sent_ns=sent_ns,
             )
 
-            self.orders[order_id] = order
+            self._track_order(order)
             logger.info(
                 "stop_order_placed", symbol=symbol, side=side, quantity=quantity, stop_price=stop_price, order_id=order_id
             )
@@ -133,20 +249,330 @@ class ExecutionBot:
             logger.error("stop_order_failed", symbol=symbol, side=side, error=str(e))
             raise
 
+    def place_orders(self, batch: Sequence[OrderRequest]) -> list[OrderResult]:
+        """Validate a basket in one pass and submit the valid legs back to back.
+
+        Returns one OrderResult per request, in request order.
+        """
+        count = len(batch)
+        if not count:
+            return []
+
+        quantities = np.fromiter(
+            (request.quantity for request in batch), dtype=np.int64, count=count
+        )
+        needs_price = np.fromiter(
+            (request.order_type != "MARKET" for request in batch), dtype=bool, count=count
+        )
+        has_price = np.fromiter((bool(request.price) for request in batch), dtype=bool, count=count)
+
+        oversized = quantities > self.settings.max_order_size
+        non_positive = quantities <= 0
+        missing_price = needs_price & ~has_price
+        valid = ~(oversized | non_positive | missing_price)
+
+        results = [OrderResult(request=request) for request in batch]
+        for i in np.flatnonzero(~valid):
+            if oversized[i]:
+                results[i].error = (
+                    f"Order size {batch[i].quantity} exceeds maximum {self.settings.max_order_size}"
+                )
+            elif non_positive[i]:
+                results[i].error = f"Order size {batch[i].quantity} must be positive"
+            else:
+                results[i].error = f"{batch[i].order_type} order requires a price"
+
+        if not valid.all():
+            logger.warning(
+                "order_legs_invalid",
+                legs=count,
+                errors=[
+                    {"leg": i, "symbol": result.request.symbol, "error": result.error}
+                    for i, result in enumerate(results)
+                    if result.error
+                ],
+            )
+
+        valid_indexes = np.flatnonzero(valid)
+        legs = []
+        for i in valid_indexes:
+            request = batch[i]
+            legs.append(
+                (
+                    request.symbol,
+                    request.side,
+                    request.order_type,
+                    request.quantity,
+                    request.price,
+                    request.time_in_force or self.settings.default_time_in_force,
+                )
+            )
+
+        sent_ns = time.perf_counter_ns()
+        try:
+            outcomes: list[str | Exception] = self.fix_client.send_orders(legs) if legs else []
+        except Exception as e:
+            logger.error("order_batch_failed", legs=len(legs), error=str(e))
+            outcomes = [e] * len(legs)
+        send_done_ns = time.perf_counter_ns()
+
+        for i, outcome, leg in zip(valid_indexes, outcomes, legs):
+            if isinstance(outcome, Exception):
+                results[i].error = str(outcome)
+                continue
+            symbol, side, order_type, quantity, price, tif = leg
+            request = batch[i]
+            self._track_order(
+                Order(
+                    order_id=outcome,
+                    symbol=symbol,
+                    side=side,
+                    order_type=order_type,
+                    quantity=quantity,
+                    price=price,
+                    time_in_force=tif,
+                    status="SUBMITTED",
+                    recv_ns=request.recv_ns,
+                    signal_ns=request.signal_ns,
+                    risk_ns=request.risk_ns,
+                    sent_ns=sent_ns,
+                    send_done_ns=send_done_ns,
+                )
+            )
+            record_stage_latency("send", request.risk_ns, send_done_ns)
+            record_stage_latency("tick_to_send", request.recv_ns, send_done_ns)
+            results[i].order_id = outcome
+        return results
+
+    def submit_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: int,
+        order_type: str = "MARKET",
+        price: float | None = None,
+        time_in_force: str | None = None,
+    ) -> OrderTicket:
+        """Send an order and return futures for its ack and fill.
+
+        Must be called on the event loop that applies execution reports, so several orders can
+        be in flight while the caller awaits each ticket.
+        """
+        loop = asyncio.get_running_loop()
+        if order_type == "MARKET":
+            order_id = self.place_market_order(symbol, side, quantity)
+        elif order_type == "LIMIT":
+            if price is None:
+                raise ValueError("LIMIT order requires a price")
+            order_id = self.place_limit_order(symbol, side, quantity, price, time_in_force)
+        elif order_type == "STOP":
+            if price is None:
+                raise ValueError("STOP order requires a price")
+            order_id = self.place_stop_order(symbol, side, quantity, price)
+        else:
+            raise ValueError(f"Unsupported order type {order_type}")
+
+        ticket = OrderTicket(order_id=order_id, ack=loop.create_future(), fill=loop.create_future())
+        self.tickets[order_id] = ticket
+        # Without a loop-side report sink the ack can already have been applied.
+        self._resolve_ticket(self.orders[order_id])
+        return ticket
+
     def cancel_order(self, order_id: str, symbol: str) -> bool:
         try:
             self.fix_client.cancel_order(order_id, symbol)
-            if order_id in self.orders:
-                self.orders[order_id].status = "CANCELLED"
-            logger.info("order_cancelled", order_id=order_id, symbol=symbol)
+            order = self.orders.get(order_id)
+            if order is not None and order.status in OPEN_STATUSES:
+                self._set_status(order, "PENDING_CANCEL")
+            logger.info("order_cancel_requested", order_id=order_id, symbol=symbol)
             return True
         except Exception as e:
             logger.error("order_cancel_failed", order_id=order_id, error=str(e))
             return False
 
+    def on_execution_report(self, message: fix.Message):
+        try:
+            self.report_sink(decode_execution_report(message))
+        except Exception as e:
+            logger.error("execution_report_parse_error", error=str(e))
+
+    def apply_execution_report(self, report: ExecutionReport):
+        # Cancel acks carry the cancel request's ClOrdID and the order's OrigClOrdID.
+        order = self.orders.get(report.cl_ord_id) or self.orders.get(report.orig_cl_ord_id)
+        if order is None:
+            logger.warning(
+                "execution_report_unknown_order",
+                cl_ord_id=report.cl_ord_id,
+                orig_cl_ord_id=report.orig_cl_ord_id,
+            )
+            return
+
+        if report.order_id:
+            order.exchange_order_id = report.order_id
+        if self.reconciling:
+            self.reconciling.discard(order.order_id)
+            if not self.reconciling:
+                self.reconciled.set()
+
+        if report.exec_type in FILL_EXEC_TYPES and report.last_qty > 0:
+            self._apply_fill(order, report)
+        elif report.exec_type == fix.ExecType_ORDER_STATUS and report.cum_qty:
+            # Status replies to reconcile_open_orders() carry fills missed while offline.
+            self._apply_fill(order, report)
+
+        status = ORD_STATUS_MAP.get(report.ord_status)
+        if status is None or status == order.status:
+            self._resolve_ticket(order)
+            return
+        if status not in ORDER_TRANSITIONS[order.status]:
+            logger.warning(
+                "order_transition_ignored",
+                order_id=order.order_id,
+                from_status=order.status,
+                to_status=status,
+            )
+            return
+
+        if status == "REJECTED":
+            order.reject_reason = report.text
+        previous_status = order.status
+        self._set_status(order, status)
+        logger.info(
+            "order_status_changed", order_id=order.order_id, symbol=order.symbol, status=status
+        )
+
+        if order.sent_ns:
+            latency_ms = (time.perf_counter_ns() - order.sent_ns) / 1e6
+            if previous_status == "SUBMITTED" and status != "REJECTED":
+                record_order_latency("ack", latency_ms)
+            if status == "FILLED":
+                record_order_latency("fill", latency_ms)
+
+        if status == "FILLED":
+            record_order_filled(order.order_type, order.side)
+
+        self._resolve_ticket(order)
+
+    def _resolve_ticket(self, order: Order):
+        ticket = self.tickets.get(order.order_id)
+        if ticket is None or order.status == "SUBMITTED":
+            return
+        if not ticket.ack.done():
+            ticket.ack.set_result(order)
+        if order.status not in OPEN_STATUSES:
+            if not ticket.fill.done():
+                ticket.fill.set_result(order)
+            del self.tickets[order.order_id]
+
+    def _apply_fill(self, order: Order, report: ExecutionReport):
+        if order.status not in OPEN_STATUSES:
+            return
+
+        if report.cum_qty is not None:
+            # CumQty makes duplicate or replayed fills idempotent.
+            fill_quantity = report.cum_qty - order.filled_quantity
+        else:
+            fill_quantity = report.last_qty
+        if fill_quantity <= 0:
+            return
+
+        fill_price = report.last_px
+        filled = order.filled_quantity + fill_quantity
+        if not fill_price and report.avg_px:
+            # Status reports carry no LastPx; price the missed quantity off the AvgPx change.
+            fill_price = (
+                report.avg_px * filled - order.avg_fill_price * order.filled_quantity
+            ) / fill_quantity
+        if report.avg_px:
+            order.avg_fill_price = report.avg_px
+        else:
+            order.avg_fill_price = (
+                order.avg_fill_price * order.filled_quantity + fill_price * fill_quantity
+            ) / filled
+        order.filled_quantity = filled
+        self._sync_exposure(order)
+
+        logger.info(
+            "order_fill",
+            order_id=order.order_id,
+            symbol=order.symbol,
+            side=order.side,
+            fill_quantity=fill_quantity,
+            fill_price=fill_price,
+            filled_quantity=filled,
+        )
+        for callback in self.fill_callbacks:
+            callback(order, fill_quantity, fill_price)
+
+    def restore_orders(self, orders: Sequence[Order]):
+        """Track orders loaded from a state snapshot, without sending anything."""
+        for order in orders:
+            self._track_order(order)
+
+    def reconcile_open_orders(self) -> int:
+        """Request the broker's status of every open order, e.g. after a restart.
+
+        The replies are applied like any other execution report: fills missed while the bot
+        was down arrive as CumQty/AvgPx on the status report, and orders the broker no longer
+        knows come back rejected. ``reconciled`` is set once every reply has been applied.
+        Returns the number of requests sent.
+        """
+        sent = 0
+        self.reconciling = set()
+        for order in list(self.open_orders.values()):
+            try:
+                self.fix_client.request_order_status(order.order_id, order.symbol, order.side)
+                self.reconciling.add(order.order_id)
+                sent += 1
+            except Exception as e:
+                logger.error("order_status_request_failed", order_id=order.order_id, error=str(e))
+        if self.reconciling:
+            self.reconciled.clear()
+        else:
+            self.reconciled.set()
+        logger.info("open_orders_reconciling", orders=len(self.open_orders), requested=sent)
+        return sent
+
+    def _track_order(self, order: Order):
+        self.orders[order.order_id] = order
+        self.orders_by_symbol.setdefault(order.symbol, {})[order.order_id] = order
+        self._index_open(order)
+        self._sync_exposure(order)
+
+    def _set_status(self, order: Order, status: str):
+        order.status = status
+        self._index_open(order)
+        self._sync_exposure(order)
+
+    def _index_open(self, order: Order):
+        by_symbol = self.open_orders_by_symbol
+        if order.status in OPEN_STATUSES:
+            self.open_orders[order.order_id] = order
+            by_symbol.setdefault(order.symbol, {})[order.order_id] = order
+        elif self.open_orders.pop(order.order_id, None) is not None:
+            symbol_orders = by_symbol[order.symbol]
+            del symbol_orders[order.order_id]
+            if not symbol_orders:
+                del by_symbol[order.symbol]
+
+    def _sync_exposure(self, order: Order):
+        old = self._order_exposure.pop(order.order_id, 0.0)
+        new = 0.0
+        if order.status in OPEN_STATUSES and order.price:
+            new = (order.quantity - order.filled_quantity) * order.price
+            self._order_exposure[order.order_id] = new
+        if new != old:
+            by_symbol = self.open_exposure_by_symbol
+            by_symbol[order.symbol] = by_symbol.get(order.symbol, 0.0) + new - old
+            self.open_exposure += new - old
+
     def get_order(self, order_id: str) -> Order | None:
         return self.orders.get(order_id)
 
-    def get_open_orders(self) -> list[Order]:
-        return [order for order in self.orders.values() if order.status in ["SUBMITTED", "PARTIALLY_FILLED"]]
+    def get_open_orders(self, symbol: str | None = None) -> list[Order]:
+        if symbol is None:
+            return list(self.open_orders.values())
+        return list(self.open_orders_by_symbol.get(symbol, {}).values())
 
+    def get_orders_for_symbol(self, symbol: str) -> list[Order]:
+        return list(self.orders_by_symbol.get(symbol, {}).values())
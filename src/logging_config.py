@@ -1,21 +1,194 @@
 from __future__ import annotations
 
+import atexit
+import json
 import logging
+import queue
 import sys
-from typing import Literal
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Literal, TextIO
 
 import structlog
 
+BATCH_MAX_EVENTS = 1024
+QUEUE_MAX_EVENTS = 65536
 
-def configure_logging(level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO") -> None:
+
+class EventSampler:
+    """Keeps 1 in N occurrences of selected events and drops the rest.
+
+    ``every`` maps an event name to N; events not listed always pass. Counting is per event
+    name, so a sampled debug stream does not thin out unrelated events.
+    """
+
+    def __init__(self, every: dict[str, int]):
+        self.every = {event: n for event, n in every.items() if n > 1}
+        self.counts: dict[str, int] = dict.fromkeys(self.every, 0)
+
+    def __call__(self, logger: Any, method_name: str, event_dict: dict[str, Any]) -> dict[str, Any]:
+        every = self.every.get(event_dict["event"])
+        if every is not None:
+            event = event_dict["event"]
+            count = self.counts[event]
+            self.counts[event] = count + 1
+            if count % every:
+                raise structlog.DropEvent
+            event_dict["sampled_every"] = every
+        return event_dict
+
+
+class QueueLogSink:
+    """Renders and writes log events on a background thread, in batches.
+
+    The logging thread only runs the cheap processors, stamps the event with ``time.time()``
+    and puts the event dict on a queue. The writer thread drains everything queued (up to
+    ``BATCH_MAX_EVENTS``), formats timestamps, renders JSON, and writes the batch with a single
+    ``write`` and ``flush``. Values are rendered after the call returns, so only log values
+    that will not be mutated afterwards.
+
+    The queue holds at most ``maxsize`` events. When the writer falls that far behind, new
+    events are dropped and counted in ``dropped`` rather than held in memory or blocking the
+    caller; the writer reports the count in a ``log_events_dropped`` line.
+    """
+
+    def __init__(self, stream: TextIO, maxsize: int = QUEUE_MAX_EVENTS):
+        self.stream = stream
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue(maxsize)
+        self._render = structlog.processors.JSONRenderer()
+        self._rename = structlog.processors.EventRenamer("message")
+        self._thread = threading.Thread(target=self._write_loop, name="log-sink", daemon=True)
+        self.written = 0
+        self.dropped = 0
+        self._dropped_reported = 0
+        self._thread.start()
+
+    def put(self, event_dict: dict[str, Any]):
+        try:
+            self._queue.put_nowait(event_dict)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _write_loop(self):
+        get = self._queue.get
+        get_nowait = self._queue.get_nowait
+        while True:
+            batch = [get()]
+            while batch[-1] is not None and len(batch) < BATCH_MAX_EVENTS:
+                try:
+                    batch.append(get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            if stop:
+                batch.pop()
+            lines = []
+            for event_dict in batch:
+                try:
+                    lines.append(self._format(event_dict))
+                except Exception as e:
+                    lines.append(json.dumps({"message": "log_render_failed", "error": str(e)}))
+            dropped = self.dropped - self._dropped_reported
+            if dropped:
+                self._dropped_reported += dropped
+                lines.append(
+                    json.dumps(
+                        {"message": "log_events_dropped", "level": "warning", "dropped": dropped}
+                    )
+                )
+            if lines:
+                try:
+                    self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                except Exception:
+                    pass
+                self.written += len(batch)
+            if stop:
+                return
+
+    def _format(self, event_dict: dict[str, Any]) -> str:
+        timestamp = datetime.fromtimestamp(event_dict.pop("_ts"), tz=timezone.utc)
+        event_dict["timestamp"] = timestamp.isoformat().replace("+00:00", "Z")
+        event_dict = self._rename(None, "", event_dict)
+        return self._render(None, "", event_dict)
+
+
+class QueueLogger:
+    """structlog logger that hands the processed event dict to a QueueLogSink."""
+
+    def __init__(self, sink: QueueLogSink, name: str = ""):
+        self.sink = sink
+        self.name = name
+
+    def msg(self, event_dict: dict[str, Any]):
+        self.sink.put(event_dict)
+
+    log = debug = info = warning = warn = error = critical = exception = fatal = msg
+
+
+class QueueLoggerFactory:
+    def __init__(self, sink: QueueLogSink):
+        self.sink = sink
+
+    def __call__(self, *args: Any) -> QueueLogger:
+        return QueueLogger(self.sink, args[0] if args else "")
+
+
+def _enqueue(logger: Any, method_name: str, event_dict: dict[str, Any]):
+    event_dict["_ts"] = time.time()
+    return (event_dict,), {}
+
+
+_sink: QueueLogSink | None = None
+
+
+def configure_logging(
+    level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO",
+    async_sink: bool = False,
+    sample_every: dict[str, int] | None = None,
+    stream: TextIO | None = None,
+) -> None:
+    """Configure structlog JSON logging.
+
+    With ``async_sink`` the event is queued for a QueueLogSink thread to render and write;
+    otherwise it is rendered and written through stdlib logging on the calling thread.
+    ``sample_every`` keeps 1 in N of the named events (see EventSampler).
+    """
+    global _sink
+    stream = stream or sys.stdout
     logging.basicConfig(
         format="%(message)s",
-        stream=sys.stdout,
+        stream=stream,
         level=level,
     )
 
-    structlog.configure(
-        processors=[
+    processors: list[Any] = []
+    if sample_every:
+        processors.append(EventSampler(sample_every))
+
+    # Loggers cached before a reconfigure keep their sink, so an existing one is reused.
+    if _sink is not None and (not async_sink or _sink.stream is not stream):
+        shutdown_logging()
+
+    if async_sink:
+        if _sink is None:
+            _sink = QueueLogSink(stream)
+        processors += [
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            _enqueue,
+        ]
+        logger_factory: Any = QueueLoggerFactory(_sink)
+    else:
+        processors += [
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
@@ -23,9 +196,23 @@ def configure_logging(level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITI
             structlog.processors.format_exc_info,
             structlog.processors.EventRenamer("message"),
             structlog.processors.JSONRenderer(),
-        ],
+        ]
+        logger_factory = structlog.stdlib.LoggerFactory()
+
+    structlog.configure(
+        processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(getattr(logging, level)),
-        logger_factory=structlog.stdlib.LoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
+
+def shutdown_logging() -> None:
+    """Flush and stop the async sink, if one is running."""
+    global _sink
+    if _sink is not None:
+        _sink.close()
+        _sink = None
+
+
+atexit.register(shutdown_logging)
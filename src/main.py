@@ -2,40 +2,123 @@ from __future__ import annotations
 
 import asyncio
 import signal
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
 
+import numpy as np
 import structlog
 from dotenv import load_dotenv
 
-from src.bots.short_selling_bot import ShortSellingBot
 from src.config import Settings, get_settings
+from src.das_trader.bridge import MarketDataBridge
 from src.das_trader.fix_client import DasTraderFixClient, FixApplication
-from src.das_trader.market_data import MarketDataHandler
-from src.execution.execution_bot import ExecutionBot
+from src.das_trader.market_data import MarketData, MarketDataHandler
+from src.das_trader.subscriptions import SubscriptionManager
+from src.execution.execution_bot import ExecutionBot, OrderRequest
 from src.logging_config import configure_logging
+from src.risk.pre_trade import BasketExposure, PreTradeCheck, RejectReason
 from src.risk.risk_manager import RiskManager
 from src.scanner.scanner_bot import ScannerBot
-from src.services import start_metrics_server
+from src.services.metrics import (
+    bind_risk_metrics,
+    record_order_latency,
+    record_stage_latency,
+    record_startup,
+    start_metrics_server,
+)
+
+# Optional subsystems are imported where they are enabled, so a bot that doesn't use them
+# doesn't pay for loading them (or their sqlite3/multiprocessing imports) at startup.
+if TYPE_CHECKING:
+    from src.bots.short_selling_bot import ShortSellingBot
+    from src.das_trader.recorder import TickRecorder
+    from src.scanner.sharded import ShardedScanner
+    from src.services.state_store import StateStore
 
 logger = structlog.get_logger(__name__)
 
+BUY_SIGNALS = ("BREAKOUT_UP", "VOLUME_SPIKE")
+SHORT_SCAN_INTERVAL_SEC = 5.0
+SUBSCRIPTION_PUMP_INTERVAL_SEC = 0.1
+RECONCILE_TIMEOUT_SEC = 5.0
+
 
 class DasTraderBot:
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, fix_client: DasTraderFixClient | None = None):
+        self.created_at = time.perf_counter()
         self.settings = settings
         self.running = False
+        # Set while the FIX session is logged on and the bot can send orders.
+        self.ready = asyncio.Event()
+        self.market_data_bridge: MarketDataBridge | None = None
 
         self.fix_application = FixApplication()
-        self.fix_client = DasTraderFixClient(settings.das_trader.fix_config_file, self.fix_application)
+        self.fix_client = fix_client or DasTraderFixClient(
+            settings.das_trader.fix_config_file,
+            self.fix_application,
+            md_batch_size=settings.subscriptions.batch_size,
+            md_requests_per_sec=settings.subscriptions.requests_per_sec,
+            md_depth=max(1, settings.das_trader.book_levels),
+            md_pending_timeout_sec=settings.subscriptions.pending_timeout_sec,
+        )
 
-        self.market_data_handler = MarketDataHandler()
+        self.market_data_handler = MarketDataHandler(
+            book_levels=settings.das_trader.book_levels,
+            trace_sample_every=settings.trace_sample_every,
+        )
         self.fix_application.on_market_data = self.market_data_handler.on_market_data_update
+        self.fix_application.on_market_data_incremental = (
+            self.market_data_handler.on_market_data_incremental
+        )
+        self.tick_recorder: TickRecorder | None = None
+        if settings.recorder.enabled:
+            from src.das_trader.recorder import TickRecorder
+
+            self.tick_recorder = TickRecorder(
+                settings.recorder.directory,
+                segment_bytes=settings.recorder.segment_mb * 1024 * 1024,
+            )
+            # The recorder runs on its own consumer thread so disk stalls never delay risk ticks.
+            self.market_data_handler.register_callback(
+                self.tick_recorder.on_market_data,
+                policy=settings.recorder.queue_policy,
+                maxsize=settings.recorder.queue_size,
+                name="tick_recorder",
+            )
 
         self.execution_bot = ExecutionBot(settings.execution, self.fix_client)
+        self.fix_application.on_execution_report = self.execution_bot.on_execution_report
+        self.fix_application.on_order_cancel_reject = self.execution_bot.on_execution_report
         self.risk_manager = RiskManager(settings.risk)
-        self.scanner_bot = ScannerBot(settings.scanner, self.market_data_handler)
-        self.short_selling_bot = ShortSellingBot(
-            settings.short_selling, self.execution_bot, self.market_data_handler
+        self.pre_trade = PreTradeCheck(
+            settings.risk, self.risk_manager, self.execution_bot, self.market_data_handler
         )
+        self.scanner_bot = ScannerBot(settings.scanner, self.market_data_handler)
+        self.sharded_scanner: ShardedScanner | None = None
+        if settings.scanner.scan_workers > 0:
+            if settings.scanner.rolling_window > 0:
+                logger.warning("sharded_scan_disabled", reason="rolling_window is not sharded")
+            else:
+                from src.scanner.sharded import ShardedScanner
+
+                self.sharded_scanner = ShardedScanner(
+                    self.scanner_bot, settings.scanner.scan_workers
+                )
+        self.short_selling_bot: ShortSellingBot | None = None
+        if settings.short_selling.enabled:
+            from src.bots.short_selling_bot import ShortSellingBot
+
+            self.short_selling_bot = ShortSellingBot(
+                settings.short_selling, self.execution_bot, self.market_data_handler
+            )
+        # Opened by run(), so a bot driven by the backtest engine never touches the snapshot.
+        self.state_store: StateStore | None = None
+        # Wired by run() to the live FIX client's manager when subscriptions are enabled.
+        self.subscriptions: SubscriptionManager | None = None
+        self.universe: list[str] = []
+        # Symbol -> monotonic time an out-of-band symbol is subscribed again to be rechecked.
+        self._parked: dict[str, float] = {}
 
         self._setup_callbacks()
 
@@ -48,34 +131,87 @@ class DasTraderBot:
                 reason=scan_result.reason,
             )
 
-            if scan_result.signal_type in ["BREAKOUT_UP", "VOLUME_SPIKE"]:
-                self._handle_buy_signal(scan_result)
-            elif scan_result.signal_type == "BREAKOUT_DOWN":
+            # Buy signals are submitted as one basket per scan by _handle_buy_signals().
+            if scan_result.signal_type == "BREAKOUT_DOWN":
                 self._handle_sell_signal(scan_result)
 
         self.scanner_bot.register_callback(on_scan_result)
 
+        def on_fill(order, fill_quantity, fill_price):
+            self.risk_manager.apply_fill(order.symbol, order.side, fill_quantity, fill_price)
+            # A position opened or resized between ticks is checked against the latest quote.
+            market_data = self.market_data_handler.get_market_data(order.symbol)
+            if market_data is not None and self.settings.risk.enabled:
+                self.check_exit(order.symbol, market_data.last_price)
+
+        self.execution_bot.register_fill_callback(on_fill)
+
+        if self.settings.risk.enabled:
+            # Exits are checked before the rolling windows, the scan wakeup and any simulated
+            # fills see the tick.
+            self.market_data_handler.register_callback(self.on_risk_tick, priority=True)
+
+    def _has_working_order(self, symbol: str, side: str) -> bool:
+        return any(order.side == side for order in self.execution_bot.get_open_orders(symbol))
+
     def _handle_buy_signal(self, scan_result):
+        self._handle_buy_signals([scan_result])
+
+    def _handle_buy_signals(self, scan_results):
         if not self.settings.execution.enabled:
             return
-
-        quantity = 100
-        is_valid, reason = self.risk_manager.validate_order(
-            scan_result.symbol, "BUY", quantity, scan_result.price
-        )
-
-        if not is_valid:
-            logger.warning("order_rejected_by_risk", symbol=scan_result.symbol, reason=reason)
+        # Entries are not queued across a disconnect or reconciliation; the next scan after
+        # the bot is ready decides again.
+        if not self.ready.is_set():
             return
 
-        try:
-            order_id = self.execution_bot.place_market_order(
-                symbol=scan_result.symbol, side="BUY", quantity=quantity
+        quantity = 100
+        requests = []
+        # Nothing in the batch is visible to positions or open orders until it is sent.
+        basket = BasketExposure()
+        for scan_result in scan_results:
+            if scan_result.signal_type not in BUY_SIGNALS:
+                continue
+            # One entry per symbol, like exits: skip symbols already held, with a working
+            # BUY, or entered earlier in this basket.
+            symbol = scan_result.symbol
+            if (
+                symbol in self.risk_manager.positions
+                or symbol in basket.notional_by_symbol
+                or self._has_working_order(symbol, "BUY")
+            ):
+                continue
+
+            reason = self.pre_trade.check(symbol, "BUY", quantity, scan_result.price, basket)
+            if reason is not RejectReason.OK:
+                logger.warning(
+                    "order_rejected_by_risk",
+                    symbol=symbol,
+                    code=reason.name,
+                    reason=self.pre_trade.explain(
+                        reason, symbol, "BUY", quantity, scan_result.price
+                    ),
+                )
+                continue
+
+            basket.add(symbol, quantity, scan_result.price, new_position=True)
+            risk_ns = time.perf_counter_ns()
+            record_stage_latency("risk", scan_result.signal_ns, risk_ns)
+            # The signal price values the market order's exposure until it fills.
+            requests.append(
+                OrderRequest(
+                    symbol=symbol,
+                    side="BUY",
+                    quantity=quantity,
+                    price=scan_result.price,
+                    recv_ns=scan_result.recv_ns,
+                    signal_ns=scan_result.signal_ns,
+                    risk_ns=risk_ns,
+                )
             )
-            self.risk_manager.add_position(scan_result.symbol, "BUY", quantity, scan_result.price)
-            logger.info("buy_order_executed", symbol=scan_result.symbol, order_id=order_id)
-        except Exception as e:
-            logger.error("buy_order_failed", symbol=scan_result.symbol, error=str(e))
+
+        if requests:
+            self.execution_bot.place_orders(requests)
 
     def _handle_sell_signal(self, scan_result):
         if not self.settings.execution.enabled:
@@ -86,93 +222,317 @@ class DasTraderBot:
             return
 
         position = positions[scan_result.symbol]
-        if position.side == "BUY":
+        if position.side == "BUY" and not self._has_working_order(scan_result.symbol, "SELL"):
             try:
                 order_id = self.execution_bot.place_market_order(
                     symbol=scan_result.symbol, side="SELL", quantity=position.quantity
                 )
-                self.risk_manager.remove_position(scan_result.symbol)
                 logger.info("sell_order_executed", symbol=scan_result.symbol, order_id=order_id)
             except Exception as e:
                 logger.error("sell_order_failed", symbol=scan_result.symbol, error=str(e))
 
+    def run_scan(self, dirty_only: bool = False):
+        """One scanner pass over the full universe, or only over the symbols that ticked."""
+        if not self.settings.scanner.enabled:
+            if dirty_only:
+                self.market_data_handler.take_dirty_rows()
+            return
+
+        results = self.scanner_bot.scan_dirty() if dirty_only else self.scanner_bot.scan()
+        for result in results:
+            logger.debug("scanner_result", result=result)
+        self._handle_buy_signals(results)
+
+    async def run_scan_pass(self, dirty_only: bool = False):
+        """run_scan, on the scanner worker processes when sharded scanning is configured."""
+        sharded_scanner = self.sharded_scanner
+        if sharded_scanner is None or not self.settings.scanner.enabled:
+            self.run_scan(dirty_only)
+            return
+
+        if dirty_only:
+            results = await sharded_scanner.scan_dirty()
+        else:
+            results = await sharded_scanner.scan()
+        self._handle_buy_signals(results)
+
+    def on_risk_tick(self, market_data: MarketData):
+        """Check the ticking symbol's stop/take-profit triggers; other positions are untouched."""
+        if self.check_exit(market_data.symbol, market_data.last_price) and market_data.recv_ns:
+            # From FIX receipt; replayed and simulated ticks carry no receipt stamp.
+            latency_ns = time.perf_counter_ns() - market_data.recv_ns
+            record_order_latency("tick_to_exit", latency_ns / 1_000_000)
+
+    def check_exit(self, symbol: str, price: float) -> bool:
+        """Send a market exit if ``price`` hits the position's stop or take-profit."""
+        trigger = self.risk_manager.on_price(symbol, price)
+        if trigger is None:
+            return False
+
+        position = self.risk_manager.positions[symbol]
+        # Positions close when the exit order fills; don't stack exits.
+        exit_side = "SELL" if position.side == "BUY" else "BUY"
+        if self._has_working_order(symbol, exit_side):
+            return False
+
+        if trigger == "STOP_LOSS":
+            logger.warning("stop_loss_triggered", symbol=symbol, price=price)
+        else:
+            logger.info("take_profit_triggered", symbol=symbol, price=price)
+        try:
+            self.execution_bot.place_market_order(
+                symbol=symbol, side=exit_side, quantity=position.quantity
+            )
+        except Exception as e:
+            logger.error("exit_order_failed", symbol=symbol, error=str(e))
+            return False
+        return True
+
+    def run_short_selling_pass(self):
+        if self.short_selling_bot is None:
+            return
+
+        opportunities = self.short_selling_bot.scan_short_opportunities()
+        for opp in opportunities:
+            logger.info("short_opportunity_detected", symbol=opp.symbol, drop_pct=opp.drop_pct)
+            self.short_selling_bot.execute_short(opp, quantity=100)
+
     async def run_scanner_loop(self):
+        if self.settings.scanner.scan_mode == "event":
+            await self.run_event_scanner_loop()
+            return
+
         while self.running:
             try:
-                if self.settings.scanner.enabled:
-                    results = self.scanner_bot.scan()
-                    for result in results:
-                        logger.debug("scanner_result", result=result)
+                await self.run_scan_pass()
                 await asyncio.sleep(self.settings.scanner.scan_interval_sec)
             except Exception as e:
                 logger.error("scanner_loop_error", error=str(e))
                 await asyncio.sleep(1)
 
-    async def run_risk_monitoring_loop(self):
+    async def run_event_scanner_loop(self):
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        handler = self.market_data_handler
+        handler.register_dirty_callback(lambda: loop.call_soon_threadsafe(wakeup.set))
+        # The callback only fires on the empty -> non-empty edge; quotes published before it
+        # was registered (e.g. the logon snapshots) would otherwise never wake the loop.
+        if handler.dirty_rows:
+            wakeup.set()
+        batch_window_sec = self.settings.scanner.event_batch_window_ms / 1000
+
         while self.running:
             try:
-                if self.settings.risk.enabled:
-                    positions = self.risk_manager.get_positions()
-                    for symbol, position in positions.items():
-                        market_data = self.market_data_handler.get_market_data(symbol)
-                        if market_data:
-                            self.risk_manager.update_position_price(symbol, market_data.last_price)
-
-                            if self.risk_manager.check_stop_loss(symbol):
-                                logger.warning("stop_loss_triggered", symbol=symbol)
-                                self.execution_bot.place_market_order(
-                                    symbol=symbol,
-                                    side="SELL" if position.side == "BUY" else "BUY",
-                                    quantity=position.quantity,
-                                )
-                                self.risk_manager.remove_position(symbol)
-
-                            if self.risk_manager.check_take_profit(symbol):
-                                logger.info("take_profit_triggered", symbol=symbol)
-                                self.execution_bot.place_market_order(
-                                    symbol=symbol,
-                                    side="SELL" if position.side == "BUY" else "BUY",
-                                    quantity=position.quantity,
-                                )
-                                self.risk_manager.remove_position(symbol)
-
-                await asyncio.sleep(1.0)
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+                wakeup.clear()
+
+                if batch_window_sec > 0:
+                    await asyncio.sleep(batch_window_sec)
+
+                await self.run_scan_pass(dirty_only=True)
             except Exception as e:
-                logger.error("risk_monitoring_error", error=str(e))
+                logger.error("scanner_loop_error", error=str(e))
                 await asyncio.sleep(1)
 
     async def run_short_selling_loop(self):
         while self.running:
             try:
-                if self.settings.short_selling.enabled:
-                    opportunities = self.short_selling_bot.scan_short_opportunities()
-                    for opp in opportunities:
-                        logger.info("short_opportunity_detected", symbol=opp.symbol, drop_pct=opp.drop_pct)
-                        self.short_selling_bot.execute_short(opp, quantity=100)
-                await asyncio.sleep(5.0)
+                self.run_short_selling_pass()
+                await asyncio.sleep(SHORT_SCAN_INTERVAL_SEC)
             except Exception as e:
                 logger.error("short_selling_loop_error", error=str(e))
                 await asyncio.sleep(1)
 
+    def load_universe(self) -> list[str]:
+        """Configured symbols followed by those in ``subscriptions.universe_file``, deduplicated."""
+        symbols = list(self.settings.symbols)
+        universe_file = self.settings.subscriptions.universe_file
+        if universe_file:
+            symbols += (line.upper() for line in Path(universe_file).read_text().split())
+        return list(dict.fromkeys(symbols))
+
+    def refresh_universe(self):
+        """Point market data subscriptions at the symbols the bot can trade or has to manage.
+
+        Symbols with a position, an open order or a short position always stay subscribed.
+        Other symbols whose fresh quote is outside the scanner's price band can never signal,
+        so they are unsubscribed for ``recheck_ineligible_sec`` and then subscribed again to
+        look at a new quote. Volume is not used: it accumulates over the day.
+        """
+        held = set(self.risk_manager.positions)
+        held.update(order.symbol for order in self.execution_bot.open_orders.values())
+        if self.short_selling_bot is not None:
+            held.update(
+                symbol
+                for symbol, quantity in self.short_selling_bot.short_positions.items()
+                if quantity
+            )
+
+        now = time.monotonic()
+        parked = self._parked
+        for symbol in [symbol for symbol, until in parked.items() if until <= now]:
+            del parked[symbol]
+
+        # Only quotes received since the current subscribe count; a parked symbol's last
+        # price is stale until it is active again.
+        scanner_settings = self.settings.scanner
+        quotes = self.market_data_handler.quotes
+        last = quotes.last_price[: quotes.size]
+        out_of_band = np.flatnonzero(
+            (last > 0) & ((last < scanner_settings.min_price) | (last > scanner_settings.max_price))
+        )
+        active = self.subscriptions.active
+        until = now + self.settings.subscriptions.recheck_ineligible_sec
+        for row in out_of_band.tolist():
+            symbol = quotes.symbols[row]
+            if symbol in active and symbol not in held:
+                parked[symbol] = until
+
+        desired = list(held)
+        desired += (symbol for symbol in self.universe if symbol not in parked)
+        self.subscriptions.set_universe(desired)
+
+    async def run_subscription_loop(self):
+        subscriptions = self.subscriptions
+        refresh_sec = self.settings.subscriptions.refresh_sec
+        refreshed_at = float("-inf")
+        while self.running:
+            try:
+                now = time.monotonic()
+                if now - refreshed_at >= refresh_sec:
+                    self.refresh_universe()
+                    refreshed_at = now
+                if self.fix_client.is_logged_on():
+                    subscriptions.pump()
+                await asyncio.sleep(SUBSCRIPTION_PUMP_INTERVAL_SEC)
+            except Exception as e:
+                logger.error("subscription_loop_error", error=str(e))
+                await asyncio.sleep(1)
+
+    async def run_snapshot_loop(self):
+        loop = asyncio.get_running_loop()
+        state_store = self.state_store
+        while self.running:
+            await asyncio.sleep(self.settings.state.snapshot_interval_sec)
+            try:
+                # Diffing runs here, between handlers; only the SQLite write leaves the loop.
+                await loop.run_in_executor(None, state_store.write, state_store.capture())
+            except Exception as e:
+                logger.error("state_snapshot_error", error=str(e))
+
+    async def _wait_running(self, event: asyncio.Event) -> bool:
+        """Wait for ``event``; returns False if the bot stops first."""
+        while self.running:
+            try:
+                await asyncio.wait_for(event.wait(), timeout=1.0)
+                return True
+            except asyncio.TimeoutError:
+                continue
+        return False
+
+    async def reconcile(self):
+        """Request the status of every open order and wait for the replies to be applied."""
+        execution_bot = self.execution_bot
+        if not execution_bot.open_orders:
+            return
+        execution_bot.reconcile_open_orders()
+        try:
+            await asyncio.wait_for(execution_bot.reconciled.wait(), timeout=RECONCILE_TIMEOUT_SEC)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "open_orders_reconcile_timeout", unanswered=len(execution_bot.reconciling)
+            )
+
+    async def run_session_watch(self):
+        """Hold order flow while the FIX session is down and reconcile once it is back."""
+        fix_application = self.fix_application
+        while await self._wait_running(fix_application.logged_out_event):
+            self.ready.clear()
+            logger.warning("fix_connection_lost")
+            # The counterparty drops market data subscriptions with the session.
+            if self.subscriptions is not None:
+                self.subscriptions.reset()
+            if not await self._wait_running(fix_application.logged_on_event):
+                return
+            logger.info("fix_connection_restored")
+            # Reports sent while the session was down are not guaranteed to be replayed.
+            await self.reconcile()
+            if self.fix_client.is_logged_on():
+                self.ready.set()
+
     async def run(self):
         self.running = True
 
         logger.info("das_trader_bot_starting")
 
         try:
+            # Restore positions, orders and scanner baselines before the first quote arrives.
+            if self.settings.state.enabled:
+                from src.services.state_store import StateStore
+
+                self.state_store = StateStore(
+                    self.settings.state.path,
+                    self.risk_manager,
+                    self.execution_bot,
+                    self.short_selling_bot,
+                    self.scanner_bot,
+                )
+                self.state_store.load()
+
+            # Quotes and execution reports are decoded on the QuickFIX thread but applied on
+            # this loop. Quotes are conflated per symbol; reports are applied in arrival order.
+            loop = asyncio.get_running_loop()
+            self.market_data_bridge = MarketDataBridge(self.market_data_handler, loop)
+            self.market_data_handler.sink = self.market_data_bridge.put
+            apply_report = self.execution_bot.apply_execution_report
+            self.execution_bot.report_sink = lambda report: loop.call_soon_threadsafe(
+                apply_report, report
+            )
+
+            if self.settings.subscriptions.enabled:
+                self.subscriptions = self.fix_client.subscriptions
+                self.universe = self.load_universe()
+                self.market_data_handler.register_callback(self.subscriptions.on_market_data)
+                self.fix_application.on_market_data_reject = (
+                    self.subscriptions.on_market_data_reject
+                )
+
+            if self.tick_recorder is not None:
+                self.tick_recorder.start()
+            if self.sharded_scanner is not None:
+                self.sharded_scanner.start()
+            self.fix_application.bind_loop(loop)
+            fix_started_at = time.perf_counter()
             self.fix_client.start()
 
-            while not self.fix_client.is_logged_on():
-                await asyncio.sleep(1)
+            if not await self._wait_running(self.fix_application.logged_on_event):
+                return
 
-            logger.info("fix_connection_established")
+            # Orders restored as open may have filled or died while the bot was down.
+            await self.reconcile()
 
-            tasks = [
-                self.run_scanner_loop(),
-                self.run_risk_monitoring_loop(),
-            ]
+            ready_at = time.perf_counter()
+            self.ready.set()
+            record_startup(ready_at - self.created_at)
+            logger.info(
+                "fix_connection_established",
+                startup_ms=(ready_at - self.created_at) * 1000,
+                logon_ms=(ready_at - fix_started_at) * 1000,
+            )
+
+            # Risk exits run from on_risk_tick as quotes arrive, not from a polling loop.
+            tasks = [self.run_scanner_loop(), self.run_session_watch()]
+
+            if self.subscriptions is not None:
+                tasks.append(self.run_subscription_loop())
+
+            if self.state_store is not None:
+                tasks.append(self.run_snapshot_loop())
 
-            if self.settings.short_selling.enabled:
+            if self.short_selling_bot is not None:
                 tasks.append(self.run_short_selling_loop())
 
             await asyncio.gather(*tasks)
@@ -183,15 +543,31 @@ class DasTraderBot:
     async def cleanup(self):
         self.running = False
         self.fix_client.stop()
+        self.market_data_handler.close()
+        if self.tick_recorder is not None:
+            self.tick_recorder.close()
+        if self.sharded_scanner is not None:
+            self.sharded_scanner.stop()
+        if self.state_store is not None:
+            try:
+                self.state_store.save()
+            except Exception as e:
+                logger.error("state_snapshot_error", error=str(e))
+            self.state_store.close()
         logger.info("das_trader_bot_shutdown_complete")
 
 
 async def bootstrap(settings: Settings):
     load_dotenv()
-    configure_logging(settings.log_level)
-    start_metrics_server(settings.metrics_host, settings.metrics_port)
-
+    configure_logging(
+        settings.log_level,
+        async_sink=settings.log_async,
+        sample_every=settings.log_sample_every,
+    )
     bot = DasTraderBot(settings)
+    if settings.metrics_enabled:
+        start_metrics_server(settings.metrics_host, settings.metrics_port)
+        bind_risk_metrics(bot.risk_manager)
 
     loop = asyncio.get_event_loop()
     stop_event = asyncio.Event()
@@ -220,4 +596,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
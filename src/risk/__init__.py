@@ -1,4 +1,4 @@
+from src.risk.pre_trade import BasketExposure, PreTradeCheck, RejectReason
 from src.risk.risk_manager import Position, RiskManager
 
-__all__ = ["RiskManager", "Position"]
-
+__all__ = ["RiskManager", "Position", "BasketExposure", "PreTradeCheck", "RejectReason"]
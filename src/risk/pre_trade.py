@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from src.config import RiskSettings
+from src.das_trader.market_data import MarketDataHandler
+from src.execution.execution_bot import ExecutionBot
+from src.risk.risk_manager import RiskManager
+
+
+class RejectReason(IntEnum):
+    OK = 0
+    FAT_FINGER = 1
+    DAILY_LOSS = 2
+    OPEN_POSITIONS = 3
+    PRICE_COLLAR = 4
+    SYMBOL_NOTIONAL = 5
+    GROSS_EXPOSURE = 6
+
+
+@dataclass(slots=True)
+class BasketExposure:
+    """Legs accepted earlier in a basket, which positions and open orders don't show yet."""
+
+    new_positions: int = 0
+    notional: float = 0.0
+    notional_by_symbol: dict[str, float] = field(default_factory=dict)
+
+    def add(self, symbol: str, quantity: int, price: float, new_position: bool):
+        notional = quantity * price
+        if new_position and symbol not in self.notional_by_symbol:
+            self.new_positions += 1
+        self.notional += notional
+        self.notional_by_symbol[symbol] = self.notional_by_symbol.get(symbol, 0.0) + notional
+
+
+class PreTradeCheck:
+    """Pre-trade limits evaluated in a handful of float comparisons per order.
+
+    Limits are copied out of RiskSettings once, and every input is a running total: position
+    notional and gross exposure from RiskManager, open-order exposure and counts from
+    ExecutionBot, the inside quote from the quote store. A symbol with a working order counts
+    as an open position before it fills, and prices are collared against the side of the
+    quote the order would trade against (the last trade when that side is empty). ``check``
+    returns a RejectReason code without building any text; ``explain`` formats the reason only
+    when a caller logs a rejection.
+
+    Orders checked together and sent as one batch pass a BasketExposure holding the legs
+    already accepted, so the batch as a whole stays within the position and exposure limits.
+    """
+
+    def __init__(
+        self,
+        settings: RiskSettings,
+        risk_manager: RiskManager,
+        execution_bot: ExecutionBot,
+        market_data_handler: MarketDataHandler,
+    ):
+        self.settings = settings
+        self.risk_manager = risk_manager
+        self.execution_bot = execution_bot
+        self.quotes = market_data_handler.quotes
+        self.max_symbol_notional = settings.max_position_size_usd
+        self.max_gross_exposure = settings.max_gross_exposure_usd
+        self.max_open_positions = settings.max_open_positions
+        self.collar = settings.price_collar_pct / 100
+        self.fat_finger_shares = settings.fat_finger_shares
+
+    def check(
+        self,
+        symbol: str,
+        side: str,
+        quantity: int,
+        price: float,
+        basket: BasketExposure | None = None,
+    ) -> RejectReason:
+        if quantity <= 0 or quantity > self.fat_finger_shares:
+            return RejectReason.FAT_FINGER
+
+        risk_manager = self.risk_manager
+        if risk_manager.daily_loss_limit_reached:
+            return RejectReason.DAILY_LOSS
+
+        basket_positions = 0
+        basket_notional = 0.0
+        basket_symbol_notional = 0.0
+        if basket is not None:
+            basket_positions = basket.new_positions
+            basket_notional = basket.notional
+            basket_symbol_notional = basket.notional_by_symbol.get(symbol, 0.0)
+
+        positions = risk_manager.positions
+        working = self.execution_bot.open_orders_by_symbol
+        if (
+            symbol not in positions
+            and symbol not in working
+            and not basket_symbol_notional
+        ):
+            held = len(positions) + basket_positions
+            # Only look at which working orders belong to unheld symbols near the limit.
+            if held + len(working) >= self.max_open_positions:
+                held += sum(1 for other in working if other not in positions)
+                if held >= self.max_open_positions:
+                    return RejectReason.OPEN_POSITIONS
+
+        reference = self._collar_reference(symbol, side)
+        if reference > 0 and abs(price - reference) > reference * self.collar:
+            return RejectReason.PRICE_COLLAR
+
+        # Signed notionals, so an order that reduces a position lowers its exposure.
+        position_notional = risk_manager.symbol_notional.get(symbol, 0.0)
+        order_notional = quantity * price if side == "BUY" else -quantity * price
+        resulting = abs(position_notional + order_notional)
+        execution_bot = self.execution_bot
+        if (
+            resulting
+            + execution_bot.open_exposure_by_symbol.get(symbol, 0.0)
+            + basket_symbol_notional
+            > self.max_symbol_notional
+        ):
+            return RejectReason.SYMBOL_NOTIONAL
+
+        gross = risk_manager.gross_exposure - abs(position_notional) + resulting
+        if gross + execution_bot.open_exposure + basket_notional > self.max_gross_exposure:
+            return RejectReason.GROSS_EXPOSURE
+
+        return RejectReason.OK
+
+    def _collar_reference(self, symbol: str, side: str) -> float:
+        quotes = self.quotes
+        row = quotes.index.get(symbol)
+        if row is None:
+            return 0.0
+        reference = quotes.ask_price[row] if side == "BUY" else quotes.bid_price[row]
+        if reference > 0:
+            return float(reference)
+        return float(quotes.last_price[row])
+
+    def explain(
+        self, reason: RejectReason, symbol: str, side: str, quantity: int, price: float
+    ) -> str:
+        if reason is RejectReason.FAT_FINGER:
+            return f"Order size {quantity} outside 1..{self.fat_finger_shares} shares"
+        if reason is RejectReason.DAILY_LOSS:
+            return "Daily loss limit reached"
+        if reason is RejectReason.OPEN_POSITIONS:
+            return f"Maximum open positions {self.max_open_positions} reached"
+        if reason is RejectReason.PRICE_COLLAR:
+            return (
+                f"Price {price:.4f} more than {self.settings.price_collar_pct:.2f}% from "
+                f"{'ask' if side == 'BUY' else 'bid'} {self._collar_reference(symbol, side):.4f}"
+            )
+        if reason is RejectReason.SYMBOL_NOTIONAL:
+            return (
+                f"{symbol} notional with open orders would exceed "
+                f"${self.max_symbol_notional:,.2f}"
+            )
+        if reason is RejectReason.GROSS_EXPOSURE:
+            return f"Gross exposure would exceed ${self.max_gross_exposure:,.2f}"
+        return "OK"
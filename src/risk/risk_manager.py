@@ -1,17 +1,17 @@
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
-from typing import Any
+from typing import Iterable
 
 import structlog
 
 from src.config import RiskSettings
-from src.execution.execution_bot import Order
 
 logger = structlog.get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     symbol: str
     side: str
@@ -28,9 +28,23 @@ class RiskManager:
     def __init__(self, settings: RiskSettings):
         self.settings = settings
         self.positions: dict[str, Position] = {}
-        self.daily_pnl: float = 0.0
+        # (lower, upper) exit trigger prices per open position: a tick at or below lower or at
+        # or above upper hits the stop or take-profit. Kept in step with every level change.
+        self.triggers: dict[str, tuple[float, float]] = {}
+        # Portfolio totals, maintained from per-symbol deltas by _sync() so reading them is O(1).
+        self.realized_pnl = 0.0
+        self.unrealized_pnl = 0.0
+        self.gross_exposure = 0.0
+        self.net_exposure = 0.0
+        self.symbol_unrealized: dict[str, float] = {}
+        # Signed notional (quantity x mark, negative when short) per open position.
+        self.symbol_notional: dict[str, float] = {}
         self.daily_loss_limit_reached = False
 
+    @property
+    def daily_pnl(self) -> float:
+        return self.realized_pnl + self.unrealized_pnl
+
     def validate_order(self, symbol: str, side: str, quantity: int, price: float) -> tuple[bool, str]:
         position_value = quantity * price
 
@@ -46,39 +60,9 @@ class RiskManager:
         return (True, "OK")
 
     def add_position(self, symbol: str, side: str, quantity: int, entry_price: float):
-        if symbol in self.positions:
-            existing = self.positions[symbol]
-            if existing.side == side:
-                total_quantity = existing.quantity + quantity
-                avg_price = ((existing.quantity * existing.entry_price) + (quantity * entry_price)) / total_quantity
-                self.positions[symbol] = Position(
-                    symbol=symbol,
-                    side=side,
-                    quantity=total_quantity,
-                    entry_price=avg_price,
-                    current_price=entry_price,
-                    unrealized_pnl=0.0,
-                    stop_loss_price=self._calculate_stop_loss(avg_price, side),
-                    take_profit_price=self._calculate_take_profit(avg_price, side),
-                    trailing_stop_price=self._calculate_trailing_stop(avg_price, side),
-                )
-            else:
-                if quantity >= existing.quantity:
-                    self.positions[symbol] = Position(
-                        symbol=symbol,
-                        side=side,
-                        quantity=quantity - existing.quantity,
-                        entry_price=entry_price,
-                        current_price=entry_price,
-                        unrealized_pnl=0.0,
-                        stop_loss_price=self._calculate_stop_loss(entry_price, side),
-                        take_profit_price=self._calculate_take_profit(entry_price, side),
-                        trailing_stop_price=self._calculate_trailing_stop(entry_price, side),
-                    )
-                else:
-                    self.positions[symbol].quantity -= quantity
-        else:
-            self.positions[symbol] = Position(
+        position = self.positions.get(symbol)
+        if position is None:
+            position = self.positions[symbol] = Position(
                 symbol=symbol,
                 side=side,
                 quantity=quantity,
@@ -89,25 +73,158 @@ class RiskManager:
                 take_profit_price=self._calculate_take_profit(entry_price, side),
                 trailing_stop_price=self._calculate_trailing_stop(entry_price, side),
             )
+        elif position.side == side:
+            total_quantity = position.quantity + quantity
+            avg_price = (
+                (position.quantity * position.entry_price) + (quantity * entry_price)
+            ) / total_quantity
+            self._reset_position(position, side, total_quantity, avg_price, entry_price)
+        elif quantity >= position.quantity:
+            self._reset_position(
+                position, side, quantity - position.quantity, entry_price, entry_price
+            )
+        else:
+            position.quantity -= quantity
 
+        self._index_triggers(position)
+        self._sync(symbol)
         logger.info("position_added", symbol=symbol, side=side, quantity=quantity, entry_price=entry_price)
 
+    def restore(
+        self,
+        positions: Iterable[Position],
+        realized_pnl: float = 0.0,
+        daily_loss_limit_reached: bool = False,
+    ):
+        """Load positions and the day's realized P&L into an empty book, e.g. from a snapshot."""
+        self.realized_pnl = realized_pnl
+        self.daily_loss_limit_reached = daily_loss_limit_reached
+        for position in positions:
+            self.positions[position.symbol] = position
+            self._index_triggers(position)
+            self._sync(position.symbol)
+        self._check_daily_loss_limit()
+
+    def _reset_position(
+        self, position: Position, side: str, quantity: int, entry_price: float, mark: float
+    ):
+        """Re-base ``position`` in place on a new side, size and entry price."""
+        position.side = side
+        position.quantity = quantity
+        position.entry_price = entry_price
+        position.current_price = mark
+        position.unrealized_pnl = 0.0
+        position.stop_loss_price = self._calculate_stop_loss(entry_price, side)
+        position.take_profit_price = self._calculate_take_profit(entry_price, side)
+        position.trailing_stop_price = self._calculate_trailing_stop(entry_price, side)
+
+    def apply_fill(self, symbol: str, side: str, quantity: int, price: float):
+        """Apply an execution to the position book, realizing P&L on any reduced quantity."""
+        existing = self.positions.get(symbol)
+        if existing is None or existing.side == side:
+            self.add_position(symbol, side, quantity, price)
+            return
+
+        closed_quantity = min(quantity, existing.quantity)
+        if existing.side == "BUY":
+            realized_pnl = (price - existing.entry_price) * closed_quantity
+        else:
+            realized_pnl = (existing.entry_price - price) * closed_quantity
+        self.realized_pnl += realized_pnl
+
+        if quantity < existing.quantity:
+            existing.quantity -= quantity
+            self._sync(symbol)
+        else:
+            del self.positions[symbol]
+            del self.triggers[symbol]
+            self._sync(symbol)
+            if quantity > closed_quantity:
+                self.add_position(symbol, side, quantity - closed_quantity, price)
+
+        logger.info(
+            "position_reduced",
+            symbol=symbol,
+            side=side,
+            quantity=closed_quantity,
+            price=price,
+            realized_pnl=realized_pnl,
+        )
+        self._check_daily_loss_limit()
+
     def update_position_price(self, symbol: str, current_price: float):
         if symbol not in self.positions:
             return
 
         position = self.positions[symbol]
         position.current_price = current_price
+        self._sync(symbol)
+        self._update_trailing_stop(position)
+        self._check_daily_loss_limit()
 
-        if position.side == "BUY":
-            position.unrealized_pnl = (current_price - position.entry_price) * position.quantity
-        else:
-            position.unrealized_pnl = (position.entry_price - current_price) * position.quantity
+    def on_price(self, symbol: str, price: float) -> str | None:
+        """Mark a position to ``price``; returns "STOP_LOSS" or "TAKE_PROFIT" if an exit is hit.
 
-        self._update_trailing_stop(position)
+        O(1) per tick: symbols without an open position cost one dict lookup.
+        """
+        trigger = self.triggers.get(symbol)
+        if trigger is None or price <= 0:
+            return None
 
-        self.daily_pnl += position.unrealized_pnl - (position.unrealized_pnl - position.unrealized_pnl)
+        position = self.positions[symbol]
+        position.current_price = price
+        self._sync(symbol)
+        if self._update_trailing_stop(position):
+            trigger = self.triggers[symbol]
+        self._check_daily_loss_limit()
+
+        lower, upper = trigger
+        if price <= lower:
+            return "STOP_LOSS" if position.side == "BUY" else "TAKE_PROFIT"
+        if price >= upper:
+            return "TAKE_PROFIT" if position.side == "BUY" else "STOP_LOSS"
+        return None
+
+    def _index_triggers(self, position: Position):
+        stop = position.stop_loss_price or None
+        target = position.take_profit_price or None
+        if position.side == "BUY":
+            lower = stop if stop is not None else -math.inf
+            upper = target if target is not None else math.inf
+        else:
+            lower = target if target is not None else -math.inf
+            upper = stop if stop is not None else math.inf
+        self.triggers[position.symbol] = (lower, upper)
+
+    def _sync(self, symbol: str):
+        """Re-mark ``symbol`` and apply only its change to the portfolio totals."""
+        position = self.positions.get(symbol)
+        old_unrealized = self.symbol_unrealized.pop(symbol, 0.0)
+        old_notional = self.symbol_notional.pop(symbol, 0.0)
+        if position is None:
+            unrealized = notional = 0.0
+        else:
+            notional = position.quantity * position.current_price
+            if position.side == "BUY":
+                unrealized = (position.current_price - position.entry_price) * position.quantity
+            else:
+                unrealized = (position.entry_price - position.current_price) * position.quantity
+                notional = -notional
+            position.unrealized_pnl = unrealized
+            self.symbol_unrealized[symbol] = unrealized
+            self.symbol_notional[symbol] = notional
+
+        if self.positions:
+            self.unrealized_pnl += unrealized - old_unrealized
+            self.gross_exposure += abs(notional) - abs(old_notional)
+            self.net_exposure += notional - old_notional
+        else:
+            # Flat book: reset exactly so floating-point drift doesn't accumulate across the day.
+            self.unrealized_pnl = self.gross_exposure = self.net_exposure = 0.0
 
+    def _check_daily_loss_limit(self):
+        if self.daily_loss_limit_reached:
+            return
         if self.daily_pnl <= -self.settings.max_daily_loss_usd:
             self.daily_loss_limit_reached = True
             logger.warning("daily_loss_limit_reached", daily_pnl=self.daily_pnl, limit=self.settings.max_daily_loss_usd)
@@ -143,8 +260,10 @@ class RiskManager:
     def remove_position(self, symbol: str):
         if symbol in self.positions:
             position = self.positions[symbol]
-            self.daily_pnl += position.unrealized_pnl
+            self.realized_pnl += position.unrealized_pnl
             del self.positions[symbol]
+            del self.triggers[symbol]
+            self._sync(symbol)
             logger.info("position_removed", symbol=symbol, final_pnl=position.unrealized_pnl)
 
     def _calculate_stop_loss(self, entry_price: float, side: str) -> float:
@@ -165,20 +284,24 @@ class RiskManager:
         else:
             return entry_price * (1 + self.settings.trailing_stop_pct / 100)
 
-    def _update_trailing_stop(self, position: Position):
+    def _update_trailing_stop(self, position: Position) -> bool:
+        """Ratchet the trailing stop toward the price; returns True if the stop moved."""
         if not position.trailing_stop_price:
-            return
+            return False
 
         if position.side == "BUY":
             new_trailing = position.current_price * (1 - self.settings.trailing_stop_pct / 100)
-            if new_trailing > position.trailing_stop_price:
-                position.trailing_stop_price = new_trailing
-                position.stop_loss_price = new_trailing
+            if new_trailing <= position.trailing_stop_price:
+                return False
         else:
             new_trailing = position.current_price * (1 + self.settings.trailing_stop_pct / 100)
-            if new_trailing < position.trailing_stop_price:
-                position.trailing_stop_price = new_trailing
-                position.stop_loss_price = new_trailing
+            if new_trailing >= position.trailing_stop_price:
+                return False
+
+        position.trailing_stop_price = new_trailing
+        position.stop_loss_price = new_trailing
+        self._index_triggers(position)
+        return True
 
     def get_positions(self) -> dict[str, Position]:
         return self.positions.copy()
@@ -186,3 +309,5 @@ class RiskManager:
     def get_daily_pnl(self) -> float:
         return self.daily_pnl
 
+    def get_symbol_notional(self, symbol: str) -> float:
+        return self.symbol_notional.get(symbol, 0.0)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from array import array
+from collections import deque
+
+import numpy as np
+
+from src.das_trader.market_data import MarketData
+from src.das_trader.quote_store import QuoteStore, resize_column
+
+
+class RollingWindow:
+    """Fixed-size ring buffer of prices and volumes with O(1) rolling statistics.
+
+    High/low come from monotonic deques of (tick index, price); volume mean and variance use a
+    sliding Welford update. Every push costs amortized O(1) regardless of the window length.
+    """
+
+    __slots__ = ("size", "prices", "volumes", "count", "_max", "_min", "_volume_mean", "_volume_m2")
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError(f"Rolling window size must be positive, got {size}")
+        self.size = size
+        self.prices = array("d", bytes(8 * size))
+        self.volumes = array("d", bytes(8 * size))
+        self.count = 0
+        self._max: deque[tuple[int, float]] = deque()
+        self._min: deque[tuple[int, float]] = deque()
+        self._volume_mean = 0.0
+        self._volume_m2 = 0.0
+
+    def __len__(self) -> int:
+        return min(self.count, self.size)
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.size
+
+    @property
+    def high(self) -> float:
+        return self._max[0][1] if self._max else 0.0
+
+    @property
+    def low(self) -> float:
+        return self._min[0][1] if self._min else 0.0
+
+    @property
+    def volume_mean(self) -> float:
+        return self._volume_mean
+
+    @property
+    def volume_variance(self) -> float:
+        n = len(self)
+        return self._volume_m2 / n if n else 0.0
+
+    def push(self, price: float, volume: float):
+        index = self.count
+        size = self.size
+        slot = index % size
+        expired = index - size
+
+        max_deque = self._max
+        if max_deque and max_deque[0][0] <= expired:
+            max_deque.popleft()
+        while max_deque and max_deque[-1][1] <= price:
+            max_deque.pop()
+        max_deque.append((index, price))
+
+        min_deque = self._min
+        if min_deque and min_deque[0][0] <= expired:
+            min_deque.popleft()
+        while min_deque and min_deque[-1][1] >= price:
+            min_deque.pop()
+        min_deque.append((index, price))
+
+        mean = self._volume_mean
+        if expired < 0:
+            delta = volume - mean
+            mean += delta / (index + 1)
+            self._volume_m2 += delta * (volume - mean)
+        else:
+            old_volume = self.volumes[slot]
+            new_mean = mean + (volume - old_volume) / size
+            m2 = self._volume_m2 + (volume - old_volume) * (volume - new_mean + old_volume - mean)
+            self._volume_m2 = max(0.0, m2)
+            mean = new_mean
+        self._volume_mean = mean
+
+        self.prices[slot] = price
+        self.volumes[slot] = volume
+        self.count = index + 1
+
+
+class RollingStats:
+    """Per-symbol rolling windows fed tick by tick, exposed as quote-store-row-aligned columns.
+
+    Register ``on_market_data`` as a MarketDataHandler callback. Only trades are pushed: an
+    update counts as one when its last price, last size or cumulative volume changed, and
+    bid/ask-only updates and quotes before the first trade (last price 0) are skipped. Before
+    each trade is pushed, the statistics of the preceding window are copied into the
+    ``prior_*`` columns so a scanner can test whether the latest price crossed the N-bar
+    high/low without the tick masking itself.
+    """
+
+    def __init__(self, window: int, quotes: QuoteStore):
+        self.window = window
+        self.quotes = quotes
+        self.windows: dict[int, RollingWindow] = {}
+        self.prior_high = np.zeros(0, dtype=np.float64)
+        self.prior_low = np.zeros(0, dtype=np.float64)
+        self.prior_volume_mean = np.zeros(0, dtype=np.float64)
+        self.prior_volume_std = np.zeros(0, dtype=np.float64)
+        self.tick_volume = np.zeros(0, dtype=np.float64)
+        self.samples = np.zeros(0, dtype=np.int64)
+        # (last price, last size, cumulative volume) of the last trade pushed, per row.
+        self._last_trade: dict[int, tuple[float, int, int]] = {}
+
+    def on_market_data(self, market_data: MarketData):
+        last_price = market_data.last_price
+        if last_price <= 0:
+            return
+        row = self.quotes.get_row(market_data.symbol)
+        if row is None:
+            return
+        volume = market_data.volume
+        trade = (last_price, market_data.last_size, volume)
+        previous = self._last_trade.get(row)
+        if trade == previous:
+            return
+        self._last_trade[row] = trade
+        if row >= len(self.samples):
+            self.ensure_capacity()
+
+        window = self.windows.get(row)
+        if window is None:
+            window = self.windows[row] = RollingWindow(self.window)
+
+        # Feeds report cumulative session volume; the window tracks per-trade volume.
+        if previous is None:
+            tick_volume = 0
+        elif volume >= previous[2]:
+            tick_volume = volume - previous[2]
+        else:
+            tick_volume = volume
+
+        self.prior_high[row] = window.high
+        self.prior_low[row] = window.low
+        self.prior_volume_mean[row] = window.volume_mean
+        self.prior_volume_std[row] = window.volume_variance**0.5
+        self.tick_volume[row] = tick_volume
+
+        window.push(last_price, tick_volume)
+        self.samples[row] = window.count
+
+    def get_window(self, symbol: str) -> RollingWindow | None:
+        row = self.quotes.get_row(symbol)
+        return self.windows.get(row) if row is not None else None
+
+    def ensure_capacity(self):
+        capacity = self.quotes.capacity
+        if len(self.samples) >= capacity:
+            return
+        self.prior_high = resize_column(self.prior_high, capacity)
+        self.prior_low = resize_column(self.prior_low, capacity)
+        self.prior_volume_mean = resize_column(self.prior_volume_mean, capacity)
+        self.prior_volume_std = resize_column(self.prior_volume_std, capacity)
+        self.tick_volume = resize_column(self.tick_volume, capacity)
+        self.samples = resize_column(self.samples, capacity)
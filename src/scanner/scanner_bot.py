@@ -1,17 +1,22 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
-from typing import Any, Callable
+from typing import Callable, Iterable
 
+import numpy as np
 import structlog
 
 from src.config import ScannerSettings
-from src.das_trader.market_data import MarketData, MarketDataHandler
+from src.das_trader.market_data import MarketDataHandler
+from src.das_trader.quote_store import resize_column
+from src.scanner.rolling import RollingStats
+from src.services.metrics import record_stage_latency
 
 logger = structlog.get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanResult:
     symbol: str
     signal_type: str
@@ -19,72 +24,225 @@ class ScanResult:
     price: float
     volume: int
     change_pct: float
+    # perf_counter_ns() stamps of the triggering quote (see MarketData) and of the scan that
+    # raised the signal.
+    recv_ns: int = 0
+    decoded_ns: int = 0
+    signal_ns: int = 0
+
+
+def valid_mask(settings: ScannerSettings, last: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    return (
+        (last >= settings.min_price)
+        & (last <= settings.max_price)
+        & (volume >= settings.min_volume)
+    )
+
+
+def tick_signals(
+    settings: ScannerSettings,
+    last: np.ndarray,
+    volume: np.ndarray,
+    previous_last: np.ndarray,
+    previous_volume: np.ndarray,
+    candidates: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Breakout and volume spike masks of ``candidates`` against their previous scan."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_pct = np.where(previous_last > 0, (last - previous_last) / previous_last * 100, 0.0)
+        volume_ratio = np.where(previous_volume > 0, volume / previous_volume, 1.0)
+
+    breakout = candidates & (np.abs(change_pct) >= settings.price_breakout_threshold_pct)
+    spike = candidates & ~breakout & (volume_ratio >= settings.volume_spike_threshold)
+    return breakout, spike, change_pct, volume_ratio
 
 
 class ScannerBot:
     def __init__(self, settings: ScannerSettings, market_data_handler: MarketDataHandler):
         self.settings = settings
         self.market_data_handler = market_data_handler
-        self.previous_data: dict[str, MarketData] = {}
+        # Last scanned price/volume per quote-store row.
+        self.previous_last = np.zeros(0, dtype=np.float64)
+        self.previous_volume = np.zeros(0, dtype=np.int64)
+        self.has_previous = np.zeros(0, dtype=bool)
         self.callbacks: list[Callable[[ScanResult], None]] = []
 
+        self.rolling: RollingStats | None = None
+        if settings.rolling_window > 0:
+            self.rolling = RollingStats(settings.rolling_window, market_data_handler.quotes)
+            market_data_handler.register_callback(self.rolling.on_market_data)
+        # Rolling sample count per row at the last scan, so a tick is only evaluated once.
+        self.scanned_samples = np.zeros(0, dtype=np.int64)
+
     def register_callback(self, callback: Callable[[ScanResult], None]):
         self.callbacks.append(callback)
 
     def scan(self) -> list[ScanResult]:
-        results = []
-        current_data = self.market_data_handler.market_data
-
-        for symbol, current in current_data.items():
-            if not self._is_valid_symbol(current):
-                continue
-
-            previous = self.previous_data.get(symbol)
-
-            if previous:
-                result = self._analyze_symbol(symbol, previous, current)
-                if result:
-                    results.append(result)
-                    for callback in self.callbacks:
-                        callback(result)
-
-            self.previous_data[symbol] = current
+        n = self.market_data_handler.quotes.size
+        self._ensure_capacity(n)
+        return self._scan_rows(np.arange(n))
+
+    def scan_dirty(self) -> list[ScanResult]:
+        """Scan only the symbols that ticked since the previous call."""
+        return self.scan_rows(self.market_data_handler.take_dirty_rows())
+
+    def scan_rows(self, rows: Iterable[int]) -> list[ScanResult]:
+        row_ids = np.fromiter(rows, dtype=np.intp)
+        if not len(row_ids):
+            return []
+        row_ids.sort()
+        self._ensure_capacity(self.market_data_handler.quotes.size)
+        return self._scan_rows(row_ids)
+
+    def restore_previous(self, previous: Iterable[tuple[str, float, int]]):
+        """Seed the previous-scan (symbol, last price, volume), e.g. from a state snapshot."""
+        quotes = self.market_data_handler.quotes
+        previous = list(previous)
+        if not previous:
+            return
+        rows = np.fromiter((quotes.row(symbol) for symbol, _, _ in previous), dtype=np.intp)
+        self._ensure_capacity(quotes.size)
+        self.previous_last[rows] = [last for _, last, _ in previous]
+        self.previous_volume[rows] = [volume for _, _, volume in previous]
+        self.has_previous[rows] = True
+
+    def _scan_rows(self, row_ids: np.ndarray) -> list[ScanResult]:
+        quotes = self.market_data_handler.quotes
+        last = quotes.last_price[row_ids]
+        volume = quotes.volume[row_ids]
+        valid = self._valid_mask(last, volume)
+
+        if self.rolling is not None:
+            breakout, spike, change_pct, volume_ratio = self._rolling_signals(row_ids, last, valid)
+        else:
+            breakout, spike, change_pct, volume_ratio = self._tick_signals(
+                row_ids, last, volume, valid
+            )
 
+        results = []
+        hits = np.flatnonzero(breakout | spike)
+        if len(hits):
+            signal_ns = time.perf_counter_ns()
+            hit_rows = row_ids[hits]
+            recv_ns = quotes.recv_ns[hit_rows].tolist()
+            decoded_ns = quotes.decoded_ns[hit_rows].tolist()
+        for i, k in enumerate(hits):
+            result = self._build_result(
+                quotes.symbols[row_ids[k]],
+                bool(breakout[k]),
+                float(change_pct[k]),
+                float(volume_ratio[k]),
+                float(last[k]),
+                int(volume[k]),
+            )
+            result.recv_ns = recv_ns[i]
+            result.decoded_ns = decoded_ns[i]
+            result.signal_ns = signal_ns
+            record_stage_latency("signal", result.decoded_ns, signal_ns)
+            results.append(result)
+            for callback in self.callbacks:
+                callback(result)
+
+        self.record_previous(row_ids, last, volume, valid)
         return results
 
-    def _is_valid_symbol(self, data: MarketData) -> bool:
-        if data.last_price < self.settings.min_price or data.last_price > self.settings.max_price:
-            return False
-        if data.volume < self.settings.min_volume:
-            return False
-        return True
-
-    def _analyze_symbol(self, symbol: str, previous: MarketData, current: MarketData) -> ScanResult | None:
-        change_pct = ((current.last_price - previous.last_price) / previous.last_price) * 100
-
-        volume_ratio = current.volume / previous.volume if previous.volume > 0 else 1.0
-
-        if abs(change_pct) >= self.settings.price_breakout_threshold_pct:
-            signal_type = "BREAKOUT_UP" if change_pct > 0 else "BREAKOUT_DOWN"
-            return ScanResult(
-                symbol=symbol,
-                signal_type=signal_type,
-                reason=f"Price breakout: {change_pct:.2f}%",
-                price=current.last_price,
-                volume=current.volume,
-                change_pct=change_pct,
+    def record_previous(
+        self, row_ids: np.ndarray, last: np.ndarray, volume: np.ndarray, valid: np.ndarray
+    ):
+        """Make the scanned price/volume of the ``valid`` rows the next scan's baseline."""
+        valid_rows = row_ids[valid]
+        self.previous_last[valid_rows] = last[valid]
+        self.previous_volume[valid_rows] = volume[valid]
+        self.has_previous[valid_rows] = True
+
+    def _tick_signals(
+        self, row_ids: np.ndarray, last: np.ndarray, volume: np.ndarray, valid: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Compare each symbol with its price/volume at the previous scan."""
+        return tick_signals(
+            self.settings,
+            last,
+            volume,
+            self.previous_last[row_ids],
+            self.previous_volume[row_ids],
+            valid & self.has_previous[row_ids],
+        )
+
+    def _rolling_signals(
+        self, row_ids: np.ndarray, last: np.ndarray, valid: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Compare each symbol's latest tick with the N ticks that preceded it."""
+        rolling = self.rolling
+        samples = rolling.samples[row_ids]
+        high = rolling.prior_high[row_ids]
+        low = rolling.prior_low[row_ids]
+        volume_mean = rolling.prior_volume_mean[row_ids]
+        tick_volume = rolling.tick_volume[row_ids]
+
+        fresh = samples != self.scanned_samples[row_ids]
+        self.scanned_samples[row_ids] = samples
+        candidates = valid & fresh & (samples > rolling.window)
+
+        margin = self.settings.rolling_breakout_margin_pct / 100
+        up = candidates & (last > high * (1 + margin))
+        down = candidates & ~up & (last < low * (1 - margin))
+        breakout = up | down
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change_pct = np.where(
+                up & (high > 0),
+                (last - high) / high * 100,
+                np.where(down & (low > 0), (last - low) / low * 100, 0.0),
             )
-
-        if volume_ratio >= self.settings.volume_spike_threshold:
-            signal_type = "VOLUME_SPIKE"
+            volume_ratio = np.where(volume_mean > 0, tick_volume / volume_mean, 1.0)
+
+        spike = candidates & ~breakout & (volume_ratio >= self.settings.volume_spike_threshold)
+        return breakout, spike, change_pct, volume_ratio
+
+    def _ensure_capacity(self, size: int):
+        if len(self.previous_last) < size:
+            capacity = self.market_data_handler.quotes.capacity
+            self.previous_last = resize_column(self.previous_last, capacity)
+            self.previous_volume = resize_column(self.previous_volume, capacity)
+            self.has_previous = resize_column(self.has_previous, capacity, False)
+            self.scanned_samples = resize_column(self.scanned_samples, capacity)
+        if self.rolling is not None:
+            self.rolling.ensure_capacity()
+
+    def _valid_mask(self, last: np.ndarray, volume: np.ndarray) -> np.ndarray:
+        return valid_mask(self.settings, last, volume)
+
+    def _build_result(
+        self,
+        symbol: str,
+        is_breakout: bool,
+        change_pct: float,
+        volume_ratio: float,
+        price: float,
+        volume: int,
+    ) -> ScanResult:
+        if is_breakout:
+            reason = f"Price breakout: {change_pct:.2f}%"
+            if self.rolling is not None:
+                level = "high" if change_pct > 0 else "low"
+                reason += f" past {self.rolling.window}-bar {level}"
             return ScanResult(
                 symbol=symbol,
-                signal_type=signal_type,
-                reason=f"Volume spike: {volume_ratio:.2f}x",
-                price=current.last_price,
-                volume=current.volume,
+                signal_type="BREAKOUT_UP" if change_pct > 0 else "BREAKOUT_DOWN",
+                reason=reason,
+                price=price,
+                volume=volume,
                 change_pct=change_pct,
             )
 
-        return None
-
+        reason = f"Volume spike: {volume_ratio:.2f}x"
+        if self.rolling is not None:
+            reason += f" {self.rolling.window}-bar mean"
+        return ScanResult(
+            symbol=symbol,
+            signal_type="VOLUME_SPIKE",
+            reason=reason,
+            price=price,
+            volume=volume,
+            change_pct=change_pct,
+        )
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import time
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import structlog
+
+from src.config import ScannerSettings
+from src.das_trader.quote_store import resize_column
+from src.scanner.scanner_bot import ScannerBot, ScanResult, tick_signals, valid_mask
+from src.services.metrics import record_stage_latency
+
+logger = structlog.get_logger(__name__)
+
+# Shared block layout: last_price (float64) for ``capacity`` rows, then volume (int64).
+ROW_BYTES = 16
+# A worker that hasn't replied to a scan by then is treated as failed.
+SCAN_REPLY_TIMEOUT_SEC = 10.0
+
+
+def _attach(name: str, capacity: int) -> tuple[SharedMemory, np.ndarray, np.ndarray]:
+    shm = SharedMemory(name=name)
+    last = np.ndarray(capacity, dtype=np.float64, buffer=shm.buf)
+    volume = np.ndarray(capacity, dtype=np.int64, buffer=shm.buf, offset=capacity * 8)
+    return shm, last, volume
+
+
+def _shard_worker(shard: int, shards: int, settings: ScannerSettings, conn: Connection):
+    """Scan rows ``shard, shard + shards, ...`` of the shared quotes on each command."""
+    shm = None
+    last_column = volume_column = None
+    previous_last = np.zeros(0, dtype=np.float64)
+    previous_volume = np.zeros(0, dtype=np.int64)
+    has_previous = np.zeros(0, dtype=bool)
+    try:
+        while True:
+            command = conn.recv()
+            if command[0] == "attach":
+                _, name, capacity = command
+                if shm is not None:
+                    # Drop the views before closing, or the old mapping stays exported.
+                    last_column = volume_column = None
+                    shm.close()
+                shm, last_column, volume_column = _attach(name, capacity)
+                previous_last = resize_column(previous_last, capacity)
+                previous_volume = resize_column(previous_volume, capacity)
+                has_previous = resize_column(has_previous, capacity, False)
+                conn.send(None)
+            elif command[0] == "seed":
+                _, rows, last, volume = command
+                previous_last[rows] = last
+                previous_volume[rows] = volume
+                has_previous[rows] = True
+                conn.send(None)
+            elif command[0] == "scan":
+                _, size, rows = command
+                if rows is None:
+                    rows = np.arange(shard, size, shards)
+                last = last_column[rows]
+                volume = volume_column[rows]
+                valid = valid_mask(settings, last, volume)
+                breakout, spike, change_pct, volume_ratio = tick_signals(
+                    settings,
+                    last,
+                    volume,
+                    previous_last[rows],
+                    previous_volume[rows],
+                    valid & has_previous[rows],
+                )
+                hits = np.flatnonzero(breakout | spike)
+                conn.send(
+                    (
+                        rows[hits],
+                        breakout[hits],
+                        change_pct[hits],
+                        volume_ratio[hits],
+                        last[hits],
+                        volume[hits],
+                    )
+                )
+                valid_rows = rows[valid]
+                previous_last[valid_rows] = last[valid]
+                previous_volume[valid_rows] = volume[valid]
+                has_previous[valid_rows] = True
+            else:
+                return
+    except (EOFError, KeyboardInterrupt):
+        return
+    finally:
+        last_column = volume_column = None
+        if shm is not None:
+            shm.close()
+
+
+class ShardedScanner:
+    """Runs ScannerBot's breakout/volume-spike scan across worker processes.
+
+    Each scan copies the last price and volume columns of the quote store into a shared memory
+    block, then every worker scans its stripe of rows (row % workers) against its own copy of
+    the previous-scan state and sends back only the hit rows as NumPy arrays over a pipe. The
+    results are merged in row order and turned into ScanResults on the event loop, where the
+    ScannerBot callbacks fire as they would for an in-process scan. Quotes keep updating while
+    the workers run; they scan the copy taken when the pass started.
+
+    Only the previous-scan comparison is sharded; rolling-window signals are fed tick by tick
+    in the feed process and stay on ScannerBot. ScannerBot's previous-scan arrays stay the
+    source of truth: every pass applies the same baseline update the workers make, and
+    ``start`` seeds the workers from them, so state snapshots and restores see the baselines.
+
+    If a pass fails (a worker died, a pipe broke, or a worker has not replied within
+    ``reply_timeout_sec``), that pass is scanned in process and the workers are restarted,
+    reseeded from ScannerBot's baselines. If they cannot be restarted, every later pass is
+    scanned in process.
+    """
+
+    def __init__(
+        self,
+        scanner_bot: ScannerBot,
+        workers: int,
+        reply_timeout_sec: float = SCAN_REPLY_TIMEOUT_SEC,
+    ):
+        if workers < 1:
+            raise ValueError(f"Sharded scanning needs at least one worker, got {workers}")
+        if scanner_bot.rolling is not None:
+            raise ValueError("Sharded scanning does not support rolling-window signals")
+        self.scanner_bot = scanner_bot
+        self.quotes = scanner_bot.market_data_handler.quotes
+        self.workers = workers
+        self.reply_timeout_sec = reply_timeout_sec
+        self.capacity = 0
+        self._shm: SharedMemory | None = None
+        self._last: np.ndarray | None = None
+        self._volume: np.ndarray | None = None
+        # Trace stamps of the published quotes; they stay in this process.
+        self._recv_ns = np.zeros(0, dtype=np.int64)
+        self._decoded_ns = np.zeros(0, dtype=np.int64)
+        self._processes: list[multiprocessing.Process] = []
+        self._connections: list[Connection] = []
+        self.scans = 0
+        self.last_scan_sec = 0.0
+
+    def start(self):
+        if self._processes:
+            return
+        # Spawned, not forked: the feed process already runs QuickFIX threads.
+        context = multiprocessing.get_context("spawn")
+        for shard in range(self.workers):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_shard_worker,
+                args=(shard, self.workers, self.scanner_bot.settings, child),
+                name=f"scanner-shard-{shard}",
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._processes.append(process)
+            self._connections.append(parent)
+        self._allocate(self.quotes.capacity)
+        self._seed()
+        logger.info("sharded_scanner_started", workers=self.workers, capacity=self.capacity)
+
+    def stop(self, timeout: float = 5.0):
+        for conn in self._connections:
+            try:
+                conn.send(("stop",))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout=timeout)
+            if process.is_alive():
+                # A stopped process ignores SIGTERM until it is continued.
+                process.kill()
+                process.join()
+        for conn in self._connections:
+            conn.close()
+        self._processes = []
+        self._connections = []
+        if self._shm is not None:
+            self._last = self._volume = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def _allocate(self, capacity: int):
+        """(Re)create the shared block for ``capacity`` rows and attach every worker to it."""
+        old = self._shm
+        self._shm = SharedMemory(create=True, size=capacity * ROW_BYTES)
+        self._last = np.ndarray(capacity, dtype=np.float64, buffer=self._shm.buf)
+        self._volume = np.ndarray(
+            capacity, dtype=np.int64, buffer=self._shm.buf, offset=capacity * 8
+        )
+        self.capacity = capacity
+        for conn in self._connections:
+            conn.send(("attach", self._shm.name, capacity))
+        for conn in self._connections:
+            conn.recv()
+        if old is not None:
+            old.close()
+            old.unlink()
+
+    def _seed(self):
+        """Send each worker the ScannerBot baselines of its stripe of rows."""
+        scanner_bot = self.scanner_bot
+        rows = np.flatnonzero(scanner_bot.has_previous[: self.capacity])
+        for shard, conn in enumerate(self._connections):
+            shard_rows = rows[rows % self.workers == shard]
+            conn.send(
+                (
+                    "seed",
+                    shard_rows,
+                    scanner_bot.previous_last[shard_rows],
+                    scanner_bot.previous_volume[shard_rows],
+                )
+            )
+        for conn in self._connections:
+            conn.recv()
+
+    def _publish(self) -> int:
+        quotes = self.quotes
+        size = quotes.size
+        if size > self.capacity:
+            self._allocate(quotes.capacity)
+        self._last[:size] = quotes.last_price[:size]
+        self._volume[:size] = quotes.volume[:size]
+        self._recv_ns = quotes.recv_ns[:size].copy()
+        self._decoded_ns = quotes.decoded_ns[:size].copy()
+        return size
+
+    def _collect(self) -> list[tuple[np.ndarray, ...]]:
+        deadline = time.monotonic() + self.reply_timeout_sec
+        replies = []
+        for shard, conn in enumerate(self._connections):
+            if not conn.poll(max(0.0, deadline - time.monotonic())):
+                raise TimeoutError(f"Scanner shard {shard} did not reply")
+            replies.append(conn.recv())
+        return replies
+
+    async def scan(self) -> list[ScanResult]:
+        return await self._scan(None)
+
+    async def scan_dirty(self) -> list[ScanResult]:
+        rows = np.fromiter(self.scanner_bot.market_data_handler.take_dirty_rows(), dtype=np.intp)
+        if not len(rows):
+            return []
+        return await self._scan(rows)
+
+    def _scan_in_process(self, rows: np.ndarray | None) -> list[ScanResult]:
+        scanner_bot = self.scanner_bot
+        return scanner_bot.scan() if rows is None else scanner_bot.scan_rows(rows)
+
+    def _restart(self):
+        try:
+            # Runs on the event loop: don't wait long for a worker that already failed.
+            self.stop(timeout=0.5)
+            self.start()
+        except Exception as e:
+            logger.error("sharded_scanner_restart_failed", error=str(e))
+            self.stop(timeout=0.5)
+
+    async def _scan(self, rows: np.ndarray | None) -> list[ScanResult]:
+        if not self._connections:
+            return self._scan_in_process(rows)
+        start = time.perf_counter()
+        try:
+            size = self._publish()
+            for shard, conn in enumerate(self._connections):
+                shard_rows = None if rows is None else rows[rows % self.workers == shard]
+                conn.send(("scan", size, shard_rows))
+            replies = await asyncio.get_running_loop().run_in_executor(None, self._collect)
+        except Exception as e:
+            logger.error("sharded_scan_failed", error=str(e))
+            # Scan first, so the restarted workers are seeded with this pass's baselines.
+            results = self._scan_in_process(rows)
+            self._restart()
+            return results
+
+        # Mirror the workers' baseline update, from the same published copy they scanned.
+        scanner_bot = self.scanner_bot
+        scanned = np.arange(size) if rows is None else rows
+        last_scanned = self._last[scanned]
+        volume_scanned = self._volume[scanned]
+        scanner_bot._ensure_capacity(size)
+        scanner_bot.record_previous(
+            scanned,
+            last_scanned,
+            volume_scanned,
+            valid_mask(scanner_bot.settings, last_scanned, volume_scanned),
+        )
+
+        row_ids, breakout, change_pct, volume_ratio, last, volume = (
+            np.concatenate(column) for column in zip(*replies)
+        )
+        order = np.argsort(row_ids, kind="stable")
+        signal_ns = time.perf_counter_ns()
+        symbols = self.quotes.symbols
+        callbacks = scanner_bot.callbacks
+        results = []
+        for k in order:
+            result = scanner_bot._build_result(
+                symbols[row_ids[k]],
+                bool(breakout[k]),
+                float(change_pct[k]),
+                float(volume_ratio[k]),
+                float(last[k]),
+                int(volume[k]),
+            )
+            row = row_ids[k]
+            result.recv_ns = int(self._recv_ns[row])
+            result.decoded_ns = int(self._decoded_ns[row])
+            result.signal_ns = signal_ns
+            record_stage_latency("signal", result.decoded_ns, signal_ns)
+            results.append(result)
+            for callback in callbacks:
+                callback(result)
+
+        self.scans += 1
+        self.last_scan_sec = time.perf_counter() - start
+        return results
@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from prometheus_client import Counter, Gauge, Histogram, start_http_server
 
+if TYPE_CHECKING:
+    from src.das_trader.dispatch import QueuedConsumer
+    from src.das_trader.subscriptions import SubscriptionManager
+    from src.risk.risk_manager import RiskManager
+
 orders_placed_counter = Counter(
     "das_orders_placed_total", "Total orders placed", ["order_type", "side"]
 )
@@ -14,10 +21,54 @@ scanner_signals_counter = Counter(
 positions_gauge = Gauge("das_open_positions", "Current open positions")
 pnl_gauge = Gauge("das_pnl_usd", "Current P&L in USD")
 daily_pnl_gauge = Gauge("das_daily_pnl_usd", "Daily P&L in USD")
+unrealized_pnl_gauge = Gauge("das_unrealized_pnl_usd", "Unrealized P&L of open positions in USD")
+gross_exposure_gauge = Gauge("das_gross_exposure_usd", "Sum of absolute position notionals in USD")
+net_exposure_gauge = Gauge("das_net_exposure_usd", "Long minus short position notional in USD")
 order_latency_histogram = Histogram(
     "das_order_latency_ms",
-    "Order execution latency in milliseconds",
-    buckets=[10, 50, 100, 250, 500, 1000],
+    "Order round-trip latency in milliseconds, from send to ack or fill",
+    ["stage"],
+    buckets=[0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500],
+)
+
+hot_path_latency_histogram = Histogram(
+    "das_hot_path_latency_us",
+    "Tick-to-order latency between hot-path stage timestamps, in microseconds",
+    ["stage"],
+    buckets=[1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 100000],
+)
+
+startup_gauge = Gauge(
+    "das_startup_seconds", "Seconds from DasTraderBot construction to the first order-capable logon"
+)
+
+market_data_bridge_depth_gauge = Gauge(
+    "das_market_data_bridge_depth", "Symbols pending in the feed-to-loop bridge at drain"
+)
+market_data_conflated_counter = Counter(
+    "das_market_data_conflated_total", "Quote updates merged into a pending update before delivery"
+)
+market_data_consumer_depth_gauge = Gauge(
+    "das_market_data_consumer_queue_depth", "Quotes waiting for a queued consumer", ["consumer"]
+)
+market_data_consumer_delivered_counter = Counter(
+    "das_market_data_consumer_delivered_total",
+    "Quotes delivered to a queued consumer",
+    ["consumer"],
+)
+market_data_consumer_dropped_counter = Counter(
+    "das_market_data_consumer_dropped_total",
+    "Quotes a queued consumer never saw because they were replaced or dropped",
+    ["consumer"],
+)
+market_data_consumer_batch_histogram = Histogram(
+    "das_market_data_consumer_batch_seconds",
+    "Time a queued consumer spent on one drained batch of quotes",
+    ["consumer"],
+    buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1],
+)
+market_data_subscriptions_gauge = Gauge(
+    "das_market_data_subscriptions", "Symbols per market data subscription state", ["state"]
 )
 
 
@@ -49,6 +100,51 @@ def record_daily_pnl(pnl_usd: float) -> None:
     daily_pnl_gauge.set(pnl_usd)
 
 
-def record_order_latency(latency_ms: float) -> None:
-    order_latency_histogram.observe(latency_ms)
+def bind_risk_metrics(risk_manager: RiskManager) -> None:
+    """Read the RiskManager's running totals at scrape time instead of pushing them per tick."""
+    positions_gauge.set_function(lambda: len(risk_manager.positions))
+    pnl_gauge.set_function(lambda: risk_manager.daily_pnl)
+    daily_pnl_gauge.set_function(lambda: risk_manager.daily_pnl)
+    unrealized_pnl_gauge.set_function(lambda: risk_manager.unrealized_pnl)
+    gross_exposure_gauge.set_function(lambda: risk_manager.gross_exposure)
+    net_exposure_gauge.set_function(lambda: risk_manager.net_exposure)
+
+
+def record_order_latency(stage: str, latency_ms: float) -> None:
+    order_latency_histogram.labels(stage=stage).observe(latency_ms)
+
+
+def record_stage_latency(stage: str, start_ns: int, end_ns: int) -> None:
+    """Observe ``end_ns - start_ns`` (perf_counter_ns stamps); an unset start is skipped."""
+    if start_ns:
+        hot_path_latency_histogram.labels(stage=stage).observe((end_ns - start_ns) / 1000)
+
+
+def record_startup(seconds: float) -> None:
+    startup_gauge.set(seconds)
+
+
+def record_market_data_bridge(depth: int, conflated: int) -> None:
+    market_data_bridge_depth_gauge.set(depth)
+    if conflated:
+        market_data_conflated_counter.inc(conflated)
+
+
+def bind_market_data_consumer(consumer: QueuedConsumer) -> None:
+    market_data_consumer_depth_gauge.labels(consumer=consumer.name).set_function(
+        lambda: consumer.depth
+    )
+
+
+def bind_market_data_subscriptions(manager: SubscriptionManager) -> None:
+    for state in ("active", "pending", "queued", "unsubscribing", "rejected"):
+        market_data_subscriptions_gauge.labels(state=state).set_function(
+            lambda state=state: manager.counts[state]
+        )
+
 
+def record_market_data_consumer(name: str, delivered: int, seconds: float, dropped: int) -> None:
+    market_data_consumer_delivered_counter.labels(consumer=name).inc(delivered)
+    market_data_consumer_batch_histogram.labels(consumer=name).observe(seconds)
+    if dropped:
+        market_data_consumer_dropped_counter.labels(consumer=name).inc(dropped)
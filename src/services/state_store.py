@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import islice
+from operator import attrgetter
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import structlog
+
+from src.das_trader.quote_store import resize_column
+from src.execution.execution_bot import OPEN_STATUSES, ExecutionBot, Order
+from src.risk.risk_manager import Position, RiskManager
+from src.scanner.scanner_bot import ScannerBot
+
+if TYPE_CHECKING:
+    from src.bots.short_selling_bot import ShortSellingBot
+
+logger = structlog.get_logger(__name__)
+
+POSITION_COLUMNS = (
+    "symbol",
+    "side",
+    "quantity",
+    "entry_price",
+    "current_price",
+    "stop_loss_price",
+    "take_profit_price",
+    "trailing_stop_price",
+)
+ORDER_COLUMNS = (
+    "order_id",
+    "symbol",
+    "side",
+    "order_type",
+    "quantity",
+    "price",
+    "time_in_force",
+    "status",
+    "filled_quantity",
+    "avg_fill_price",
+    "exchange_order_id",
+    "reject_reason",
+)
+# Table -> columns; the first column is the primary key.
+TABLES: dict[str, tuple[str, ...]] = {
+    "positions": POSITION_COLUMNS,
+    "orders": ORDER_COLUMNS,
+    "short_positions": ("symbol", "quantity"),
+    "scanner_previous": ("symbol", "last_price", "volume"),
+    "meta": ("key", "value"),
+}
+
+_position_row = attrgetter(*POSITION_COLUMNS)
+_order_row = attrgetter(*ORDER_COLUMNS)
+
+
+def _schema() -> str:
+    return "\n".join(
+        f"CREATE TABLE IF NOT EXISTS {table} ({columns[0]} PRIMARY KEY, {', '.join(columns[1:])});"
+        for table, columns in TABLES.items()
+    )
+
+
+def _upsert_sql(table: str) -> str:
+    columns = TABLES[table]
+    placeholders = ", ".join("?" * len(columns))
+    return f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+def _delete_sql(table: str) -> str:
+    return f"DELETE FROM {table} WHERE {TABLES[table][0]} = ?"
+
+
+@dataclass
+class StateDelta:
+    """Rows changed since the previous capture; ``full`` replaces every table instead."""
+
+    full: bool = False
+    upserts: dict[str, list[tuple]] = field(default_factory=dict)
+    deletes: dict[str, list[tuple]] = field(default_factory=dict)
+
+    @property
+    def rows(self) -> int:
+        return sum(map(len, self.upserts.values())) + sum(map(len, self.deletes.values()))
+
+
+class StateStore:
+    """Crash-consistent snapshots of the bot's trading state in a SQLite WAL database.
+
+    ``capture`` runs on the event loop and diffs positions, orders, short positions and the
+    scanner's previous-scan prices against what was last written, so a snapshot only carries
+    the rows that changed; orders are diffed from the open set and the orders added since the
+    previous capture. ``write`` applies a delta in one transaction and can run on a worker
+    thread, so a crash leaves the previous snapshot intact. ``load`` restores a snapshot into
+    empty components at startup; open orders are then reconciled against the broker with
+    ``ExecutionBot.reconcile_open_orders``.
+
+    Realized P&L, the daily loss flag and the scanner's previous-scan baselines are only
+    restored on the trading day they were saved; on a later day the baselines and terminal
+    orders are pruned at load. Without a short selling
+    bot the saved short positions are left untouched.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        risk_manager: RiskManager,
+        execution_bot: ExecutionBot,
+        short_selling_bot: ShortSellingBot | None,
+        scanner_bot: ScannerBot,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.risk_manager = risk_manager
+        self.execution_bot = execution_bot
+        self.short_selling_bot = short_selling_bot
+        self.scanner_bot = scanner_bot
+        self.tables = tuple(
+            table for table in TABLES if table != "short_positions" or short_selling_bot is not None
+        )
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_schema())
+
+        # Last written row per key, per table; cleared when the next write must be full.
+        self._written: dict[str, dict[str, tuple]] = {table: {} for table in TABLES}
+        self._full = True
+        self._open_order_ids: set[str] = set()
+        self._orders_seen = 0
+        self._scan_last = np.zeros(0, dtype=np.float64)
+        self._scan_volume = np.zeros(0, dtype=np.int64)
+        self.snapshots = 0
+        self.last_snapshot_sec = 0.0
+
+    def load(self) -> bool:
+        """Restore the saved snapshot; returns False if there is none."""
+        start = time.perf_counter()
+        conn = self._conn
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+        if not meta:
+            return False
+
+        same_day = meta.get("trading_day") == date.today().isoformat()
+        if not same_day:
+            placeholders = ", ".join("?" * len(OPEN_STATUSES))
+            with conn:
+                conn.execute(
+                    f"DELETE FROM orders WHERE status NOT IN ({placeholders})", tuple(OPEN_STATUSES)
+                )
+                # Yesterday's close would make every overnight gap look like a breakout.
+                conn.execute("DELETE FROM scanner_previous")
+
+        # Rows as read from disk, so the post-load capture writes exactly what differs.
+        written: dict[str, dict[str, tuple]] = {table: {} for table in TABLES}
+        written["meta"] = {key: (key, value) for key, value in meta.items()}
+
+        position_rows = conn.execute(f"SELECT {', '.join(POSITION_COLUMNS)} FROM positions")
+        positions = []
+        for row in position_rows:
+            written["positions"][row[0]] = row
+            positions.append(Position(**dict(zip(POSITION_COLUMNS, row)), unrealized_pnl=0.0))
+        self.risk_manager.restore(
+            positions,
+            realized_pnl=float(meta.get("realized_pnl", 0.0)) if same_day else 0.0,
+            daily_loss_limit_reached=same_day and meta.get("daily_loss_limit_reached") == "1",
+        )
+
+        order_rows = conn.execute(f"SELECT {', '.join(ORDER_COLUMNS)} FROM orders ORDER BY rowid")
+        orders = []
+        for row in order_rows:
+            written["orders"][row[0]] = row
+            orders.append(Order(**dict(zip(ORDER_COLUMNS, row))))
+        self.execution_bot.restore_orders(orders)
+
+        short_positions = {}
+        if self.short_selling_bot is not None:
+            short_rows = conn.execute("SELECT symbol, quantity FROM short_positions").fetchall()
+            written["short_positions"] = {row[0]: row for row in short_rows}
+            short_positions = dict(short_rows)
+            self.short_selling_bot.short_positions.update(short_positions)
+
+        previous = conn.execute(
+            "SELECT symbol, last_price, volume FROM scanner_previous"
+        ).fetchall()
+        self.scanner_bot.restore_previous(previous)
+
+        # Write what changed on load (the trading day, a reset P&L) right away; the rest of the
+        # restored state already matches the file.
+        self._written = written
+        self._open_order_ids = set()
+        self._orders_seen = 0
+        self._full = False
+        self.save()
+
+        logger.info(
+            "state_snapshot_loaded",
+            path=str(self.path),
+            saved_at=meta.get("saved_at"),
+            same_day=same_day,
+            positions=len(positions),
+            orders=len(orders),
+            open_orders=len(self.execution_bot.open_orders),
+            short_positions=len(short_positions),
+            scanner_symbols=len(previous),
+            load_ms=(time.perf_counter() - start) * 1000,
+        )
+        return True
+
+    def capture(self) -> StateDelta:
+        """Collect the rows changed since the last capture. Call on the event loop."""
+        delta = StateDelta(full=self._full)
+        if self._full:
+            self._written = {table: {} for table in TABLES}
+            self._open_order_ids = set()
+            self._orders_seen = 0
+            self._scan_last = np.zeros(0, dtype=np.float64)
+            self._scan_volume = np.zeros(0, dtype=np.int64)
+            self._full = False
+
+        risk_manager = self.risk_manager
+        self._diff(
+            delta,
+            "positions",
+            {
+                symbol: _position_row(position)
+                for symbol, position in risk_manager.positions.items()
+            },
+        )
+        if self.short_selling_bot is not None:
+            self._diff(
+                delta,
+                "short_positions",
+                {
+                    symbol: (symbol, quantity)
+                    for symbol, quantity in self.short_selling_bot.short_positions.items()
+                    if quantity
+                },
+            )
+        self._diff(
+            delta,
+            "meta",
+            {
+                key: (key, value)
+                for key, value in (
+                    ("trading_day", date.today().isoformat()),
+                    ("realized_pnl", repr(risk_manager.realized_pnl)),
+                    (
+                        "daily_loss_limit_reached",
+                        "1" if risk_manager.daily_loss_limit_reached else "0",
+                    ),
+                    ("saved_at", repr(time.time())),
+                )
+            },
+            deletes=False,
+        )
+        self._capture_orders(delta)
+        self._capture_scanner(delta)
+        return delta
+
+    def _diff(self, delta: StateDelta, table: str, rows: dict[str, tuple], deletes: bool = True):
+        written = self._written[table]
+        upserts = [row for key, row in rows.items() if written.get(key) != row]
+        if upserts:
+            delta.upserts[table] = upserts
+        if deletes:
+            removed = [key for key in written if key not in rows]
+            if removed:
+                delta.deletes[table] = [(key,) for key in removed]
+            self._written[table] = rows
+        else:
+            written.update(rows)
+
+    def _capture_orders(self, delta: StateDelta):
+        # Only open orders, orders that were open at the last capture and orders added since
+        # can have changed; terminal orders never change again.
+        orders = self.execution_bot.orders
+        candidates = list(islice(orders.values(), self._orders_seen, None))
+        candidates += (orders[order_id] for order_id in self._open_order_ids if order_id in orders)
+        candidates += self.execution_bot.open_orders.values()
+        self._orders_seen = len(orders)
+
+        written = self._written["orders"]
+        upserts = []
+        for order in candidates:
+            row = _order_row(order)
+            if written.get(order.order_id) != row:
+                written[order.order_id] = row
+                upserts.append(row)
+        if upserts:
+            delta.upserts["orders"] = upserts
+        self._open_order_ids = set(self.execution_bot.open_orders)
+
+    def _capture_scanner(self, delta: StateDelta):
+        scanner_bot = self.scanner_bot
+        quotes = scanner_bot.market_data_handler.quotes
+        n = min(quotes.size, len(scanner_bot.previous_last))
+        if len(self._scan_last) < n:
+            self._scan_last = resize_column(self._scan_last, len(scanner_bot.previous_last))
+            self._scan_volume = resize_column(self._scan_volume, len(scanner_bot.previous_last))
+
+        last = scanner_bot.previous_last[:n]
+        volume = scanner_bot.previous_volume[:n]
+        changed = np.flatnonzero(
+            scanner_bot.has_previous[:n]
+            & ((last != self._scan_last[:n]) | (volume != self._scan_volume[:n]))
+        )
+        if not len(changed):
+            return
+        self._scan_last[changed] = last[changed]
+        self._scan_volume[changed] = volume[changed]
+        symbols = quotes.symbols
+        delta.upserts["scanner_previous"] = [
+            (symbols[row], last_price, row_volume)
+            for row, last_price, row_volume in zip(
+                changed.tolist(), last[changed].tolist(), volume[changed].tolist()
+            )
+        ]
+
+    def write(self, delta: StateDelta):
+        """Apply ``delta`` in one transaction. Safe to call from a worker thread."""
+        start = time.perf_counter()
+        conn = self._conn
+        try:
+            with conn:
+                if delta.full:
+                    for table in self.tables:
+                        conn.execute(f"DELETE FROM {table}")
+                for table, rows in delta.upserts.items():
+                    conn.executemany(_upsert_sql(table), rows)
+                for table, keys in delta.deletes.items():
+                    conn.executemany(_delete_sql(table), keys)
+        except Exception:
+            # The written-row cache no longer matches the file; rewrite everything next time.
+            self._full = True
+            raise
+        self.snapshots += 1
+        self.last_snapshot_sec = time.perf_counter() - start
+
+    def save(self):
+        self.write(self.capture())
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,3 @@
+from src.simulator.das_acceptor import AcceptorSettings, SimulatedDasAcceptor, start_acceptor
+
+__all__ = ["AcceptorSettings", "SimulatedDasAcceptor", "start_acceptor"]
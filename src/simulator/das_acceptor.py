@@ -0,0 +1,411 @@
+"""Local stand-in for the DAS FIX gateway, for end-to-end load tests on localhost.
+
+Usage: python -m src.simulator.das_acceptor --symbols 1000 --rate 20000 --fill-latency-ms 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import json
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import quickfix as fix
+import quickfix42 as fix42
+import structlog
+
+from src.das_trader.fix_client import format_price
+from src.logging_config import configure_logging
+
+logger = structlog.get_logger(__name__)
+
+TAG_AVG_PX = 6
+TAG_CL_ORD_ID = 11
+TAG_CUM_QTY = 14
+TAG_EXEC_ID = 17
+TAG_EXEC_TRANS_TYPE = 20
+TAG_LAST_PX = 31
+TAG_LAST_SHARES = 32
+TAG_ORDER_ID = 37
+TAG_ORDER_QTY = 38
+TAG_ORD_STATUS = 39
+TAG_ORIG_CL_ORD_ID = 41
+TAG_SIDE = 54
+TAG_SYMBOL = 55
+TAG_TEXT = 58
+TAG_CXL_REJ_RESPONSE_TO = 434
+TAG_EXEC_TYPE = 150
+TAG_LEAVES_QTY = 151
+
+
+@dataclass
+class AcceptorSettings:
+    symbols: int = 1000
+    ticks_per_sec: float = 10000.0
+    ack_latency_ms: float = 0.0
+    fill_latency_ms: float = 1.0
+    # Per-tick chance of a jump large enough to trip the scanner's breakout threshold.
+    jump_probability: float = 0.001
+    jump_pct: float = 3.0
+    seed: int = 7
+
+
+@dataclass
+class _SimOrder:
+    cl_ord_id: str
+    order_id: str
+    symbol: str
+    side: str
+    quantity: int
+    status: str = fix.OrdStatus_NEW
+    fill_price: float = 0.0
+
+
+class SimulatedDasAcceptor(fix.Application):
+    """QuickFIX acceptor application that streams quotes and fills orders.
+
+    Once a session logs on, a feed thread sends MarketDataSnapshotFullRefresh messages
+    round-robin over ``settings.symbols`` synthetic symbols at ``ticks_per_sec``, without
+    waiting for a MarketDataRequest. NewOrderSingles are acked and then filled in full at the
+    symbol's last price after the configured latencies; OrderCancelRequests cancel orders that
+    have not filled yet and are rejected otherwise. OrderStatusRequests are answered with the
+    order's current status, or a rejected status for an order the acceptor never saw.
+
+    Tick-to-order latency is measured per NewOrderSingle as the time since the last tick sent
+    for the order's symbol.
+    """
+
+    def __init__(self, settings: AcceptorSettings):
+        super().__init__()
+        self.settings = settings
+        self.session_id: fix.SessionID | None = None
+        self.running = False
+
+        rng = np.random.default_rng(settings.seed)
+        self.rng = rng
+        self.symbols = [f"SIM{i:05d}" for i in range(settings.symbols)]
+        self.prices = rng.uniform(5.0, 500.0, settings.symbols)
+        self.volumes = np.full(settings.symbols, 500_000, dtype=np.int64)
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.last_tick_ns = np.zeros(settings.symbols, dtype=np.int64)
+
+        self.orders: dict[str, _SimOrder] = {}
+        self._order_ids = itertools.count(1)
+        self._exec_ids = itertools.count(1)
+        self._orders_lock = threading.Lock()
+
+        self._due: list[tuple[int, int, Callable[[], None]]] = []
+        self._due_seq = itertools.count()
+        self._due_cv = threading.Condition()
+        self._threads: list[threading.Thread] = []
+
+        self.ticks_sent = 0
+        self.orders_received = 0
+        self.cancels_received = 0
+        self.fills_sent = 0
+        self.tick_to_order_ns: list[int] = []
+
+    def onCreate(self, session_id: fix.SessionID):
+        logger.info("sim_session_created", session_id=str(session_id))
+
+    def onLogon(self, session_id: fix.SessionID):
+        self.session_id = session_id
+        logger.info("sim_logon", session_id=str(session_id))
+        if not self.running:
+            self.running = True
+            self._threads = [
+                threading.Thread(target=self._feed_loop, name="sim-feed", daemon=True),
+                threading.Thread(target=self._report_loop, name="sim-reports", daemon=True),
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def onLogout(self, session_id: fix.SessionID):
+        logger.info("sim_logout", session_id=str(session_id))
+        self.stop()
+
+    def toAdmin(self, message: fix.Message, session_id: fix.SessionID):
+        pass
+
+    def fromAdmin(self, message: fix.Message, session_id: fix.SessionID):
+        pass
+
+    def toApp(self, message: fix.Message, session_id: fix.SessionID):
+        pass
+
+    def fromApp(self, message: fix.Message, session_id: fix.SessionID):
+        msg_type = fix.MsgType()
+        message.getHeader().getField(msg_type)
+        msg_type_value = msg_type.getValue()
+
+        if msg_type_value == fix.MsgType_NewOrderSingle:
+            self.on_new_order(message)
+        elif msg_type_value == fix.MsgType_OrderCancelRequest:
+            self.on_cancel_request(message)
+        elif msg_type_value == fix.MsgType_OrderStatusRequest:
+            self.on_status_request(message)
+
+    def stop(self):
+        self.running = False
+        with self._due_cv:
+            self._due_cv.notify()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=1.0)
+        self._threads = []
+
+    def on_new_order(self, message: fix.Message):
+        now = time.monotonic_ns()
+        symbol = message.getField(TAG_SYMBOL)
+        index = self.symbol_index.get(symbol)
+        if index is not None and self.last_tick_ns[index]:
+            self.tick_to_order_ns.append(now - int(self.last_tick_ns[index]))
+        self.orders_received += 1
+
+        order = _SimOrder(
+            cl_ord_id=message.getField(TAG_CL_ORD_ID),
+            order_id=f"SIM{next(self._order_ids)}",
+            symbol=symbol,
+            side=message.getField(TAG_SIDE),
+            quantity=int(float(message.getField(TAG_ORDER_QTY))),
+        )
+        with self._orders_lock:
+            self.orders[order.cl_ord_id] = order
+
+        self._schedule(self.settings.ack_latency_ms, lambda: self._send_ack(order))
+        self._schedule(self.settings.fill_latency_ms, lambda: self._send_fill(order))
+
+    def on_cancel_request(self, message: fix.Message):
+        self.cancels_received += 1
+        cancel_id = message.getField(TAG_CL_ORD_ID)
+        orig_id = message.getField(TAG_ORIG_CL_ORD_ID)
+        with self._orders_lock:
+            order = self.orders.get(orig_id)
+            cancellable = order is not None and order.status == fix.OrdStatus_NEW
+            if cancellable:
+                order.status = fix.OrdStatus_CANCELED
+
+        if cancellable:
+            report = self._execution_report(order, fix.ExecType_CANCELED, 0, 0.0)
+            report.setField(TAG_CL_ORD_ID, cancel_id)
+            report.setField(TAG_ORIG_CL_ORD_ID, orig_id)
+            self._send(report)
+            return
+
+        reject = fix.Message()
+        reject.getHeader().setField(fix.MsgType(fix.MsgType_OrderCancelReject))
+        reject.setField(TAG_ORDER_ID, order.order_id if order else "NONE")
+        reject.setField(TAG_CL_ORD_ID, cancel_id)
+        reject.setField(TAG_ORIG_CL_ORD_ID, orig_id)
+        reject.setField(TAG_ORD_STATUS, order.status if order else fix.OrdStatus_REJECTED)
+        reject.setField(TAG_CXL_REJ_RESPONSE_TO, "1")
+        reject.setField(TAG_TEXT, "Too late to cancel" if order else "Unknown order")
+        self._send(reject)
+
+    def on_status_request(self, message: fix.Message):
+        cl_ord_id = message.getField(TAG_CL_ORD_ID)
+        with self._orders_lock:
+            order = self.orders.get(cl_ord_id)
+        if order is not None:
+            self._send(
+                self._execution_report(order, fix.ExecType_ORDER_STATUS, 0, order.fill_price)
+            )
+            return
+
+        unknown = _SimOrder(
+            cl_ord_id=cl_ord_id,
+            order_id="NONE",
+            symbol=message.getField(TAG_SYMBOL),
+            side=message.getField(TAG_SIDE),
+            quantity=0,
+            status=fix.OrdStatus_REJECTED,
+        )
+        report = self._execution_report(unknown, fix.ExecType_ORDER_STATUS, 0, 0.0)
+        report.setField(TAG_TEXT, "Unknown order")
+        self._send(report)
+
+    def _send_ack(self, order: _SimOrder):
+        if order.status == fix.OrdStatus_NEW:
+            self._send(self._execution_report(order, fix.ExecType_NEW, 0, 0.0))
+
+    def _send_fill(self, order: _SimOrder):
+        with self._orders_lock:
+            if order.status != fix.OrdStatus_NEW:
+                return
+            order.status = fix.OrdStatus_FILLED
+        index = self.symbol_index.get(order.symbol)
+        price = float(self.prices[index]) if index is not None else 100.0
+        order.fill_price = price
+        self._send(self._execution_report(order, fix.ExecType_FILL, order.quantity, price))
+        self.fills_sent += 1
+
+    def _execution_report(
+        self, order: _SimOrder, exec_type: str, fill_quantity: int, fill_price: float
+    ) -> fix.Message:
+        report = fix.Message()
+        report.getHeader().setField(fix.MsgType(fix.MsgType_ExecutionReport))
+        report.setField(TAG_ORDER_ID, order.order_id)
+        report.setField(TAG_CL_ORD_ID, order.cl_ord_id)
+        report.setField(TAG_EXEC_ID, str(next(self._exec_ids)))
+        report.setField(TAG_EXEC_TRANS_TYPE, "0")
+        report.setField(TAG_EXEC_TYPE, exec_type)
+        report.setField(TAG_ORD_STATUS, order.status)
+        report.setField(TAG_SYMBOL, order.symbol)
+        report.setField(TAG_SIDE, order.side)
+        report.setField(TAG_ORDER_QTY, str(order.quantity))
+        report.setField(TAG_LAST_SHARES, str(fill_quantity))
+        report.setField(TAG_LAST_PX, format_price(fill_price) if fill_quantity else "0")
+        filled = order.quantity if order.status == fix.OrdStatus_FILLED else 0
+        report.setField(TAG_CUM_QTY, str(filled))
+        leaves = order.quantity if order.status == fix.OrdStatus_NEW else 0
+        report.setField(TAG_LEAVES_QTY, str(leaves))
+        report.setField(TAG_AVG_PX, format_price(fill_price) if filled else "0")
+        return report
+
+    def _send(self, message: fix.Message):
+        try:
+            fix.Session.sendToTarget(message, self.session_id)
+        except fix.SessionNotFound:
+            pass
+
+    def _schedule(self, delay_ms: float, action: Callable[[], None]):
+        due = time.monotonic_ns() + int(delay_ms * 1e6)
+        with self._due_cv:
+            heapq.heappush(self._due, (due, next(self._due_seq), action))
+            self._due_cv.notify()
+
+    def _report_loop(self):
+        while self.running:
+            with self._due_cv:
+                while self.running and not self._due:
+                    self._due_cv.wait()
+                if not self.running:
+                    return
+                wait_ns = self._due[0][0] - time.monotonic_ns()
+                if wait_ns > 0:
+                    self._due_cv.wait(wait_ns / 1e9)
+                    continue
+                _, _, action = heapq.heappop(self._due)
+            action()
+
+    def _feed_loop(self):
+        settings = self.settings
+        count = len(self.symbols)
+        # Send in batches of about a millisecond's worth of ticks, then sleep to the schedule.
+        batch = max(1, int(settings.ticks_per_sec / 1000))
+        batch_ns = int(batch / settings.ticks_per_sec * 1e9)
+        next_ns = time.monotonic_ns()
+        index = 0
+        while self.running:
+            for _ in range(batch):
+                self._send_tick(index)
+                index = (index + 1) % count
+            next_ns += batch_ns
+            sleep_ns = next_ns - time.monotonic_ns()
+            if sleep_ns > 0:
+                time.sleep(sleep_ns / 1e9)
+
+    def _send_tick(self, index: int):
+        settings = self.settings
+        rng = self.rng
+        move = rng.normal(0.0, 0.0005)
+        if rng.random() < settings.jump_probability:
+            move += settings.jump_pct / 100 * (1 if rng.random() < 0.5 else -1)
+        price = max(0.01, float(self.prices[index]) * (1 + move))
+        self.prices[index] = price
+        self.volumes[index] += int(rng.integers(100, 5000))
+
+        message = fix42.MarketDataSnapshotFullRefresh()
+        message.setField(fix.Symbol(self.symbols[index]))
+        for entry_type, px, size in (
+            (fix.MDEntryType_BID, price - 0.01, 300),
+            (fix.MDEntryType_OFFER, price + 0.01, 200),
+            (fix.MDEntryType_TRADE, price, 100),
+            (fix.MDEntryType_TRADE_VOLUME, 0.0, int(self.volumes[index])),
+        ):
+            group = fix42.MarketDataSnapshotFullRefresh.NoMDEntries()
+            group.setField(fix.MDEntryType(entry_type))
+            group.setField(fix.MDEntryPx(round(px, 2)))
+            group.setField(fix.MDEntrySize(size))
+            message.addGroup(group)
+
+        self.last_tick_ns[index] = time.monotonic_ns()
+        self._send(message)
+        self.ticks_sent += 1
+
+    def get_stats(self) -> dict[str, float | int]:
+        stats: dict[str, float | int] = {
+            "ticks_sent": self.ticks_sent,
+            "orders_received": self.orders_received,
+            "cancels_received": self.cancels_received,
+            "fills_sent": self.fills_sent,
+        }
+        if self.tick_to_order_ns:
+            latencies_us = np.asarray(self.tick_to_order_ns) / 1e3
+            for pct in (50, 90, 99):
+                stats[f"tick_to_order_p{pct}_us"] = float(np.percentile(latencies_us, pct))
+            stats["tick_to_order_max_us"] = float(latencies_us.max())
+        return stats
+
+
+def start_acceptor(
+    config_file: str, settings: AcceptorSettings
+) -> tuple[fix.SocketAcceptor, SimulatedDasAcceptor]:
+    application = SimulatedDasAcceptor(settings)
+    session_settings = fix.SessionSettings(config_file)
+    # In-memory store and a silent log keep the acceptor's own I/O out of the measurement.
+    acceptor = fix.SocketAcceptor(
+        application,
+        fix.MemoryStoreFactory(),
+        session_settings,
+        fix.ScreenLogFactory(False, False, False),
+    )
+    acceptor.start()
+    logger.info("sim_acceptor_started", config_file=config_file, symbols=settings.symbols)
+    return acceptor, application
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--config", default="config/das_simulator.cfg")
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=10000.0, help="Ticks per second")
+    parser.add_argument("--ack-latency-ms", type=float, default=0.0)
+    parser.add_argument("--fill-latency-ms", type=float, default=1.0)
+    parser.add_argument("--jump-probability", type=float, default=0.001)
+    parser.add_argument(
+        "--duration", type=float, default=0.0, help="Seconds to run; 0 runs until signalled"
+    )
+    args = parser.parse_args()
+    configure_logging("WARNING")
+
+    acceptor, application = start_acceptor(
+        args.config,
+        AcceptorSettings(
+            symbols=args.symbols,
+            ticks_per_sec=args.rate,
+            ack_latency_ms=args.ack_latency_ms,
+            fill_latency_ms=args.fill_latency_ms,
+            jump_probability=args.jump_probability,
+        ),
+    )
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    stop.wait(args.duration or None)
+
+    application.stop()
+    acceptor.stop()
+    # One JSON line on stdout so a harness can collect the acceptor-side measurements.
+    print(json.dumps(application.get_stats()), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.das_trader.bridge import MarketDataBridge
+from src.das_trader.market_data import MarketDataHandler
+
+
+def make_bridge() -> tuple[MarketDataBridge, MagicMock]:
+    loop = MagicMock()
+    return MarketDataBridge(MarketDataHandler(), loop), loop
+
+
+def test_updates_for_a_pending_symbol_are_merged_into_its_slot():
+    bridge, _ = make_bridge()
+    bridge.put("AAA", {"bid_price": 10.0, "bid_size": 100}, 1.0)
+    bridge.put("AAA", {"ask_price": 10.1}, 2.0)
+    bridge.put("AAA", {"bid_price": 10.05}, 3.0)
+    bridge.put("BBB", {"last_price": 20.0}, 4.0)
+
+    assert bridge._pending["AAA"] == [
+        {"bid_price": 10.05, "bid_size": 100, "ask_price": 10.1},
+        3.0,
+    ]
+    assert bridge.depth == 2
+    assert bridge.get_stats() == {
+        "depth": 2,
+        "max_depth": 2,
+        "enqueued": 4,
+        "conflated": 2,
+        "drained": 0,
+    }
+
+
+def test_loop_is_woken_once_per_empty_to_non_empty_edge():
+    bridge, loop = make_bridge()
+    bridge.put("AAA", {"bid_price": 10.0}, 1.0)
+    bridge.put("AAA", {"bid_price": 10.1}, 2.0)
+    bridge.put("BBB", {"bid_price": 20.0}, 3.0)
+    loop.call_soon_threadsafe.assert_called_once_with(bridge.drain)
+
+    bridge.drain()
+    bridge.put("AAA", {"bid_price": 10.2}, 4.0)
+    assert loop.call_soon_threadsafe.call_count == 2
+
+
+def test_drain_applies_merged_fields_to_the_quote_store():
+    bridge, _ = make_bridge()
+    seen = []
+    bridge.handler.register_callback(seen.append)
+    bridge.put("AAA", {"bid_price": 10.0, "bid_size": 100}, 1.0)
+    bridge.put("AAA", {"ask_price": 10.1}, 2.0)
+
+    bridge.drain()
+
+    quote = bridge.handler.get_market_data("AAA")
+    assert (quote.bid_price, quote.bid_size, quote.ask_price) == (10.0, 100, 10.1)
+    assert quote.timestamp == 2.0
+    assert len(seen) == 1
+    assert bridge.depth == 0
+    assert bridge.drained == 1
+
+
+def test_put_after_loop_closes_is_dropped_quietly():
+    bridge, loop = make_bridge()
+    loop.call_soon_threadsafe.side_effect = RuntimeError("Event loop is closed")
+    bridge.put("AAA", {"bid_price": 10.0}, 1.0)
+    assert bridge.depth == 1
+
+
+def test_block_policy_is_refused():
+    handler = MarketDataHandler()
+    loop = asyncio.new_event_loop()
+    try:
+        handler.register_callback(print, policy="block", name="recorder")
+        with pytest.raises(ValueError, match="recorder"):
+            MarketDataBridge(handler, loop)
+        handler.close()
+
+        handler = MarketDataHandler()
+        handler.sink = MarketDataBridge(handler, loop).put
+        with pytest.raises(ValueError):
+            handler.register_callback(print, policy="block")
+    finally:
+        handler.close()
+        loop.close()
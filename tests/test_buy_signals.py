@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.config import DasTraderSettings, RiskSettings, Settings
+from src.execution.execution_bot import Order
+from src.main import DasTraderBot
+from src.scanner.scanner_bot import ScanResult
+
+
+@pytest.fixture
+def bot(monkeypatch) -> DasTraderBot:
+    settings = Settings(
+        das_trader=DasTraderSettings(sender_comp_id="TEST", username="test", password=""),
+        risk=RiskSettings(max_open_positions=10),
+    )
+    bot = DasTraderBot(settings, fix_client=MagicMock())
+    bot.ready.set()
+    execution_bot = bot.execution_bot
+    bot.sent = []
+
+    def place_orders(requests):
+        # Track each leg as a working order, as a successful send would.
+        for request in requests:
+            order_id = f"ORDER_{len(bot.sent)}"
+            bot.sent.append(request.symbol)
+            execution_bot._track_order(
+                Order(
+                    order_id=order_id,
+                    symbol=request.symbol,
+                    side=request.side,
+                    order_type="MARKET",
+                    quantity=request.quantity,
+                    price=request.price,
+                    time_in_force="DAY",
+                    status="NEW",
+                )
+            )
+
+    monkeypatch.setattr(execution_bot, "place_orders", place_orders)
+    return bot
+
+
+def breakout(symbol: str, signal_type: str = "BREAKOUT_UP") -> ScanResult:
+    return ScanResult(
+        symbol=symbol, signal_type=signal_type, reason="", price=10.0, volume=0, change_pct=3.0
+    )
+
+
+def test_working_entry_blocks_reentry(bot):
+    bot._handle_buy_signals([breakout("AAA")])
+    bot._handle_buy_signals([breakout("AAA")])
+    bot._handle_buy_signals([breakout("AAA"), breakout("BBB")])
+    assert bot.sent == ["AAA", "BBB"]
+
+
+def test_position_blocks_reentry(bot):
+    bot.risk_manager.add_position("AAA", "BUY", 100, 10.0)
+    bot._handle_buy_signals([breakout("AAA")])
+    assert bot.sent == []
+
+
+def test_one_entry_per_symbol_per_basket(bot):
+    bot._handle_buy_signals([breakout("AAA"), breakout("AAA", "VOLUME_SPIKE")])
+    assert bot.sent == ["AAA"]
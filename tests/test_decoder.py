@@ -0,0 +1,30 @@
+import quickfix as fix
+
+from src.das_trader.decoder import SOH, MarketDataDecoder
+from src.das_trader.order_book import DepthEntry
+
+
+def incremental(*entries: tuple[str, str, str, str]) -> str:
+    pairs = ["35=X", f"268={len(entries)}"]
+    for action, entry_type, px, size in entries:
+        pairs += [f"279={action}", f"269={entry_type}", "55=AAA", f"270={px}", f"271={size}"]
+    return SOH.join(pairs) + SOH
+
+
+def test_level_one_delete_without_book_keeps_top_of_book():
+    raw = incremental(
+        (fix.MDUpdateAction_DELETE, fix.MDEntryType_BID, "10.00", "100"),
+        (fix.MDUpdateAction_NEW, fix.MDEntryType_OFFER, "10.02", "300"),
+    )
+    assert MarketDataDecoder().decode_incremental_raw(raw) == {
+        "AAA": {"ask_price": 10.02, "ask_size": 300}
+    }
+
+
+def test_level_one_delete_with_book_is_collected():
+    raw = incremental((fix.MDUpdateAction_DELETE, fix.MDEntryType_BID, "10.00", "100"))
+    depth: list[DepthEntry] = []
+    MarketDataDecoder().decode_incremental_raw(raw, depth)
+    assert [(symbol, action) for symbol, _, action, *_ in depth] == [
+        ("AAA", fix.MDUpdateAction_DELETE)
+    ]
@@ -0,0 +1,30 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+from src.config import DasTraderSettings, ScannerSettings, Settings
+from src.main import DasTraderBot
+
+
+def test_tick_published_before_the_loop_starts_wakes_it():
+    settings = Settings(
+        das_trader=DasTraderSettings(sender_comp_id="TEST", username="test", password=""),
+        scanner=ScannerSettings(scan_mode="event"),
+    )
+    bot = DasTraderBot(settings, fix_client=MagicMock())
+    # A logon snapshot drained before the scanner loop registers its wakeup.
+    bot.market_data_handler.apply_update("AAA", {"last_price": 10.0}, time.time())
+    scans = []
+
+    async def run_scan_pass(dirty_only=False):
+        scans.append(bot.market_data_handler.take_dirty_rows())
+        bot.running = False
+
+    bot.run_scan_pass = run_scan_pass
+    bot.running = True
+
+    async def run():
+        await asyncio.wait_for(bot.run_event_scanner_loop(), timeout=0.5)
+
+    asyncio.run(run())
+    assert scans == [{0}]
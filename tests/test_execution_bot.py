@@ -0,0 +1,120 @@
+from unittest.mock import MagicMock
+
+import pytest
+import quickfix as fix
+
+from src.config import ExecutionSettings
+from src.das_trader.execution_report import ExecutionReport
+from src.execution.execution_bot import ExecutionBot, Order
+
+
+def order(order_id: str, symbol: str = "AAA", status: str = "SUBMITTED") -> Order:
+    return Order(
+        order_id=order_id,
+        symbol=symbol,
+        side="BUY",
+        order_type="LIMIT",
+        quantity=100,
+        price=10.0,
+        time_in_force="DAY",
+        status=status,
+    )
+
+
+def report(
+    cl_ord_id: str,
+    ord_status: str,
+    exec_type: str = fix.ExecType_NEW,
+    orig_cl_ord_id: str = "",
+    last_qty: int = 0,
+    cum_qty: int | None = None,
+) -> ExecutionReport:
+    return ExecutionReport(
+        cl_ord_id=cl_ord_id,
+        orig_cl_ord_id=orig_cl_ord_id,
+        order_id="EX1",
+        exec_id="E1",
+        exec_type=exec_type,
+        ord_status=ord_status,
+        symbol="AAA",
+        last_qty=last_qty,
+        last_px=10.0 if last_qty else 0.0,
+        cum_qty=cum_qty,
+        avg_px=10.0 if cum_qty else None,
+        leaves_qty=None,
+        text="",
+    )
+
+
+@pytest.fixture
+def bot() -> ExecutionBot:
+    return ExecutionBot(ExecutionSettings(), MagicMock())
+
+
+def test_ack_partial_fill_and_fill(bot):
+    bot._track_order(order("ORDER_1"))
+    bot.apply_execution_report(report("ORDER_1", fix.OrdStatus_NEW))
+    assert bot.orders["ORDER_1"].status == "NEW"
+    assert bot.orders["ORDER_1"].exchange_order_id == "EX1"
+
+    bot.apply_execution_report(
+        report(
+            "ORDER_1", fix.OrdStatus_PARTIALLY_FILLED, fix.ExecType_TRADE, last_qty=40, cum_qty=40
+        )
+    )
+    assert bot.orders["ORDER_1"].status == "PARTIALLY_FILLED"
+    assert bot.get_open_orders("AAA") == [bot.orders["ORDER_1"]]
+
+    bot.apply_execution_report(
+        report("ORDER_1", fix.OrdStatus_FILLED, fix.ExecType_TRADE, last_qty=60, cum_qty=100)
+    )
+    filled = bot.orders["ORDER_1"]
+    assert (filled.status, filled.filled_quantity) == ("FILLED", 100)
+    assert bot.get_open_orders("AAA") == []
+    assert bot.open_orders_by_symbol == {}
+    assert bot.open_exposure == 0.0
+
+
+def test_terminal_orders_ignore_later_reports(bot):
+    bot._track_order(order("ORDER_1"))
+    bot.apply_execution_report(report("ORDER_1", fix.OrdStatus_REJECTED, fix.ExecType_REJECTED))
+    bot.apply_execution_report(report("ORDER_1", fix.OrdStatus_NEW))
+    assert bot.orders["ORDER_1"].status == "REJECTED"
+    assert bot.open_orders == {}
+
+
+def test_partial_fill_cannot_go_back_to_new(bot):
+    bot._track_order(order("ORDER_1", status="PARTIALLY_FILLED"))
+    bot.apply_execution_report(report("ORDER_1", fix.OrdStatus_NEW))
+    assert bot.orders["ORDER_1"].status == "PARTIALLY_FILLED"
+
+
+def test_cancel_ack_is_matched_by_orig_cl_ord_id(bot):
+    bot._track_order(order("ORDER_1", status="NEW"))
+    bot.apply_execution_report(
+        report("CANCEL_1", fix.OrdStatus_CANCELED, fix.ExecType_CANCELED, orig_cl_ord_id="ORDER_1")
+    )
+    assert bot.get_order("ORDER_1").status == "CANCELLED"
+    assert bot.get_order("CANCEL_1") is None
+
+
+def test_unknown_cl_ord_id_is_ignored(bot):
+    bot._track_order(order("ORDER_1", status="NEW"))
+    bot.apply_execution_report(report("ORDER_9", fix.OrdStatus_FILLED, fix.ExecType_FILL))
+    assert bot.orders["ORDER_1"].status == "NEW"
+    assert list(bot.orders) == ["ORDER_1"]
+
+
+def test_open_orders_are_indexed_by_symbol(bot):
+    bot.restore_orders(
+        [
+            order("ORDER_1", "AAA", "NEW"),
+            order("ORDER_2", "AAA", "FILLED"),
+            order("ORDER_3", "BBB", "NEW"),
+        ]
+    )
+    assert [o.order_id for o in bot.get_open_orders("AAA")] == ["ORDER_1"]
+    assert [o.order_id for o in bot.get_orders_for_symbol("AAA")] == ["ORDER_1", "ORDER_2"]
+
+    bot.apply_execution_report(report("ORDER_3", fix.OrdStatus_CANCELED, fix.ExecType_CANCELED))
+    assert set(bot.open_orders_by_symbol) == {"AAA"}
@@ -0,0 +1,33 @@
+import functools
+import time
+
+import pytest
+
+from src.das_trader.market_data import MarketDataHandler
+
+
+def test_priority_callback_runs_before_dirty_and_inline_callbacks():
+    handler = MarketDataHandler()
+    calls = []
+    handler.register_callback(lambda market_data: calls.append("inline"))
+    handler.register_dirty_callback(lambda: calls.append("dirty"))
+    handler.register_callback(lambda market_data: calls.append("risk"), priority=True)
+
+    handler.apply_update("AAA", {"last_price": 10.0}, time.time())
+    assert calls == ["risk", "dirty", "inline"]
+
+
+def test_priority_requires_inline_policy():
+    handler = MarketDataHandler()
+    with pytest.raises(ValueError):
+        handler.register_callback(print, policy="latest", priority=True)
+
+
+def test_partial_consumer_is_named_by_repr():
+    handler = MarketDataHandler()
+    callback = functools.partial(print, end="")
+    handler.register_callback(callback, policy="latest")
+    try:
+        assert handler.consumers[0].name == repr(callback)
+    finally:
+        handler.close()
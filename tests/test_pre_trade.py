@@ -0,0 +1,120 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.config import ExecutionSettings, RiskSettings
+from src.das_trader.market_data import MarketDataHandler
+from src.execution.execution_bot import ExecutionBot, Order
+from src.risk.pre_trade import BasketExposure, PreTradeCheck, RejectReason
+from src.risk.risk_manager import RiskManager
+
+
+def make_check(**limits) -> PreTradeCheck:
+    settings = RiskSettings(**limits)
+    return PreTradeCheck(
+        settings,
+        RiskManager(settings),
+        ExecutionBot(ExecutionSettings(), MagicMock()),
+        MarketDataHandler(),
+    )
+
+
+def working_order(order_id: str, symbol: str, price: float = 100.0) -> Order:
+    return Order(
+        order_id=order_id,
+        symbol=symbol,
+        side="BUY",
+        order_type="LIMIT",
+        quantity=100,
+        price=price,
+        time_in_force="DAY",
+        status="NEW",
+    )
+
+
+def test_basket_legs_count_toward_open_positions():
+    check = make_check(max_open_positions=2)
+    basket = BasketExposure()
+    reasons = []
+    for symbol in ("AAA", "BBB", "CCC"):
+        reason = check.check(symbol, "BUY", 100, 10.0, basket)
+        if reason is RejectReason.OK:
+            basket.add(symbol, 100, 10.0, new_position=True)
+        reasons.append(reason)
+    assert reasons == [RejectReason.OK, RejectReason.OK, RejectReason.OPEN_POSITIONS]
+
+
+def test_basket_legs_count_toward_gross_exposure():
+    check = make_check(max_open_positions=10, max_gross_exposure_usd=25_000.0)
+    basket = BasketExposure()
+    reasons = []
+    for symbol in ("AAA", "BBB", "CCC"):
+        reason = check.check(symbol, "BUY", 100, 100.0, basket)
+        if reason is RejectReason.OK:
+            basket.add(symbol, 100, 100.0, new_position=True)
+        reasons.append(reason)
+    assert reasons == [RejectReason.OK, RejectReason.OK, RejectReason.GROSS_EXPOSURE]
+
+
+def test_basket_repeats_share_one_position_slot():
+    check = make_check(max_open_positions=1)
+    basket = BasketExposure()
+    basket.add("AAA", 100, 10.0, new_position=True)
+    assert check.check("AAA", "BUY", 100, 10.0, basket) is RejectReason.OK
+    assert check.check("BBB", "BUY", 100, 10.0, basket) is RejectReason.OPEN_POSITIONS
+
+
+def test_working_entry_counts_as_open_position():
+    check = make_check(max_open_positions=1)
+    check.execution_bot._track_order(working_order("ORDER_1", "AAA"))
+
+    assert check.check("BBB", "BUY", 100, 100.0) is RejectReason.OPEN_POSITIONS
+    # Adding to the symbol that already has the working entry uses no new slot.
+    assert check.check("AAA", "BUY", 100, 100.0) is RejectReason.OK
+
+
+def test_finished_entry_releases_its_slot():
+    check = make_check(max_open_positions=1)
+    execution_bot = check.execution_bot
+    order = working_order("ORDER_1", "AAA")
+    execution_bot._track_order(order)
+    execution_bot._set_status(order, "CANCELLED")
+
+    assert execution_bot.open_orders_by_symbol == {}
+    assert check.check("BBB", "BUY", 100, 100.0) is RejectReason.OK
+
+
+def test_position_with_working_exit_is_counted_once():
+    check = make_check(max_open_positions=2)
+    check.risk_manager.add_position("AAA", "BUY", 100, 100.0)
+    exit_order = working_order("ORDER_1", "AAA")
+    exit_order.side = "SELL"
+    check.execution_bot._track_order(exit_order)
+
+    assert check.check("BBB", "BUY", 100, 100.0) is RejectReason.OK
+
+
+@pytest.mark.parametrize(
+    ("side", "price", "expected"),
+    [
+        ("BUY", 10.20, RejectReason.OK),
+        ("BUY", 11.00, RejectReason.PRICE_COLLAR),
+        ("SELL", 9.70, RejectReason.OK),
+        ("SELL", 9.00, RejectReason.PRICE_COLLAR),
+    ],
+)
+def test_price_collar_uses_the_quote_side(side, price, expected):
+    check = make_check(price_collar_pct=5.0)
+    # The last trade matches the signal price, so only the quote can reject it.
+    check.quotes.update(
+        "AAA", {"bid_price": 9.90, "ask_price": 10.00, "last_price": price}, time.time()
+    )
+    assert check.check("AAA", side, 100, price) is expected
+
+
+def test_price_collar_falls_back_to_last_trade():
+    check = make_check(price_collar_pct=5.0)
+    check.quotes.update("AAA", {"last_price": 10.0}, time.time())
+    assert check.check("AAA", "BUY", 100, 10.2) is RejectReason.OK
+    assert check.check("AAA", "BUY", 100, 11.0) is RejectReason.PRICE_COLLAR
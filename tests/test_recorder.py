@@ -0,0 +1,45 @@
+import time
+
+from src.das_trader import recorder
+from src.das_trader.market_data import MarketData
+from src.das_trader.recorder import SYMBOLS_FILE, TickReader, TickRecorder
+
+
+def tick(symbol: str, last_price: float = 10.0) -> MarketData:
+    return MarketData(
+        symbol=symbol,
+        bid_price=last_price - 0.01,
+        ask_price=last_price + 0.01,
+        last_price=last_price,
+        volume=100,
+        timestamp=time.time(),
+    )
+
+
+def test_reader_skips_ids_missing_from_symbols_file(tmp_path):
+    tick_recorder = TickRecorder(tmp_path, buffer_records=8)
+    tick_recorder.start()
+    for symbol in ("AAA", "BBB", "AAA"):
+        tick_recorder.on_market_data(tick(symbol))
+    tick_recorder.close()
+    # A reader that loaded symbols.txt before BBB was appended.
+    (tmp_path / SYMBOLS_FILE).write_text("AAA\n")
+
+    reader = TickReader(tmp_path)
+    assert [symbol for symbol, _, _ in reader.iter_ticks()] == ["AAA", "AAA"]
+    assert reader.skipped == 1
+
+
+def test_write_failure_stops_recording(tmp_path, monkeypatch):
+    monkeypatch.setattr(recorder, "SEGMENT_PATTERN", "missing/ticks-{:06d}.bin")
+    tick_recorder = TickRecorder(tmp_path, buffer_records=2)
+    tick_recorder.start()
+    tick_recorder.on_market_data(tick("AAA"))
+    tick_recorder.on_market_data(tick("AAA"))
+    tick_recorder._writer.join(timeout=5)
+
+    assert tick_recorder.failed
+    tick_recorder.on_market_data(tick("AAA"))
+    tick_recorder.close()
+    assert tick_recorder.dropped == 3
+    assert tick_recorder._queue.empty()
@@ -0,0 +1,107 @@
+import pytest
+
+from src.config import RiskSettings
+from src.risk.risk_manager import RiskManager
+
+
+def make_manager() -> RiskManager:
+    return RiskManager(RiskSettings(stop_loss_pct=2.0, take_profit_pct=5.0, trailing_stop_pct=1.0))
+
+
+def test_triggers_bracket_a_new_position():
+    manager = make_manager()
+    manager.add_position("LONG", "BUY", 100, 100.0)
+    manager.add_position("SHORT", "SELL", 100, 100.0)
+
+    # Long: stop below, target above. Short: target below, stop above.
+    assert manager.triggers["LONG"] == pytest.approx((98.0, 105.0))
+    assert manager.triggers["SHORT"] == pytest.approx((95.0, 102.0))
+
+
+def test_on_price_between_triggers_marks_without_exit():
+    manager = make_manager()
+    manager.add_position("AAA", "BUY", 100, 100.0)
+
+    assert manager.on_price("AAA", 99.0) is None
+    assert manager.positions["AAA"].current_price == 99.0
+    assert manager.unrealized_pnl == pytest.approx(-100.0)
+    assert manager.on_price("AAA", 0.0) is None
+    assert manager.on_price("ZZZ", 1.0) is None
+
+
+@pytest.mark.parametrize(
+    "side, price, exit_kind",
+    [
+        ("BUY", 98.0, "STOP_LOSS"),
+        ("BUY", 105.0, "TAKE_PROFIT"),
+        ("SELL", 102.0, "STOP_LOSS"),
+        ("SELL", 95.0, "TAKE_PROFIT"),
+    ],
+)
+def test_on_price_fires_exit_at_trigger(side, price, exit_kind):
+    manager = make_manager()
+    manager.add_position("AAA", side, 100, 100.0)
+
+    assert manager.on_price("AAA", price) == exit_kind
+
+
+def test_trailing_stop_ratchets_long_trigger_up_only():
+    manager = make_manager()
+    manager.add_position("AAA", "BUY", 100, 100.0)
+
+    assert manager.on_price("AAA", 102.0) is None
+    lower, upper = manager.triggers["AAA"]
+    assert lower == pytest.approx(102.0 * 0.99)
+    assert upper == pytest.approx(105.0)
+    assert manager.positions["AAA"].stop_loss_price == lower
+
+    # A pullback doesn't loosen the stop; breaching the ratcheted level fires it.
+    assert manager.on_price("AAA", 101.5) is None
+    assert manager.triggers["AAA"] == (lower, upper)
+    assert manager.on_price("AAA", lower) == "STOP_LOSS"
+
+
+def test_trailing_stop_ratchets_short_trigger_down_only():
+    manager = make_manager()
+    manager.add_position("AAA", "SELL", 100, 100.0)
+
+    assert manager.on_price("AAA", 98.0) is None
+    lower, upper = manager.triggers["AAA"]
+    assert lower == pytest.approx(95.0)
+    assert upper == pytest.approx(98.0 * 1.01)
+
+    assert manager.on_price("AAA", 98.5) is None
+    assert manager.triggers["AAA"] == (lower, upper)
+    assert manager.on_price("AAA", upper) == "STOP_LOSS"
+
+
+def test_closing_fill_removes_trigger():
+    manager = make_manager()
+    manager.add_position("AAA", "BUY", 100, 100.0)
+
+    manager.apply_fill("AAA", "SELL", 40, 101.0)
+    assert "AAA" in manager.triggers
+
+    manager.apply_fill("AAA", "SELL", 60, 101.0)
+    assert "AAA" not in manager.triggers
+    assert manager.on_price("AAA", 50.0) is None
+    assert manager.realized_pnl == pytest.approx(100.0)
+
+
+def test_reversing_fill_rebrackets_trigger_for_new_side():
+    manager = make_manager()
+    manager.add_position("AAA", "BUY", 100, 100.0)
+
+    manager.apply_fill("AAA", "SELL", 150, 110.0)
+    assert manager.positions["AAA"].side == "SELL"
+    assert manager.positions["AAA"].quantity == 50
+    assert manager.triggers["AAA"] == pytest.approx((110.0 * 0.95, 110.0 * 1.02))
+
+
+def test_remove_position_drops_trigger():
+    manager = make_manager()
+    manager.add_position("AAA", "BUY", 100, 100.0)
+
+    manager.remove_position("AAA")
+    assert manager.triggers == {}
+    assert manager.on_price("AAA", 90.0) is None
@@ -0,0 +1,55 @@
+import time
+
+from src.das_trader.market_data import MarketData
+from src.das_trader.quote_store import QuoteStore
+from src.scanner.rolling import RollingStats
+
+
+def tick(last_price: float, volume: int, last_size: int = 100, bid: float = 9.9) -> MarketData:
+    return MarketData(
+        symbol="AAA",
+        bid_price=bid,
+        ask_price=bid + 0.1,
+        last_price=last_price,
+        volume=volume,
+        timestamp=time.time(),
+        last_size=last_size,
+    )
+
+
+def make_stats(window: int = 5) -> RollingStats:
+    quotes = QuoteStore(4)
+    quotes.update("AAA", {"last_price": 10.0}, time.time())
+    return RollingStats(window, quotes)
+
+
+def test_quote_only_updates_are_not_pushed():
+    stats = make_stats()
+    stats.on_market_data(tick(10.0, 1_000))
+    stats.on_market_data(tick(10.0, 1_000, bid=9.8))
+    stats.on_market_data(tick(10.0, 1_000, bid=9.7))
+    assert stats.samples[0] == 1
+
+    stats.on_market_data(tick(10.1, 1_300, last_size=300))
+    window = stats.get_window("AAA")
+    assert stats.samples[0] == 2
+    assert stats.tick_volume[0] == 300
+    assert window.volume_mean == 150.0
+
+
+def test_repeated_trade_at_same_price_and_size_is_pushed():
+    stats = make_stats()
+    stats.on_market_data(tick(10.0, 1_000))
+    stats.on_market_data(tick(10.0, 1_100))
+    assert stats.samples[0] == 2
+    assert stats.tick_volume[0] == 100
+
+
+def test_quotes_before_the_first_trade_are_skipped():
+    stats = make_stats()
+    stats.on_market_data(tick(0.0, 0))
+    assert stats.get_window("AAA") is None
+
+    stats.on_market_data(tick(10.0, 500))
+    stats.on_market_data(tick(9.5, 600))
+    assert stats.get_window("AAA").low == 9.5
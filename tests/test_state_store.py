@@ -0,0 +1,120 @@
+import sqlite3
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.bots.short_selling_bot import ShortSellingBot
+from src.config import ExecutionSettings, RiskSettings, ScannerSettings, ShortSellingSettings
+from src.das_trader.market_data import MarketDataHandler
+from src.execution.execution_bot import ExecutionBot, Order
+from src.risk.risk_manager import RiskManager
+from src.scanner.scanner_bot import ScannerBot
+from src.services.state_store import StateStore
+
+
+def build(path) -> StateStore:
+    handler = MarketDataHandler()
+    risk_manager = RiskManager(RiskSettings())
+    execution_bot = ExecutionBot(ExecutionSettings(), MagicMock())
+    short_selling_bot = ShortSellingBot(ShortSellingSettings(), execution_bot, handler)
+    scanner_bot = ScannerBot(ScannerSettings(min_volume=0), handler)
+    return StateStore(path, risk_manager, execution_bot, short_selling_bot, scanner_bot)
+
+
+def order(order_id: str, status: str) -> Order:
+    return Order(
+        order_id=order_id,
+        symbol="AAA",
+        side="BUY",
+        order_type="LIMIT",
+        quantity=100,
+        price=10.0,
+        time_in_force="DAY",
+        status=status,
+    )
+
+
+def meta(path) -> dict[str, str]:
+    conn = sqlite3.connect(path)
+    try:
+        return dict(conn.execute("SELECT key, value FROM meta"))
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def saved(tmp_path):
+    """A snapshot with a position, a loss, an open and a filled order and scanner baselines."""
+    path = tmp_path / "state.db"
+    store = build(path)
+    store.risk_manager.add_position("AAA", "BUY", 100, 10.0)
+    store.risk_manager.realized_pnl = -50.0
+    store.execution_bot._track_order(order("ORDER_1", "NEW"))
+    store.execution_bot._track_order(order("ORDER_2", "FILLED"))
+    store.scanner_bot.market_data_handler.apply_update(
+        "AAA", {"last_price": 10.0, "volume": 1_000}, time.time()
+    )
+    store.scanner_bot.scan()
+    store.save()
+    store.close()
+    return path
+
+
+def set_trading_day(path, day: str):
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'trading_day'", (day,))
+    conn.close()
+
+
+def test_same_day_round_trip(saved):
+    store = build(saved)
+    assert store.load()
+    assert set(store.risk_manager.positions) == {"AAA"}
+    assert store.risk_manager.realized_pnl == -50.0
+    assert set(store.execution_bot.orders) == {"ORDER_1", "ORDER_2"}
+    assert set(store.execution_bot.open_orders) == {"ORDER_1"}
+    assert store.scanner_bot.has_previous[0]
+
+    # Nothing changed since the load, so the next capture carries only the save time.
+    delta = store.capture()
+    assert not delta.full
+    assert list(delta.upserts) == ["meta"]
+    store.close()
+
+
+def test_new_day_load_writes_the_reset_state(saved):
+    set_trading_day(saved, "2000-01-01")
+    store = build(saved)
+    assert store.load()
+    assert store.risk_manager.realized_pnl == 0.0
+    assert set(store.execution_bot.orders) == {"ORDER_1"}
+    assert not store.scanner_bot.has_previous.any()
+    store.close()
+
+    saved_meta = meta(saved)
+    assert saved_meta["trading_day"] != "2000-01-01"
+    assert float(saved_meta["realized_pnl"]) == 0.0
+
+    # A second restart the same day keeps the day's P&L instead of resetting it again.
+    store = build(saved)
+    store.load()
+    store.risk_manager.realized_pnl = -20.0
+    store.save()
+    store.close()
+    store = build(saved)
+    store.load()
+    assert store.risk_manager.realized_pnl == -20.0
+    store.close()
+
+
+def test_new_day_prunes_scanner_baselines(saved):
+    set_trading_day(saved, "2000-01-01")
+    store = build(saved)
+    store.load()
+    store.close()
+    conn = sqlite3.connect(saved)
+    assert conn.execute("SELECT COUNT(*) FROM scanner_previous").fetchone() == (0,)
+    assert conn.execute("SELECT order_id FROM orders").fetchall() == [("ORDER_1",)]
+    conn.close()
@@ -0,0 +1,132 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.das_trader.order_ids import ClOrdIdAllocator
+from src.das_trader.subscriptions import TAG_MD_REQ_ID, TAG_TEXT, SubscriptionManager
+
+
+class RecordingClient:
+    def __init__(self):
+        self.cl_ord_ids = ClOrdIdAllocator()
+        self.sent: list[tuple[str, list[str], bool]] = []
+
+    def send_market_data_request(self, md_req_id, symbols, subscribe=True, depth=1):
+        self.sent.append((md_req_id, list(symbols), subscribe))
+
+
+@pytest.fixture
+def client() -> RecordingClient:
+    return RecordingClient()
+
+
+def manager(client, **kwargs) -> SubscriptionManager:
+    kwargs.setdefault("requests_per_sec", 1000.0)
+    return SubscriptionManager(client, **kwargs)
+
+
+def quote(manager: SubscriptionManager, *symbols: str):
+    for symbol in symbols:
+        manager.on_market_data(SimpleNamespace(symbol=symbol))
+
+
+def reject(md_req_id: str, text: str = "unknown symbol"):
+    fields = {TAG_MD_REQ_ID: md_req_id, TAG_TEXT: text}
+    message = MagicMock()
+    message.isSetField.side_effect = fields.__contains__
+    message.getField.side_effect = fields.__getitem__
+    return message
+
+
+def test_batches_and_activates_on_first_quote(client):
+    subscriptions = manager(client, batch_size=2)
+    subscriptions.set_universe(["AAA", "BBB", "CCC"])
+    assert subscriptions.pump() == 2
+    assert [(symbols, subscribe) for _, symbols, subscribe in client.sent] == [
+        (["AAA", "BBB"], True),
+        (["CCC"], True),
+    ]
+    quote(subscriptions, "AAA")
+    assert subscriptions.active == {"AAA"}
+    assert set(subscriptions.pending) == {"BBB", "CCC"}
+
+
+def test_removing_one_symbol_resubscribes_the_rest_of_its_request(client):
+    subscriptions = manager(client, batch_size=3)
+    subscriptions.set_universe(["AAA", "BBB", "CCC"])
+    subscriptions.pump()
+    first_id = client.sent[0][0]
+    quote(subscriptions, "AAA", "BBB", "CCC")
+
+    subscriptions.set_universe(["AAA", "CCC"])
+    subscriptions.pump()
+    # The whole request is unsubscribed under its MDReqID, then the survivors come back.
+    assert client.sent[1] == (first_id, ["AAA", "BBB", "CCC"], False)
+    second_id, symbols, subscribe = client.sent[2]
+    assert (symbols, subscribe) == (["AAA", "CCC"], True)
+    assert second_id != first_id
+    assert subscriptions.active == set()
+    assert subscriptions.request_ids == {"AAA": second_id, "CCC": second_id}
+
+
+def test_pending_timeout_retries_alone_then_rejects(client):
+    subscriptions = manager(client, pending_timeout_sec=0.0)
+    subscriptions.set_universe(["AAA", "BBB"])
+    subscriptions.pump()
+    quote(subscriptions, "AAA")
+
+    subscriptions.pump()
+    # BBB never quoted: its request is retired, AAA re-requested, BBB retried alone.
+    assert [(symbols, subscribe) for _, symbols, subscribe in client.sent[1:]] == [
+        (["AAA", "BBB"], False),
+        (["AAA"], True),
+        (["BBB"], True),
+    ]
+    quote(subscriptions, "AAA")
+
+    subscriptions.pump()
+    assert client.sent[-1][1:] == (["BBB"], False)
+    assert subscriptions.rejected == {"BBB": "no market data received"}
+    assert subscriptions.active == {"AAA"}
+
+
+def test_rejected_batch_isolates_pending_symbols(client):
+    subscriptions = manager(client)
+    subscriptions.set_universe(["AAA", "BBB", "CCC"])
+    subscriptions.pump()
+    md_req_id = client.sent[0][0]
+    quote(subscriptions, "AAA")
+
+    subscriptions.on_market_data_reject(reject(md_req_id))
+    subscriptions.pump()
+    # AAA quoted, so only the pending BBB and CCC are suspects.
+    assert [symbols for _, symbols, _ in client.sent[1:]] == [["AAA"], ["BBB"], ["CCC"]]
+
+    bbb_id = client.sent[2][0]
+    subscriptions.on_market_data_reject(reject(bbb_id, "unknown symbol"))
+    assert subscriptions.rejected == {"BBB": "unknown symbol"}
+
+    # Leaving the universe and coming back clears the rejection.
+    subscriptions.set_universe(["AAA", "CCC"])
+    subscriptions.set_universe(["AAA", "BBB", "CCC"])
+    assert "BBB" in subscriptions.to_subscribe
+
+
+def test_rate_limit_defers_requests(client):
+    subscriptions = manager(client, batch_size=1, requests_per_sec=2.0)
+    subscriptions.set_universe(["AAA", "BBB", "CCC", "DDD"])
+    assert subscriptions.pump() == 2
+    assert list(subscriptions.to_subscribe) == ["CCC", "DDD"]
+
+
+def test_reset_requeues_the_universe(client):
+    subscriptions = manager(client)
+    subscriptions.set_universe(["AAA", "BBB"])
+    subscriptions.pump()
+    quote(subscriptions, "AAA")
+
+    subscriptions.reset()
+    assert list(subscriptions.to_subscribe) == ["AAA", "BBB"]
+    assert subscriptions.active == set()
+    assert subscriptions.requests == {}